@@ -0,0 +1,11 @@
+"""Benchmark suite for the cleansys scan and operation pipeline.
+
+Generates a synthetic tree, runs each pipeline stage in isolation and
+end to end, and reports files/sec, filesystem calls and peak RSS:
+
+    python -m benchmarks --depth 3 --fanout 6 --files-per-dir 40
+    python -m benchmarks --save-baseline bench.json
+    python -m benchmarks --baseline bench.json --tolerance 0.15
+
+See `python -m benchmarks --help` for all options.
+"""
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import os
+import sys
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Iterator
+
+if TYPE_CHECKING:
+    from typing_extensions import Self  # typing.Self needs Python 3.11
+
+
+class _CountingEntry:
+    """DirEntry proxy that counts explicit stat() calls."""
+
+    def __init__(self, entry: os.DirEntry, counts: dict[str, int]) -> None:
+        self._entry = entry
+        self._counts = counts
+        self.name = entry.name
+        self.path = entry.path
+
+    def stat(self, *, follow_symlinks: bool = True) -> os.stat_result:
+        self._counts["stat"] += 1
+        return self._entry.stat(follow_symlinks=follow_symlinks)
+
+    def __getattr__(self, name: str):
+        return getattr(self._entry, name)
+
+
+class _CountingScandir:
+    """Context-manager iterator wrapping os.scandir results."""
+
+    def __init__(self, it, counts: dict[str, int]) -> None:
+        self._it = it
+        self._counts = counts
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._it.close()
+
+    def __iter__(self) -> Iterator[_CountingEntry]:
+        for entry in self._it:
+            yield _CountingEntry(entry, self._counts)
+
+
+@contextmanager
+def count_syscalls() -> Iterator[dict[str, int]]:
+    """Count filesystem calls made while the context is active.
+
+    Calls are counted by wrapping the `os` functions at the Python
+    level; `DirEntry` type checks that fall back to a stat on
+    filesystems without `d_type` support are not counted.
+    """
+    names = ("stat", "lstat", "listdir", "scandir", "unlink", "rename", "replace")
+    counts = dict.fromkeys(names, 0)
+    originals = {name: getattr(os, name) for name in names}
+
+    def counted(name: str):
+        func = originals[name]
+
+        def wrapper(*args, **kwargs):
+            counts[name] += 1
+            return func(*args, **kwargs)
+
+        return wrapper
+
+    def scandir(*args, **kwargs):
+        counts["scandir"] += 1
+        return _CountingScandir(originals["scandir"](*args, **kwargs), counts)
+
+    for name in names:
+        setattr(os, name, scandir if name == "scandir" else counted(name))
+    try:
+        yield counts
+    finally:
+        for name, func in originals.items():
+            setattr(os, name, func)
+
+
+def peak_rss_mb() -> float:
+    """Return this process's peak resident set size in MiB (0.0 if unknown)."""
+    try:
+        import resource
+    except ImportError:  # Windows
+        return 0.0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes.
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import argparse
+import json
+import multiprocessing
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any
+
+from src.oplog import configure_log, get_log
+
+from .measure import count_syscalls, peak_rss_mb
+from .stages import STAGES
+from .tree import SIZE_DISTRIBUTIONS, TreeShape, generate_tree
+
+
+def measure_stage(name: str, tree: Path, workspace: Path) -> dict[str, Any]:
+    """Run one stage twice (counting calls, then timed) and return metrics.
+
+    Stage output and the operation log are kept out of the terminal and
+    the working directory.
+    """
+    stage = STAGES[name]
+    workspace.mkdir(parents=True, exist_ok=True)
+    previous_log = get_log().path
+    configure_log(workspace / "cleansys.log")
+    try:
+        with open(os.devnull, "w") as sink, redirect_stdout(sink):
+            prepared = stage.setup(tree, workspace / "count")
+            with count_syscalls() as counts:
+                stage.run(prepared)
+            prepared = stage.setup(tree, workspace / "timed")
+            start = time.perf_counter()
+            files = stage.run(prepared)
+            elapsed = time.perf_counter() - start
+    finally:
+        configure_log(previous_log)
+    return {
+        "files": files,
+        "seconds": round(elapsed, 6),
+        "files_per_sec": round(files / elapsed, 1) if elapsed else 0.0,
+        "syscalls": sum(counts.values()),
+        "syscalls_per_file": round(sum(counts.values()) / max(files, 1), 3),
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+    }
+
+
+def run_suite(shape: TreeShape, stages: list[str] | None = None, isolate: bool = True) -> dict[str, Any]:
+    """Generate a tree of the given shape and measure each stage on it.
+
+    With isolate=True every stage runs in a fresh child process, so its
+    peak RSS is not inflated by earlier stages. Children are forked where
+    possible: a spawned child would make process pools inside the stage
+    spawn as well, adding interpreter start-up to the measurement.
+    """
+    names = stages or list(STAGES)
+    unknown = [n for n in names if n not in STAGES]
+    if unknown:
+        raise ValueError(f"Unknown stage(s): {', '.join(unknown)} (available: {', '.join(STAGES)})")
+    results: dict[str, Any] = {"shape": asdict(shape), "stages": {}}
+    with tempfile.TemporaryDirectory(prefix="cleansys-bench-") as tmp:
+        tree = Path(tmp) / "tree"
+        results["files"], results["bytes"] = generate_tree(tree, shape)
+        for name in names:
+            workspace = Path(tmp) / name
+            if isolate:
+                method = "fork" if "fork" in multiprocessing.get_all_start_methods() else "spawn"
+                context = multiprocessing.get_context(method)
+                with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+                    metrics = pool.submit(measure_stage, name, tree, workspace).result()
+            else:
+                metrics = measure_stage(name, tree, workspace)
+            results["stages"][name] = metrics
+    return results
+
+
+def compare(results: dict[str, Any], baseline: dict[str, Any], tolerance: float) -> list[str]:
+    """Return one message per stage that is slower than baseline by more than tolerance."""
+    regressions = []
+    for name, metrics in results["stages"].items():
+        base = baseline.get("stages", {}).get(name)
+        if not base or not base.get("files_per_sec"):
+            continue
+        ratio = metrics["files_per_sec"] / base["files_per_sec"]
+        if ratio < 1 - tolerance:
+            regressions.append(
+                f"{name}: {metrics['files_per_sec']:.0f} files/s vs baseline "
+                f"{base['files_per_sec']:.0f} ({(ratio - 1) * 100:+.1f}%)"
+            )
+    return regressions
+
+
+def render(results: dict[str, Any], baseline: dict[str, Any] | None = None) -> None:
+    """Print a table of stage metrics, with the change against baseline if given."""
+    print(f"Tree: {results['files']} files, {results['bytes']} bytes, shape {results['shape']}")
+    print(f"{'stage':<16}{'files/s':>12}{'seconds':>10}{'syscalls/file':>15}{'peak RSS MiB':>14}  vs baseline")
+    for name, m in results["stages"].items():
+        delta = ""
+        base = (baseline or {}).get("stages", {}).get(name)
+        if base and base.get("files_per_sec"):
+            delta = f"{(m['files_per_sec'] / base['files_per_sec'] - 1) * 100:+.1f}%"
+        print(
+            f"{name:<16}{m['files_per_sec']:>12.0f}{m['seconds']:>10.3f}"
+            f"{m['syscalls_per_file']:>15.2f}{m['peak_rss_mb']:>14.1f}  {delta}"
+        )
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Command-line entry point; returns 1 if a regression was found."""
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Benchmark the cleansys pipeline.")
+    defaults = TreeShape()
+    parser.add_argument("--depth", type=int, default=defaults.depth)
+    parser.add_argument("--fanout", type=int, default=defaults.fanout)
+    parser.add_argument("--files-per-dir", type=int, default=defaults.files_per_dir)
+    parser.add_argument("--size-dist", choices=SIZE_DISTRIBUTIONS, default=defaults.size_dist)
+    parser.add_argument("--mean-size", type=int, default=defaults.mean_size)
+    parser.add_argument("--old-fraction", type=float, default=defaults.old_fraction)
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    parser.add_argument("--stages", help=f"Comma-separated subset of: {', '.join(STAGES)}")
+    parser.add_argument("--no-isolate", action="store_true", help="Run all stages in this process")
+    parser.add_argument("--json", type=Path, help="Write the results to this file")
+    parser.add_argument("--save-baseline", type=Path, help="Store the results as a baseline")
+    parser.add_argument("--baseline", type=Path, help="Compare against a stored baseline")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="Allowed slowdown vs baseline (default 0.10)")
+    args = parser.parse_args(argv)
+
+    shape = TreeShape(
+        depth=args.depth,
+        fanout=args.fanout,
+        files_per_dir=args.files_per_dir,
+        size_dist=args.size_dist,
+        mean_size=args.mean_size,
+        old_fraction=args.old_fraction,
+        seed=args.seed,
+    )
+    baseline = json.loads(args.baseline.read_text(encoding="utf-8")) if args.baseline else None
+    if baseline is not None and baseline.get("shape") != asdict(shape):
+        print("[WARN] Baseline was recorded with a different tree shape; numbers may not be comparable")
+    stages = args.stages.split(",") if args.stages else None
+    results = run_suite(shape, stages, isolate=not args.no_isolate)
+    render(results, baseline)
+    for out in (args.json, args.save_baseline):
+        if out is not None:
+            out.write_text(json.dumps(results, indent=2) + "\n", encoding="utf-8")
+    if baseline is None:
+        return 0
+    regressions = compare(results, baseline, args.tolerance)
+    for message in regressions:
+        print(f"[REGRESSION] {message}")
+    return 1 if regressions else 0
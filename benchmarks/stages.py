@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import os
+import shutil
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+from src.analyzer import FileInfo, filter_files, iter_filter_files, to_file_info
+from src.columnar import FileBatch, filter_batch
+from src.operations import Operation, OperationQueue, delete_file, move_file
+from src.scanner import scan_directory
+from src.sharded import scan_sharded
+from src.walker import scan_file_infos
+
+# Criteria used by the filter and end-to-end stages; with the default
+# tree shape they select roughly a tenth of the files.
+CRITERIA = {"min_size": 1024, "min_age_days": 365, "file_types": [".log", ".tmp"]}
+
+
+@dataclass(frozen=True)
+class Stage:
+    """One benchmarked step of the pipeline.
+
+    `setup(tree, workspace)` prepares untimed input (destructive stages
+    get a private copy of the tree); `run(prepared)` is timed and returns
+    the number of files it processed.
+    """
+
+    name: str
+    description: str
+    setup: Callable[[Path, Path], Any]
+    run: Callable[[Any], int]
+
+
+def _tree(tree: Path, workspace: Path) -> Path:
+    """Use the shared tree as-is (read-only stages)."""
+    return tree
+
+
+def _infos(tree: Path, workspace: Path) -> list[FileInfo]:
+    """Scan the shared tree up front."""
+    return list(scan_file_infos(tree))
+
+
+def _batch(tree: Path, workspace: Path) -> FileBatch:
+    """Scan the shared tree into a columnar batch up front."""
+    return FileBatch().extend(scan_file_infos(tree))
+
+
+def _clone_file(src: str, dst: str) -> None:
+    """Recreate a sparse file with src's size and times, without reading it.
+
+    Reading the source would refresh its access time and push every file
+    past the age filter on later stages.
+    """
+    st = os.stat(src)
+    with open(dst, "wb") as fh:
+        fh.truncate(st.st_size)
+    os.utime(dst, ns=(st.st_atime_ns, st.st_mtime_ns))
+
+
+def _copy(tree: Path, workspace: Path) -> Path:
+    """Copy the tree into the workspace for a destructive stage."""
+    target = workspace / "copy"
+    shutil.copytree(tree, target, copy_function=_clone_file)
+    return target
+
+
+def _copied_infos(tree: Path, workspace: Path) -> list[FileInfo]:
+    """Copy the tree and scan the copy up front."""
+    return list(scan_file_infos(_copy(tree, workspace)))
+
+
+def _move_targets(tree: Path, workspace: Path) -> tuple[list[FileInfo], Path]:
+    """Copy and scan the tree, and pick a destination directory."""
+    return _copied_infos(tree, workspace), workspace / "moved"
+
+
+def _legacy_scan(tree: Path) -> int:
+    return len(to_file_info(list(scan_directory(tree))))
+
+
+def _walk(tree: Path) -> int:
+    return sum(1 for _ in scan_file_infos(tree))
+
+
+def _walk_parallel(tree: Path) -> int:
+    return sum(1 for _ in scan_file_infos(tree, workers=8))
+
+
+def _walk_sharded(tree: Path) -> int:
+    return sum(len(batch) for batch in scan_sharded([tree], processes=4))
+
+
+def _filter(infos: list[FileInfo]) -> int:
+    filter_files(infos, **CRITERIA)
+    return len(infos)
+
+
+def _filter_columnar(batch: FileBatch) -> int:
+    filter_batch(batch, **CRITERIA)
+    return len(batch)
+
+
+def _delete(infos: list[FileInfo]) -> int:
+    for info in infos:
+        delete_file(info.path, dry_run=False)
+    return len(infos)
+
+
+def _delete_queue(infos: list[FileInfo]) -> int:
+    queue = OperationQueue(dry_run=False, workers=4)
+    for info in infos:
+        queue.add(Operation("delete", info.path, info.size))
+    return len(queue.run())
+
+
+def _move(prepared: tuple[list[FileInfo], Path]) -> int:
+    infos, target = prepared
+    for i, info in enumerate(infos):
+        move_file(info.path, target / f"{i}{info.path.suffix}", dry_run=False)
+    return len(infos)
+
+
+def _end_to_end(tree: Path) -> int:
+    """Walk, filter and delete the matches; returns the files scanned."""
+    scanned = 0
+
+    def counted() -> Iterator[FileInfo]:
+        nonlocal scanned
+        for info in scan_file_infos(tree):
+            scanned += 1
+            yield info
+
+    queue = OperationQueue(dry_run=False, workers=4)
+    for info in iter_filter_files(counted(), **CRITERIA):
+        queue.add(Operation("delete", info.path, info.size))
+    queue.run()
+    return scanned
+
+
+STAGES: dict[str, Stage] = {
+    stage.name: stage
+    for stage in (
+        Stage("legacy-scan", "scan_directory + to_file_info", _tree, _legacy_scan),
+        Stage("walk", "scan_file_infos, 1 thread", _tree, _walk),
+        Stage("walk-parallel", "scan_file_infos, 8 threads", _tree, _walk_parallel),
+        Stage("scan-sharded", "scan_sharded, 4 processes", _tree, _walk_sharded),
+        Stage("filter", "filter_files on FileInfo objects", _infos, _filter),
+        Stage("filter-columnar", "filter_batch on a FileBatch", _batch, _filter_columnar),
+        Stage("delete", "delete_file, one call per file", _copied_infos, _delete),
+        Stage("delete-queue", "OperationQueue deletes, 4 threads", _copied_infos, _delete_queue),
+        Stage("move", "move_file within one filesystem", _move_targets, _move),
+        Stage("end-to-end", "walk + filter + queued delete of matches", _copy, _end_to_end),
+    )
+}
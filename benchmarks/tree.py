@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import os
+import random
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+SUFFIXES = (".log", ".tmp", ".txt", ".bin", ".mp4")
+SIZE_DISTRIBUTIONS = ("fixed", "uniform", "lognormal")
+
+
+@dataclass(frozen=True)
+class TreeShape:
+    """Shape of a synthetic benchmark tree.
+
+    Every directory down to `depth` levels has `fanout` subdirectories
+    and `files_per_dir` files. File sizes follow `size_dist` around
+    `mean_size` bytes; `old_fraction` of the files get an access time
+    400 days in the past so age filters have something to select.
+    """
+
+    depth: int = 3
+    fanout: int = 4
+    files_per_dir: int = 20
+    size_dist: str = "lognormal"
+    mean_size: int = 4096
+    old_fraction: float = 0.5
+    seed: int = 0
+
+    @property
+    def dirs(self) -> int:
+        """Number of directories, including the root."""
+        return sum(self.fanout**level for level in range(self.depth + 1))
+
+    @property
+    def files(self) -> int:
+        """Number of files the tree will contain."""
+        return self.dirs * self.files_per_dir
+
+
+def generate_tree(root: Path, shape: TreeShape) -> tuple[int, int]:
+    """Create the tree described by shape under root.
+
+    Files are created sparse (truncated to size), so large trees are
+    cheap to build. Returns (file count, total bytes).
+    """
+    if shape.size_dist not in SIZE_DISTRIBUTIONS:
+        raise ValueError(f"size_dist must be one of: {', '.join(SIZE_DISTRIBUTIONS)}")
+    rng = random.Random(shape.seed)
+    old_ts = time.time() - 400 * 86400
+    files = total = 0
+    level = [root]
+    for depth in range(shape.depth + 1):
+        next_level = []
+        for directory in level:
+            directory.mkdir(parents=True, exist_ok=True)
+            for i in range(shape.files_per_dir):
+                path = directory / f"file{i}{SUFFIXES[i % len(SUFFIXES)]}"
+                size = _draw_size(rng, shape)
+                with path.open("wb") as fh:
+                    fh.truncate(size)
+                if rng.random() < shape.old_fraction:
+                    os.utime(path, (old_ts, old_ts))
+                files += 1
+                total += size
+            if depth < shape.depth:
+                next_level.extend(directory / f"dir{j}" for j in range(shape.fanout))
+        level = next_level
+    return files, total
+
+
+def _draw_size(rng: random.Random, shape: TreeShape) -> int:
+    """Return one file size drawn from the shape's distribution."""
+    if shape.size_dist == "fixed":
+        return shape.mean_size
+    if shape.size_dist == "uniform":
+        return rng.randint(0, 2 * shape.mean_size)
+    # lognormal with sigma=1 has mean exp(mu + 0.5)
+    return int(rng.lognormvariate(0, 1) * shape.mean_size / 1.6487)
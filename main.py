@@ -1,19 +1,65 @@
+import os
+import sys
+import time
+from contextlib import ExitStack, redirect_stdout
+from itertools import chain
 from pathlib import Path
-from typing import Optional
+from typing import Iterable, Optional
 
 import typer
+from typer.core import TyperGroup
 
-from src.scanner import scan_directory
-from src.analyzer import to_file_info, filter_files
-from src.interface import render_scan_header, run_interactive_review, render_scan_summary
+from src.analyzer import SORT_KEYS, FileInfo, filter_files, iter_filter_files, top_files
+from src import metrics, profiling
+from src.archive import ArchiveSettings
+from src.checkpoint import scan_checkpointed
+from src.columnar import FileBatch
+from src.duplicates import find_duplicates
+from src.export import OUTPUT_FORMATS, write_records
+from src.index import refresh, scan_indexed
+from src.interface import (
+    render_dir_report,
+    render_metrics,
+    render_scan_header,
+    render_scan_summary,
+    run_duplicate_review,
+    run_interactive_review,
+    run_policy,
+    summarize_results,
+)
+from src.matcher import compile_matcher
+from src.metrics import METRICS_FORMATS, write_metrics
+from src.multiroot import dedupe_roots, scan_roots
+from src.operations import OperationQueue
+from src.oplog import configure_log, flush_log, install_exit_flush
+from src.plan import PlanWriter, apply_plan
+from src.policy import load_policy
+from src.report import REPORT_FORMATS, DirReport, write_report
+from src.sharded import scan_sharded
+from src.sniff import TypeCache, sniff_filter
 from src.size_parser import parse_size
+from src.walker import scan_file_infos
 
-app = typer.Typer(help="cleansys - Clean System CLI tool")
+
+
+class DefaultScanGroup(TyperGroup):
+    """Run `scan` when no subcommand is named, so `cleansys ROOT` keeps working."""
+
+    def parse_args(self, ctx: typer.Context, args: list[str]) -> list[str]:
+        if not args or (args[0] not in self.commands and args[0] not in ctx.help_option_names):
+            args = ["scan", *args]
+        return super().parse_args(ctx, args)
+
+
+app = typer.Typer(cls=DefaultScanGroup, help="cleansys - Clean System CLI tool")
 
 
 @app.command()
 def scan(
-    root: Path = typer.Argument(Path("."), help="Root directory to scan"),
+    root: Optional[list[Path]] = typer.Argument(
+        None,
+        help="Root directories to scan (default: current directory); roots on different devices are scanned concurrently",
+    ),
     min_size: Optional[str] = typer.Option(
         None,
         "--min-size",
@@ -25,10 +71,131 @@ def scan(
         "--file-type",
         help="Only include files with these extensions (e.g. .log, .tmp)",
     ),
+    sniff: bool = typer.Option(
+        False,
+        "--sniff",
+        help="Let --file-type also match files by content (magic bytes), e.g. extension-less or renamed files",
+    ),
+    include: list[str] = typer.Option(
+        [],
+        "--include",
+        help="Only scan files matching these globs (names, or full paths if the glob contains '/')",
+    ),
+    exclude: list[str] = typer.Option(
+        [],
+        "--exclude",
+        help="Skip files and prune directories matching these globs (e.g. node_modules, '*.git')",
+    ),
     recursive: bool = typer.Option(True, help="Recurse into subdirectories"),
     dry_run: bool = typer.Option(False, "--dry-run", help="Show actions without executing"),
+    workers: int = typer.Option(
+        1,
+        "--workers",
+        min=1,
+        help="Threads listing directories in parallel per device (useful on network mounts)",
+    ),
+    processes: int = typer.Option(
+        1,
+        "--processes",
+        min=1,
+        help="Scan and filter in N worker processes, one shard per top-level subdirectory (CPU-bound trees)",
+    ),
+    index: Optional[Path] = typer.Option(
+        None,
+        "--index",
+        help="SQLite metadata index; later scans only re-list directories whose mtime changed",
+    ),
+    rebuild_index: bool = typer.Option(False, "--rebuild-index", help="Discard the --index contents and rescan"),
+    checkpoint: Optional[Path] = typer.Option(
+        None,
+        "--checkpoint",
+        help="Save walk progress and results to this file every few seconds (sequential walk)",
+    ),
+    resume: bool = typer.Option(False, "--resume", help="Continue the scan saved in --checkpoint"),
+    compact: bool = typer.Option(
+        False,
+        "--compact",
+        help="Hold scan results in a compact columnar store (for trees with millions of files)",
+    ),
+    top: Optional[int] = typer.Option(
+        None,
+        "--top",
+        min=1,
+        help="Only review the N worst matches (see --sort); memory stays bounded by N",
+    ),
+    sort: str = typer.Option("size", "--sort", help="Ranking for --top: size (largest first) or atime (oldest first)"),
+    report_depth: Optional[int] = typer.Option(
+        None,
+        "--report-depth",
+        min=0,
+        help="Before review, show bytes/files per directory rolled up to this depth below each root",
+    ),
+    report_out: Optional[Path] = typer.Option(
+        None,
+        "--report-out",
+        help="Also write the directory report to this .json or .csv file (implies --report-depth 1)",
+    ),
+    duplicates: bool = typer.Option(
+        False,
+        "--duplicates",
+        help="Find files with identical content and review each group (keep one, delete the rest)",
+    ),
+    batch: bool = typer.Option(
+        False,
+        "--batch",
+        help="Queue approved actions and execute them together after the review",
+    ),
+    batch_workers: int = typer.Option(4, "--batch-workers", min=1, help="Threads used to execute --batch actions"),
+    archive_level: int = typer.Option(
+        6,
+        "--archive-level",
+        min=0,
+        max=9,
+        help="DEFLATE level for archived files (0 = store only); compressed formats are always stored",
+    ),
+    archive_processes: int = typer.Option(
+        1,
+        "--archive-processes",
+        min=1,
+        help="Processes used to compress archive members in parallel",
+    ),
+    policy: Optional[Path] = typer.Option(
+        None,
+        "--policy",
+        help="TOML/YAML rules file; matching files are handled without prompts (for cron/unattended runs)",
+    ),
+    output: Optional[str] = typer.Option(
+        None,
+        "--output",
+        help="Stream matches to stdout as jsonl or csv instead of reviewing them (messages go to stderr)",
+    ),
+    plan: Optional[Path] = typer.Option(
+        None,
+        "--plan",
+        help="Record approved actions to this plan file instead of executing them (see `cleansys apply`)",
+    ),
+    show_stats: bool = typer.Option(
+        False,
+        "--stats",
+        help="Print time, calls, files and bytes per stage (listing, stat, filter, prompts, operations)",
+    ),
+    metrics_out: Optional[Path] = typer.Option(
+        None,
+        "--metrics-out",
+        help="Write per-stage metrics to a .prom (Prometheus textfile) or .json file",
+    ),
+    profile: Optional[Path] = typer.Option(
+        None,
+        "--profile",
+        help="Profile the run (prompts excluded): cProfile pstats, or sampled collapsed stacks for .folded paths",
+    ),
+    log_file: Optional[Path] = typer.Option(
+        None,
+        "--log-file",
+        help="Operation log path (default: cleansys.log in the current directory)",
+    ),
 ) -> None:
-    """Scan files under root and list those matching criteria."""
+    """Scan files under the given roots and list those matching criteria."""
     parsed_min_size: Optional[int] = None
     if min_size is not None:
         try:
@@ -36,25 +203,236 @@ def scan(
         except ValueError as exc:
             typer.echo(f"Error: {exc}")
             raise typer.Exit(code=1)
-    if not root.exists():
-        typer.echo(f"Error: Path does not exist: {root}")
+    roots = root or [Path(".")]
+    for path in roots:
+        if not path.exists():
+            typer.echo(f"Error: Path does not exist: {path}")
+            raise typer.Exit(code=1)
+    if len(roots) > 1:
+        roots = dedupe_roots(roots)
+    if rebuild_index and index is None:
+        typer.echo("Error: --rebuild-index requires --index PATH")
+        raise typer.Exit(code=1)
+    if resume and checkpoint is None:
+        typer.echo("Error: --resume requires --checkpoint PATH")
+        raise typer.Exit(code=1)
+    if checkpoint is not None and index is not None:
+        typer.echo("Error: --checkpoint cannot be combined with --index")
+        raise typer.Exit(code=1)
+    if processes > 1 and (index is not None or checkpoint is not None):
+        typer.echo("Error: --processes cannot be combined with --index or --checkpoint")
+        raise typer.Exit(code=1)
+    if sort not in SORT_KEYS:
+        typer.echo(f"Error: --sort must be one of: {', '.join(SORT_KEYS)}")
+        raise typer.Exit(code=1)
+    if report_out is not None and report_out.suffix.lower() not in REPORT_FORMATS:
+        typer.echo("Error: --report-out must end in .json or .csv")
         raise typer.Exit(code=1)
-    render_scan_header(str(root), parsed_min_size, unused_days, dry_run)
-    paths = list(scan_directory(root, recursive=recursive))
-    infos = to_file_info(paths)
-    filtered = filter_files(
-        infos,
-        min_size=parsed_min_size,
-        min_age_days=unused_days,
-        file_types=file_type or None,
-    )
-    if not filtered:
-        typer.echo("No files matched the given criteria. Try adjusting --unused-days, --min-size, or --file-type.")
-        return
-    stats = run_interactive_review(filtered, dry_run=dry_run)
+    if output is not None:
+        if output not in OUTPUT_FORMATS:
+            typer.echo(f"Error: --output must be one of: {', '.join(OUTPUT_FORMATS)}")
+            raise typer.Exit(code=1)
+        if policy is not None or duplicates or plan is not None:
+            typer.echo("Error: --output cannot be combined with --policy, --duplicates or --plan")
+            raise typer.Exit(code=1)
+    if plan is not None and duplicates:
+        typer.echo("Error: --plan cannot be combined with --duplicates")
+        raise typer.Exit(code=1)
+    if policy is not None and duplicates:
+        typer.echo("Error: --policy cannot be combined with --duplicates")
+        raise typer.Exit(code=1)
+    if sniff and not file_type:
+        typer.echo("Error: --sniff requires --file-type")
+        raise typer.Exit(code=1)
+    if metrics_out is not None and metrics_out.suffix.lower() not in METRICS_FORMATS:
+        typer.echo("Error: --metrics-out must end in .prom or .json")
+        raise typer.Exit(code=1)
+    rules = None
+    if policy is not None:
+        try:
+            rules = load_policy(policy)
+        except ValueError as exc:
+            typer.echo(f"Error: {exc}")
+            raise typer.Exit(code=1)
+    if log_file is not None:
+        configure_log(log_file)
+    install_exit_flush()
+    # With --output, stdout carries only records; everything else that
+    # would be printed (header, warnings, report) goes to stderr.
+    records_out = sys.stdout
+    with ExitStack() as stack:
+        if output is not None:
+            stack.enter_context(redirect_stdout(sys.stderr))
+        if profile is not None:
+            stack.enter_context(profiling.profile(profile))
+        if show_stats or metrics_out is not None:
+            stack.callback(_finish_metrics, metrics.enable(), time.perf_counter(), show_stats, metrics_out)
+        render_scan_header(", ".join(str(r) for r in roots), parsed_min_size, unused_days, dry_run)
+        # With --sniff the type check runs after the size/age filters,
+        # so the walk and the filters must not drop files by extension.
+        walk_types = None if sniff else file_type
+        matcher = compile_matcher(include, exclude, walk_types)
+        criteria = {"min_size": parsed_min_size, "min_age_days": unused_days, "file_types": walk_types or None}
+        cache = TypeCache(index) if sniff and index is not None else None
+        if cache is not None:
+            stack.callback(cache.close)
+        if index is not None:
+            infos = chain.from_iterable(
+                scan_indexed(r, index, recursive=recursive, rebuild=rebuild_index and r == roots[0], matcher=matcher)
+                for r in roots
+            )
+        elif checkpoint is not None:
+            settings = {"include": include, "exclude": exclude, "file_type": walk_types}
+            try:
+                infos = scan_checkpointed(
+                    roots, checkpoint, recursive=recursive, matcher=matcher, resume=resume, settings=settings
+                )
+            except ValueError as exc:
+                typer.echo(f"Error: {exc}")
+                raise typer.Exit(code=1)
+        elif processes > 1:
+            # The directory report needs every scanned file, so workers
+            # only pre-filter when there is no report.
+            reporting = report_depth is not None or report_out is not None
+            pre_filter = None if reporting else criteria
+            infos = chain.from_iterable(
+                scan_sharded(roots, processes, recursive=recursive, matcher=matcher, criteria=pre_filter)
+            )
+        else:
+            infos = scan_roots(roots, lambda r: scan_file_infos(r, recursive=recursive, workers=workers, matcher=matcher))
+        report = None
+        if report_depth is not None or report_out is not None:
+            report = DirReport(roots, depth=1 if report_depth is None else report_depth)
+            infos = report.tally(infos)
+        if compact:
+            candidates = filter_files(FileBatch().extend(infos), **criteria)
+        else:
+            candidates = iter_filter_files(infos, **criteria)
+        if index is not None:
+            # Cached access times may be stale; check the matches again.
+            candidates = iter_filter_files(refresh(candidates), **criteria)
+        if sniff:
+            candidates = sniff_filter(candidates, file_type, cache)
+        matches = _non_empty(candidates)
+        if top is not None and matches is not None:
+            matches = top_files(matches, top, sort)
+        if report is not None:
+            # The report covers every scanned file, so finish the scan first.
+            if matches is not None and not hasattr(matches, "__len__"):
+                matches = list(matches)
+            render_dir_report(report.rows())
+            if report_out is not None:
+                write_report(report.rows(), report_out)
+        if matches is None:
+            typer.echo("No files matched the given criteria. Try adjusting --unused-days, --min-size, or --file-type.")
+            return
+        if output is not None:
+            try:
+                count = write_records(matches, output, records_out)
+            except BrokenPipeError:
+                # The reader went away (e.g. `| head`); keep the exit-time flush quiet.
+                os.dup2(os.open(os.devnull, os.O_WRONLY), records_out.fileno())
+                raise typer.Exit(code=1)
+            typer.echo(f"Wrote {count} records")
+            return
+        archive = ArchiveSettings(compresslevel=archive_level, processes=archive_processes)
+        writer = PlanWriter(plan) if plan is not None else None
+        if rules is not None:
+            queue = OperationQueue(dry_run=dry_run, workers=batch_workers, archive=archive)
+            stats = run_policy(
+                matches, rules.decide, dry_run=dry_run, queue=queue, archive=archive, roots=roots, plan=writer
+            )
+        elif duplicates:
+            groups = find_duplicates(matches)
+            if not groups:
+                typer.echo("No duplicate files found among the matching files.")
+                return
+            stats = run_duplicate_review(groups, dry_run=dry_run)
+        else:
+            queue = OperationQueue(dry_run=dry_run, workers=batch_workers, archive=archive) if batch else None
+            stats = run_interactive_review(
+                matches, dry_run=dry_run, queue=queue, archive=archive, roots=roots, plan=writer
+            )
+        if writer is not None:
+            writer.close()
+            typer.echo(f"Wrote {writer.count} planned operation(s) to {plan}; run `cleansys apply {plan}` to execute.")
+        flush_log(sync=True)
+        render_scan_summary(stats, dry_run=dry_run)
+
+
+@app.command()
+def apply(
+    plan: Path = typer.Argument(..., help="Plan file written by `cleansys scan --plan`"),
+    dry_run: bool = typer.Option(False, "--dry-run", help="Show actions without executing"),
+    workers: int = typer.Option(4, "--workers", min=1, help="Threads executing operations"),
+    batch_size: int = typer.Option(
+        1000,
+        "--batch-size",
+        min=1,
+        help="Operations per batch; progress is checkpointed after each batch",
+    ),
+    archive_level: int = typer.Option(
+        6,
+        "--archive-level",
+        min=0,
+        max=9,
+        help="DEFLATE level for archived files (0 = store only); compressed formats are always stored",
+    ),
+    archive_processes: int = typer.Option(
+        1,
+        "--archive-processes",
+        min=1,
+        help="Processes used to compress archive members in parallel",
+    ),
+    log_file: Optional[Path] = typer.Option(
+        None,
+        "--log-file",
+        help="Operation log path (default: cleansys.log in the current directory)",
+    ),
+) -> None:
+    """Execute a plan file, skipping files that changed since it was written.
+
+    Re-running an interrupted apply resumes after the last finished batch.
+    """
+    if not plan.is_file():
+        typer.echo(f"Error: Plan file does not exist: {plan}")
+        raise typer.Exit(code=1)
+    if log_file is not None:
+        configure_log(log_file)
+    install_exit_flush()
+    archive = ArchiveSettings(compresslevel=archive_level, processes=archive_processes)
+    results = apply_plan(plan, dry_run=dry_run, workers=workers, archive=archive, batch_size=batch_size)
+    try:
+        stats = summarize_results(results, dry_run=dry_run)
+    except ValueError as exc:
+        typer.echo(f"Error: {exc}")
+        raise typer.Exit(code=1)
+    flush_log(sync=True)
     render_scan_summary(stats, dry_run=dry_run)
 
 
+def _finish_metrics(meter: metrics.Metrics, start: float, show: bool, out: Path | None) -> None:
+    """Record the run's total time, then print and/or export the metrics."""
+    meter.add("run", time.perf_counter() - start)
+    metrics.disable()
+    snapshot = meter.snapshot()
+    if show:
+        render_metrics(snapshot)
+    if out is not None:
+        write_metrics(snapshot, out)
+
+
+def _non_empty(files: Iterable[FileInfo]) -> Iterable[FileInfo] | None:
+    """Return files, or None when there are none, without consuming a stream."""
+    if hasattr(files, "__len__"):
+        return files if len(files) else None
+    stream = iter(files)
+    first = next(stream, None)
+    if first is None:
+        return None
+    return chain([first], stream)
+
+
 def main() -> None:
     """Entry point for console_scripts."""
     app()
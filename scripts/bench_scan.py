@@ -0,0 +1,78 @@
+"""Compare the legacy Path-based scan with the scandir scan engine.
+
+Generates a synthetic tree, then runs both pipelines while counting the
+filesystem calls each one makes and measuring wall time:
+
+    python scripts/bench_scan.py --dirs 200 --files-per-dir 50
+
+Syscall counts come from `benchmarks.measure.count_syscalls`. For
+per-stage numbers across the whole pipeline, see `python -m benchmarks`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.measure import count_syscalls
+from src.analyzer import to_file_info
+from src.scanner import scan_directory
+from src.walker import scan_file_infos
+
+
+def generate_tree(root: Path, dirs: int, files_per_dir: int) -> int:
+    """Create a two-level tree of small files and return the file count."""
+    for d in range(dirs):
+        sub = root / f"group{d % 10}" / f"dir{d}"
+        sub.mkdir(parents=True, exist_ok=True)
+        for f in range(files_per_dir):
+            (sub / f"file{f}.log").write_bytes(b"x" * (f % 7))
+    return dirs * files_per_dir
+
+
+def legacy_scan(root: Path) -> int:
+    """Run the pre-scandir pipeline: scan_directory + to_file_info."""
+    return len(to_file_info(list(scan_directory(root))))
+
+
+def scandir_scan(root: Path) -> int:
+    """Run the scandir scan engine."""
+    return sum(1 for _ in scan_file_infos(root))
+
+
+def measure(label: str, func: Callable[[Path], int], root: Path) -> None:
+    """Run func once with counters and once more for wall time, then report."""
+    with count_syscalls() as counts:
+        files = func(root)
+    start = time.perf_counter()
+    func(root)
+    elapsed = time.perf_counter() - start
+    total = sum(counts.values())
+    print(
+        f"{label:<8} files={files} syscalls={total} ({total / max(files, 1):.2f}/file, "
+        f"stat={counts['stat']} listdir={counts['listdir']} scandir={counts['scandir']}) "
+        f"wall={elapsed:.3f}s"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--dirs", type=int, default=200)
+    parser.add_argument("--files-per-dir", type=int, default=50)
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        count = generate_tree(root, args.dirs, args.files_per_dir)
+        print(f"Generated {count} files in {args.dirs} directories under {root}")
+        measure("legacy", legacy_scan, root)
+        measure("scandir", scandir_scan, root)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import TYPE_CHECKING, AsyncIterator, Callable, Iterable, TypeVar
+
+from .analyzer import FileInfo
+from .matcher import PathMatcher
+from .operations import Operation, delete_file, execute_operation, move_file
+from .walker import list_directory
+
+if TYPE_CHECKING:
+    from typing_extensions import Self  # typing.Self needs Python 3.11
+
+T = TypeVar("T")
+
+
+async def ascan(
+    root: Path,
+    recursive: bool = True,
+    concurrency: int = 64,
+    matcher: PathMatcher | None = None,
+) -> AsyncIterator[FileInfo]:
+    """Asynchronously yield FileInfo records for files under root.
+
+    Up to `concurrency` directory listings (each with its per-file stat
+    calls) are outstanding at once on a dedicated thread pool, which
+    keeps slow FUSE/object-store mounts busy. Skipping rules and the
+    permission-denied warning match `scan_file_infos`.
+
+        async for info in ascan(Path("/mnt/bucket"), concurrency=256):
+            ...
+    """
+    loop = asyncio.get_running_loop()
+    if not await loop.run_in_executor(None, root.exists):
+        return
+    if await loop.run_in_executor(None, root.is_file):
+        st = await loop.run_in_executor(None, root.stat)
+        yield FileInfo(path=root, size=st.st_size, access_ts=st.st_atime)
+        return
+    pool = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="cleansys-ascan")
+
+    def listing(dirpath: str) -> asyncio.Future:
+        return loop.run_in_executor(pool, list_directory, dirpath, matcher)
+
+    pending = {listing(str(root))}
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for future in done:
+                result = future.result()
+                if result is None:
+                    continue
+                infos, subdirs = result
+                if recursive:
+                    pending.update(listing(d) for d in subdirs)
+                for info in infos:
+                    yield info
+    finally:
+        for future in pending:
+            future.cancel()
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+class IOLimit:
+    """A bound on outstanding blocking calls, with a thread pool to match.
+
+    Share one between `adelete`/`amove` calls: up to `size` calls run at
+    once on the limit's own threads, so thousands of unlinks can be in
+    flight (the loop's default executor has at most 32 threads). Close
+    it, or use it as a context manager, when done.
+
+        with IOLimit(1000) as limit:
+            await asyncio.gather(*(adelete(p, False, limit) for p in paths))
+    """
+
+    def __init__(self, size: int) -> None:
+        self.semaphore = asyncio.Semaphore(size)
+        self.executor = ThreadPoolExecutor(max_workers=size, thread_name_prefix="cleansys-aio")
+
+    def close(self) -> None:
+        """Release the limit's threads once running calls finish."""
+        self.executor.shutdown(wait=False)
+
+    def __enter__(self) -> "Self":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
+async def adelete(path: Path, dry_run: bool, limit: IOLimit | None = None) -> bool:
+    """Delete a file on a worker thread; see `delete_file`.
+
+    Pass a shared `IOLimit` as `limit` to bound outstanding unlinks.
+    """
+    return await _limited(limit, delete_file, path, dry_run)
+
+
+async def amove(src: Path, dst: Path, dry_run: bool, limit: IOLimit | None = None) -> bool:
+    """Move a file on a worker thread; see `move_file`."""
+    return await _limited(limit, move_file, src, dst, dry_run)
+
+
+async def arun_operations(ops: Iterable[Operation], dry_run: bool, concurrency: int = 64) -> list[bool]:
+    """Execute operations concurrently, at most `concurrency` at a time.
+
+    Results are returned in the order of `ops`.
+    """
+    limit = asyncio.Semaphore(concurrency)
+    loop = asyncio.get_running_loop()
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="cleansys-aop") as pool:
+
+        async def run(op: Operation) -> bool:
+            async with limit:
+                return await loop.run_in_executor(pool, execute_operation, op, dry_run)
+
+        return list(await asyncio.gather(*(run(op) for op in ops)))
+
+
+async def _limited(limit: IOLimit | None, func: Callable[..., T], *args) -> T:
+    """Run a blocking call on the limit's threads, or the default executor."""
+    loop = asyncio.get_running_loop()
+    if limit is None:
+        return await loop.run_in_executor(None, func, *args)
+    async with limit.semaphore:
+        return await loop.run_in_executor(limit.executor, func, *args)
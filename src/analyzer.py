@@ -1,9 +1,16 @@
+import heapq
 from pathlib import Path
 from dataclasses import dataclass
-from typing import Iterable, List
+from typing import TYPE_CHECKING, Iterable, Iterator, List
 
+from . import metrics
 from .scanner import get_access_time, get_size
 
+if TYPE_CHECKING:
+    from .columnar import FileBatch
+
+SORT_KEYS = ("size", "atime")
+
 
 @dataclass
 class FileInfo:
@@ -20,16 +27,24 @@ class FileInfo:
 
 def to_file_info(paths: Iterable[Path]) -> List[FileInfo]:
     """Convert paths to FileInfo objects."""
-    infos: List[FileInfo] = []
+    return list(iter_file_info(paths))
+
+
+def iter_file_info(paths: Iterable[Path]) -> Iterator[FileInfo]:
+    """Lazily convert paths to FileInfo objects, one at a time."""
     for path in paths:
-        infos.append(
-            FileInfo(
-                path=path,
-                size=get_size(path),
-                access_ts=get_access_time(path).timestamp(),
-            )
+        yield FileInfo(
+            path=path,
+            size=get_size(path),
+            access_ts=get_access_time(path).timestamp(),
         )
-    return infos
+
+
+def to_file_batch(paths: Iterable[Path]) -> "FileBatch":
+    """Convert paths into a compact columnar FileBatch."""
+    from .columnar import FileBatch
+
+    return FileBatch().extend(iter_file_info(paths))
 
 
 def filter_files(
@@ -42,7 +57,28 @@ def filter_files(
     """Filter files by optional size, age, and type criteria.
 
     Age is computed from last access time, so `--unused-days` reflects
-    how long a file has not been accessed.
+    how long a file has not been accessed. A `FileBatch` input is
+    filtered column-wise and returned as a `FileBatch`.
+    """
+    from .columnar import FileBatch, filter_batch
+
+    if isinstance(files, FileBatch):
+        with metrics.timed("filter", items=len(files)):
+            return filter_batch(files, min_size, min_age_days, now_ts, file_types)
+    return list(iter_filter_files(files, min_size, min_age_days, now_ts, file_types))
+
+
+def iter_filter_files(
+    files: Iterable[FileInfo],
+    min_size: int | None = None,
+    min_age_days: int | None = None,
+    now_ts: float | None = None,
+    file_types: list[str] | None = None,
+) -> Iterator[FileInfo]:
+    """Lazily yield files matching the same criteria as `filter_files`.
+
+    Matches are produced as soon as they arrive from `files`, so a
+    streaming scan can feed the review loop without a full list.
     """
     if now_ts is None:
         from time import time
@@ -51,18 +87,34 @@ def filter_files(
     normalized_types = None
     if file_types:
         normalized_types = {t.lower() if t.startswith(".") else f".{t.lower()}" for t in file_types}
-    result: List[FileInfo] = []
-    for info in files:
-        if min_size is not None and info.size < min_size:
-            continue
-        if min_age_days is not None:
-            age_seconds = now_ts - info.access_ts
-            if age_seconds < min_age_days * 86400:
+    cutoff_ts = None if min_age_days is None else now_ts - min_age_days * 86400
+
+    def matching(stream: Iterable[FileInfo]) -> Iterator[FileInfo]:
+        for info in stream:
+            if min_size is not None and info.size < min_size:
                 continue
-        if normalized_types is not None:
-            if info.path.suffix.lower() not in normalized_types:
+            if cutoff_ts is not None and info.access_ts > cutoff_ts:
                 continue
-        result.append(info)
-    return result
+            if normalized_types is not None:
+                if info.path.suffix.lower() not in normalized_types:
+                    continue
+            yield info
+
+    meter = metrics.current()
+    if meter is None:
+        return matching(files)
+    return meter.meter("filter", matching, files)
 
 
+def top_files(files: Iterable[FileInfo], n: int, sort: str = "size") -> List[FileInfo]:
+    """Return the n largest (sort="size") or least recently accessed
+    (sort="atime") files, sorted with the worst offender first.
+
+    `files` is consumed as a stream through a heap bounded to n entries,
+    so memory stays O(n) however many files are scanned.
+    """
+    if sort == "size":
+        return heapq.nlargest(n, files, key=lambda info: info.size)
+    if sort == "atime":
+        return heapq.nsmallest(n, files, key=lambda info: info.access_ts)
+    raise ValueError(f"Unknown sort key: {sort!r} (expected one of: {', '.join(SORT_KEYS)})")
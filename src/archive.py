@@ -0,0 +1,185 @@
+import multiprocessing
+import zipfile
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Iterator
+
+# Suffixes whose content is already compressed; deflating them again
+# burns CPU for no gain, so they are stored as-is.
+STORE_SUFFIXES = frozenset(
+    {
+        ".gz", ".tgz", ".bz2", ".xz", ".zst", ".lz4", ".zip", ".7z", ".rar", ".jar",
+        ".jpg", ".jpeg", ".png", ".gif", ".webp", ".heic",
+        ".mp3", ".aac", ".ogg", ".flac", ".mp4", ".mkv", ".mov", ".avi", ".webm",
+    }
+)
+# Members up to this size may be deflated in worker processes; larger
+# ones are streamed through the parent so memory stays bounded.
+PARALLEL_MAX_MEMBER = 64 * 1024 * 1024
+_CHUNK = 1024 * 1024
+
+
+@dataclass(frozen=True)
+class ArchiveSettings:
+    """How members are compressed when writing an archive.
+
+    `compresslevel` 0 stores every member; 1-9 selects DEFLATE effort.
+    With processes > 1, members are compressed concurrently in a process
+    pool and written by the parent in order. That path adds precompressed
+    data through zipfile internals; if they are missing (see
+    `_supports_raw_members`), members are compressed serially instead.
+    """
+
+    compresslevel: int = 6
+    processes: int = 1
+    store_suffixes: frozenset = STORE_SUFFIXES
+
+
+def write_archive(files: Iterable[Path], archive_path: Path, settings: ArchiveSettings) -> list[Path]:
+    """Append files to a zip archive, creating it if needed.
+
+    Existing members are kept; a member whose name is already taken is
+    added as 'stem_N.ext'. Returns the files that were missing and thus
+    skipped. If writing fails, an archive created by this call is removed
+    before the error is raised.
+    """
+    mode = "a" if archive_path.exists() else "w"
+    if mode == "a" and not zipfile.is_zipfile(archive_path):
+        raise zipfile.BadZipFile(f"not a zip archive: {archive_path}")
+    missing: list[Path] = []
+    present: list[Path] = []
+    for fpath in files:
+        (present if fpath.is_file() else missing).append(fpath)
+    try:
+        with zipfile.ZipFile(archive_path, mode, allowZip64=True) as zf:
+            taken = set(zf.NameToInfo)
+            processes = settings.processes if _supports_raw_members(zf) else 1
+            for fpath, packed in _compressed_members(present, settings, processes):
+                arcname = _unique_arcname(fpath.name, taken)
+                if packed is None:
+                    compress_type, level = _method_for(fpath, settings)
+                    zf.write(fpath, arcname, compress_type=compress_type, compresslevel=level)
+                else:
+                    _write_deflated(zf, fpath, arcname, packed)
+    except BaseException:
+        if mode == "w":
+            archive_path.unlink(missing_ok=True)
+        raise
+    return missing
+
+
+def _method_for(fpath: Path, settings: ArchiveSettings) -> tuple[int, int | None]:
+    """Return the zip compression method and level for one member."""
+    if settings.compresslevel == 0 or fpath.suffix.lower() in settings.store_suffixes:
+        return zipfile.ZIP_STORED, None
+    return zipfile.ZIP_DEFLATED, settings.compresslevel
+
+
+def _unique_arcname(name: str, taken: set[str]) -> str:
+    """Return name, or 'stem_N.ext' if the archive already has it."""
+    candidate = name
+    stem, suffix = Path(name).stem, Path(name).suffix
+    counter = 1
+    while candidate in taken:
+        candidate = f"{stem}_{counter}{suffix}"
+        counter += 1
+    taken.add(candidate)
+    return candidate
+
+
+def _supports_raw_members(zf: zipfile.ZipFile) -> bool:
+    """Return True if zf has the internals `_write_deflated` relies on.
+
+    They have been stable since Python 3.6 but are not public, so a
+    CPython release that changes them disables parallel compression
+    rather than breaking archiving.
+    """
+    return all(hasattr(zf, name) for name in ("fp", "start_dir", "_writecheck", "_didModify", "filelist", "NameToInfo"))
+
+
+def _compressed_members(
+    files: list[Path],
+    settings: ArchiveSettings,
+    processes: int,
+) -> Iterator[tuple[Path, tuple[bytes, int, int] | None]]:
+    """Yield (file, precompressed data) pairs in input order.
+
+    The data is None for members the parent should stream itself: all of
+    them when running single-process, stored members, and large files.
+    Parallel work is submitted in windows to bound buffered output.
+
+    Archives are written from `OperationQueue` worker threads, and forking
+    a multi-threaded process is unsafe, so the pool's workers are started
+    with forkserver (or spawn where that is unavailable). If the pool
+    breaks, for example because a worker cannot import `__main__`, the
+    remaining members are compressed by the parent instead.
+    """
+    parallel = [
+        processes > 1
+        and _method_for(f, settings)[0] == zipfile.ZIP_DEFLATED
+        and f.stat().st_size <= PARALLEL_MAX_MEMBER
+        for f in files
+    ]
+    if not any(parallel):
+        yield from ((f, None) for f in files)
+        return
+    window = processes * 4
+    methods = multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+    done = 0
+    try:
+        with ProcessPoolExecutor(max_workers=processes, mp_context=context) as pool:
+            for start in range(0, len(files), window):
+                chunk = files[start : start + window]
+                jobs = [
+                    pool.submit(_deflate, str(f), settings.compresslevel) if use else None
+                    for f, use in zip(chunk, parallel[start : start + window])
+                ]
+                for fpath, job in zip(chunk, jobs):
+                    yield fpath, None if job is None else job.result()
+                    done += 1
+    except BrokenProcessPool:
+        yield from ((f, None) for f in files[done:])
+
+
+def _deflate(path: str, level: int) -> tuple[bytes, int, int]:
+    """Raw-DEFLATE a file in a worker process; return (data, crc32, size)."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, -15)
+    parts: list[bytes] = []
+    crc = size = 0
+    with open(path, "rb") as fh:
+        for block in iter(lambda: fh.read(_CHUNK), b""):
+            crc = zlib.crc32(block, crc)
+            size += len(block)
+            parts.append(compressor.compress(block))
+    parts.append(compressor.flush())
+    return b"".join(parts), crc, size
+
+
+def _write_deflated(zf: zipfile.ZipFile, fpath: Path, arcname: str, packed: tuple[bytes, int, int]) -> None:
+    """Write a member whose DEFLATE stream was produced by `_deflate`.
+
+    zipfile has no public API for adding precompressed data, so this
+    mirrors what `ZipFile.open(..., "w")` does for a seekable archive:
+    write the local header and data at the central directory offset and
+    register the member so it lands in the directory on close.
+    """
+    data, crc, size = packed
+    zinfo = zipfile.ZipInfo.from_file(fpath, arcname)
+    zinfo.compress_type = zipfile.ZIP_DEFLATED
+    zinfo.file_size = size
+    zinfo.compress_size = len(data)
+    zinfo.CRC = crc
+    zip64 = max(zinfo.file_size, zinfo.compress_size) > zipfile.ZIP64_LIMIT
+    zf.fp.seek(zf.start_dir)
+    zinfo.header_offset = zf.fp.tell()
+    zf._writecheck(zinfo)
+    zf._didModify = True
+    zf.fp.write(zinfo.FileHeader(zip64))
+    zf.fp.write(data)
+    zf.start_dir = zf.fp.tell()
+    zf.filelist.append(zinfo)
+    zf.NameToInfo[zinfo.filename] = zinfo
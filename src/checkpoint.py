@@ -0,0 +1,133 @@
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, BinaryIO, Iterator
+
+from .analyzer import FileInfo
+from .matcher import PathMatcher
+from .walker import list_directory, scan_file_infos
+
+# Save walker state after this many directories or seconds, whichever
+# comes first, so a killed scan loses at most a few seconds of work.
+_SAVE_EVERY_DIRS = 200
+_SAVE_EVERY_SECONDS = 5.0
+
+
+def scan_checkpointed(
+    roots: list[Path],
+    checkpoint: Path,
+    recursive: bool = True,
+    matcher: PathMatcher | None = None,
+    resume: bool = False,
+    settings: dict[str, Any] | None = None,
+) -> Iterator[FileInfo]:
+    """Yield FileInfo records for roots, checkpointing the walk to disk.
+
+    The walker's pending-directory stack is saved to `checkpoint` (JSON,
+    replaced atomically), and every record found so far is appended to
+    `<checkpoint>.results` (JSON Lines). With resume=True, the saved
+    records are yielded again first, then the walk continues from the
+    saved stack. A finished scan is marked complete, so resuming it only
+    replays the results.
+
+    `settings` (e.g. the include/exclude rules) is stored with the state;
+    resuming with different roots or settings raises ValueError before
+    any scanning starts. The walk is sequential.
+    """
+    results_path = checkpoint.with_name(checkpoint.name + ".results")
+    key = {"roots": [str(r.absolute()) for r in roots], "recursive": recursive, "settings": settings or {}}
+    state = _load_state(checkpoint, key) if resume else None
+    if state is None:
+        state = {**key, "stack": [], "offset": 0, "complete": False}
+        for root in reversed(roots):
+            if root.is_dir():
+                state["stack"].append(str(root.absolute()))
+        checkpoint.parent.mkdir(parents=True, exist_ok=True)
+        results_path.write_bytes(b"")
+        with results_path.open("ab") as out:
+            for root in roots:
+                if root.is_file():
+                    for info in scan_file_infos(root):
+                        out.write(_encode(info))
+            state["offset"] = out.tell()
+        _save_state(checkpoint, state)
+    else:
+        print(f"Resuming scan from {checkpoint}.")
+    return _walk(state, checkpoint, results_path, recursive, matcher)
+
+
+def _walk(
+    state: dict[str, Any],
+    checkpoint: Path,
+    results_path: Path,
+    recursive: bool,
+    matcher: PathMatcher | None,
+) -> Iterator[FileInfo]:
+    """Replay saved records, then walk the saved stack, saving as it goes."""
+    with results_path.open("r+b") as out:
+        # Records written after the last checkpoint are dropped; their
+        # directories are still on the saved stack and will be re-listed.
+        out.truncate(state["offset"])
+        for line in out:
+            yield _decode(line)
+        stack: list[str] = state["stack"]
+        listed = 0
+        last_save = time.monotonic()
+        while stack:
+            listing = list_directory(stack.pop(), matcher)
+            if listing is not None:
+                infos, subdirs = listing
+                out.writelines(_encode(info) for info in infos)
+                if recursive:
+                    stack.extend(subdirs)
+                yield from infos
+            listed += 1
+            if listed % _SAVE_EVERY_DIRS == 0 or time.monotonic() - last_save >= _SAVE_EVERY_SECONDS:
+                _sync(out, state, checkpoint)
+                last_save = time.monotonic()
+        state["complete"] = True
+        _sync(out, state, checkpoint)
+
+
+def _load_state(checkpoint: Path, key: dict[str, Any]) -> dict[str, Any] | None:
+    """Return saved state matching key, or None if there is none."""
+    try:
+        state = json.loads(checkpoint.read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        print(f"[WARN] No checkpoint at {checkpoint}; starting a new scan.")
+        return None
+    except (OSError, ValueError) as exc:
+        raise ValueError(f"cannot read checkpoint {checkpoint}: {exc}") from exc
+    if any(state.get(name) != value for name, value in key.items()):
+        raise ValueError(f"checkpoint {checkpoint} was written for different roots or scan options")
+    return state
+
+
+def _sync(out: BinaryIO, state: dict[str, Any], checkpoint: Path) -> None:
+    """Make results durable, then record the matching walker state."""
+    out.flush()
+    os.fsync(out.fileno())
+    state["offset"] = out.tell()
+    _save_state(checkpoint, state)
+
+
+def _save_state(checkpoint: Path, state: dict[str, Any]) -> None:
+    """Atomically replace the checkpoint file with state."""
+    tmp = checkpoint.with_name(checkpoint.name + ".tmp")
+    with tmp.open("w", encoding="utf-8") as fh:
+        json.dump(state, fh)
+        fh.flush()
+        os.fsync(fh.fileno())
+    os.replace(tmp, checkpoint)
+
+
+def _encode(info: FileInfo) -> bytes:
+    """Serialize a record as one compact JSON line."""
+    return (json.dumps([str(info.path), info.size, info.access_ts]) + "\n").encode("utf-8")
+
+
+def _decode(line: bytes) -> FileInfo:
+    """Parse a line written by `_encode`."""
+    path, size, access_ts = json.loads(line)
+    return FileInfo(path=Path(path), size=size, access_ts=access_ts)
@@ -0,0 +1,245 @@
+import os
+import sys
+from array import array
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from .analyzer import FileInfo
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; filter_batch falls back to pure Python.
+    np = None
+
+
+def path_suffix(name: str) -> str:
+    """Return the suffix of a file name with the same rules as `Path.suffix`."""
+    i = name.rfind(".")
+    if 0 < i < len(name) - 1:
+        return name[i:]
+    return ""
+
+
+class FileBatch:
+    """Compact struct-of-arrays store of file metadata.
+
+    Directories and lower-cased suffixes are interned into small tables;
+    per-file data lives in typed arrays plus one byte buffer of encoded
+    names, so a record costs a few dozen bytes instead of a `FileInfo`
+    and its `Path`. Records are turned into `FileInfo` objects only when
+    iterated or accessed with `info()`.
+    """
+
+    def __init__(self) -> None:
+        self.dirs: list[str] = []
+        self.suffixes: list[str] = []
+        self._dir_ids: dict[str, int] = {}
+        self._suffix_ids: dict[str, int] = {}
+        self.dir_ids = array("I")
+        self.suffix_ids = array("I")
+        self.sizes = array("q")
+        self.access_ts = array("d")
+        self._names = bytearray()
+        self._name_ends = array("Q")
+
+    def __len__(self) -> int:
+        return len(self.sizes)
+
+    def __iter__(self) -> Iterator[FileInfo]:
+        for i in range(len(self)):
+            yield self.info(i)
+
+    def __getstate__(self) -> dict:
+        # The id lookups mirror the tables; rebuild them instead of pickling.
+        state = self.__dict__.copy()
+        del state["_dir_ids"], state["_suffix_ids"]
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._dir_ids = {d: i for i, d in enumerate(self.dirs)}
+        self._suffix_ids = {s: i for i, s in enumerate(self.suffixes)}
+
+    def append(self, dirpath: str, name: str, size: int, access_ts: float) -> None:
+        """Add one file record."""
+        self.dir_ids.append(self._intern_dir(dirpath))
+        self.suffix_ids.append(self._intern_suffix(path_suffix(name).lower()))
+        self.sizes.append(size)
+        self.access_ts.append(access_ts)
+        self._names += os.fsencode(name)
+        self._name_ends.append(len(self._names))
+
+    def extend(self, infos: Iterable[FileInfo]) -> "FileBatch":
+        """Append FileInfo records, e.g. straight from a scan stream."""
+        for info in infos:
+            self.append(str(info.path.parent), info.path.name, info.size, info.access_ts)
+        return self
+
+    def merge(self, other: "FileBatch") -> "FileBatch":
+        """Append every record of another batch, remapping its tables."""
+        dir_map = [self._intern_dir(d) for d in other.dirs]
+        suffix_map = [self._intern_suffix(s) for s in other.suffixes]
+        self.dir_ids.extend(dir_map[i] for i in other.dir_ids)
+        self.suffix_ids.extend(suffix_map[i] for i in other.suffix_ids)
+        self.sizes.extend(other.sizes)
+        self.access_ts.extend(other.access_ts)
+        base = len(self._names)
+        self._names += other._names
+        self._name_ends.extend(base + end for end in other._name_ends)
+        return self
+
+    def _intern_dir(self, dirpath: str) -> int:
+        """Return the id of a directory, adding it if new."""
+        dir_id = self._dir_ids.get(dirpath)
+        if dir_id is None:
+            dir_id = self._dir_ids[dirpath] = len(self.dirs)
+            self.dirs.append(dirpath)
+        return dir_id
+
+    def _intern_suffix(self, suffix: str) -> int:
+        """Return the id of a lower-cased suffix, adding it if new."""
+        suffix_id = self._suffix_ids.get(suffix)
+        if suffix_id is None:
+            suffix_id = self._suffix_ids[suffix] = len(self.suffixes)
+            self.suffixes.append(suffix)
+        return suffix_id
+
+    def name(self, i: int) -> str:
+        """Return the file name of record i."""
+        start = self._name_ends[i - 1] if i else 0
+        return os.fsdecode(bytes(self._names[start : self._name_ends[i]]))
+
+    def path(self, i: int) -> Path:
+        """Return the full path of record i."""
+        return Path(self.dirs[self.dir_ids[i]], self.name(i))
+
+    def info(self, i: int) -> FileInfo:
+        """Materialize record i as a FileInfo."""
+        return FileInfo(path=self.path(i), size=self.sizes[i], access_ts=self.access_ts[i])
+
+    def select(self, indices: Iterable[int]) -> "FileBatch":
+        """Return a new batch holding only the given records.
+
+        The directory and suffix tables are shared with this batch. A
+        NumPy index array (from the vectorized filter) is gathered
+        column-wise without a per-record loop.
+        """
+        out = FileBatch()
+        out.dirs, out._dir_ids = self.dirs, self._dir_ids
+        out.suffixes, out._suffix_ids = self.suffixes, self._suffix_ids
+        if np is not None and isinstance(indices, np.ndarray):
+            if len(indices) and len(self):
+                _gather(self, out, indices)
+            return out
+        for i in indices:
+            start = self._name_ends[i - 1] if i else 0
+            out._names += self._names[start : self._name_ends[i]]
+            out._name_ends.append(len(out._names))
+            out.dir_ids.append(self.dir_ids[i])
+            out.suffix_ids.append(self.suffix_ids[i])
+            out.sizes.append(self.sizes[i])
+            out.access_ts.append(self.access_ts[i])
+        return out
+
+    def nbytes(self) -> int:
+        """Approximate memory held by the batch, including interned tables."""
+        columns = (self.dir_ids, self.suffix_ids, self.sizes, self.access_ts, self._name_ends)
+        total = sum(sys.getsizeof(col) for col in columns) + sys.getsizeof(self._names)
+        tables = self.dirs + self.suffixes
+        return total + sum(sys.getsizeof(s) for s in tables) + 8 * len(tables)
+
+
+def filter_batch(
+    batch: FileBatch,
+    min_size: int | None = None,
+    min_age_days: int | None = None,
+    now_ts: float | None = None,
+    file_types: list[str] | None = None,
+    vectorized: bool = True,
+) -> FileBatch:
+    """Filter a FileBatch with the same criteria as `filter_files`.
+
+    When NumPy is installed (and vectorized is True) all criteria are
+    evaluated as boolean masks over the columns; otherwise a plain loop
+    is used. Both paths select the same records.
+    """
+    if now_ts is None:
+        from time import time
+
+        now_ts = time()
+    allowed = None
+    if file_types:
+        normalized = {t.lower() if t.startswith(".") else f".{t.lower()}" for t in file_types}
+        allowed = [batch._suffix_ids[t] for t in normalized if t in batch._suffix_ids]
+    cutoff_ts = None if min_age_days is None else now_ts - min_age_days * 86400
+    if vectorized and np is not None:
+        keep = _mask_indices(batch, min_size, cutoff_ts, allowed)
+    else:
+        keep = _loop_indices(batch, min_size, cutoff_ts, allowed)
+    return batch.select(keep)
+
+
+def _loop_indices(
+    batch: FileBatch,
+    min_size: int | None,
+    cutoff_ts: float | None,
+    allowed: list[int] | None,
+) -> list[int]:
+    """Return indices of matching records using a per-record loop."""
+    allowed_set = None if allowed is None else set(allowed)
+    keep: list[int] = []
+    columns = zip(batch.sizes, batch.access_ts, batch.suffix_ids)
+    for i, (size, access_ts, suffix_id) in enumerate(columns):
+        if min_size is not None and size < min_size:
+            continue
+        if cutoff_ts is not None and access_ts > cutoff_ts:
+            continue
+        if allowed_set is not None and suffix_id not in allowed_set:
+            continue
+        keep.append(i)
+    return keep
+
+
+def _mask_indices(
+    batch: FileBatch,
+    min_size: int | None,
+    cutoff_ts: float | None,
+    allowed: list[int] | None,
+) -> "np.ndarray":
+    """Return indices of matching records using NumPy boolean masks.
+
+    The columns are viewed in place with `frombuffer`, so no data is
+    copied; the views are released before returning so the batch can
+    still grow afterwards.
+    """
+    mask = np.ones(len(batch), dtype=bool)
+    if min_size is not None:
+        mask &= np.frombuffer(batch.sizes, dtype=np.int64) >= min_size
+    if cutoff_ts is not None:
+        mask &= np.frombuffer(batch.access_ts, dtype=np.float64) <= cutoff_ts
+    if allowed is not None:
+        suffix_ids = np.frombuffer(batch.suffix_ids, dtype=np.uint32)
+        mask &= np.isin(suffix_ids, np.array(allowed, dtype=np.uint32))
+    return np.flatnonzero(mask)
+
+
+def _gather(batch: FileBatch, out: FileBatch, indices: "np.ndarray") -> None:
+    """Copy the records at indices (ascending) from batch into out with NumPy.
+
+    Names are selected with a byte mask expanded from the record mask,
+    and their end offsets rebuilt with a cumulative sum.
+    """
+    for src, dst, dtype in (
+        (batch.dir_ids, out.dir_ids, np.uint32),
+        (batch.suffix_ids, out.suffix_ids, np.uint32),
+        (batch.sizes, out.sizes, np.int64),
+        (batch.access_ts, out.access_ts, np.float64),
+    ):
+        dst.frombytes(np.frombuffer(src, dtype=dtype)[indices].view(np.uint8))
+    ends = np.frombuffer(batch._name_ends, dtype=np.uint64)
+    lengths = np.diff(ends, prepend=np.uint64(0)).astype(np.int64)
+    keep = np.zeros(len(batch), dtype=bool)
+    keep[indices] = True
+    names = np.frombuffer(batch._names, dtype=np.uint8)
+    out._names = bytearray(names[np.repeat(keep, lengths)])
+    out._name_ends.frombytes(np.cumsum(lengths[indices], dtype=np.uint64).view(np.uint8))
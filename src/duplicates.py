@@ -0,0 +1,121 @@
+import hashlib
+import mmap
+import multiprocessing
+import os
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Hashable, Iterable
+
+from .analyzer import FileInfo
+from .scanner import open_unaccessed
+
+# Bytes read from each end of a file for the cheap partial hash.
+PARTIAL_BYTES = 4096
+# Bytes hashed per step when full-hashing a memory-mapped file.
+_HASH_CHUNK = 8 * 1024 * 1024
+
+
+def find_duplicates(infos: Iterable[FileInfo], processes: int | None = None) -> list[list[FileInfo]]:
+    """Return groups of files with identical content.
+
+    Works in stages so only likely duplicates are read in full:
+    files are grouped by size, same-size files by a hash of their first
+    and last `PARTIAL_BYTES`, and only the surviving collisions are
+    full-hashed (in a process pool unless processes is 1). Hard links
+    to one inode count as a single file, and empty files are ignored.
+    Files are read without updating their access times. Groups are sorted by path and ordered largest first.
+    The pool's workers are started with forkserver (or spawn), since a
+    `--profile` sampler thread may be running and forking a
+    multi-threaded process is unsafe; if the pool breaks, the files are
+    hashed in this process instead.
+    """
+    by_size = [
+        distinct
+        for group in _regroup(((info.size, info) for info in infos if info.size > 0))
+        if len(distinct := _distinct_inodes(group)) > 1
+    ]
+    by_partial = _regroup(
+        ((info.size, key), info)
+        for group in by_size
+        for info, key in zip(group, map(_partial_hash, group))
+        if key is not None
+    )
+    groups = [g for g in by_partial if g[0].size <= 2 * PARTIAL_BYTES]
+    needs_full = [info for g in by_partial if g[0].size > 2 * PARTIAL_BYTES for info in g]
+    if needs_full:
+        paths = [str(info.path) for info in needs_full]
+        if processes == 1:
+            digests = list(map(_full_hash, paths))
+        else:
+            methods = multiprocessing.get_all_start_methods()
+            context = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+            try:
+                with ProcessPoolExecutor(max_workers=processes, mp_context=context) as pool:
+                    digests = list(pool.map(_full_hash, paths, chunksize=16))
+            except BrokenProcessPool:
+                digests = list(map(_full_hash, paths))
+        groups += _regroup(
+            ((info.size, digest), info) for info, digest in zip(needs_full, digests) if digest is not None
+        )
+    for group in groups:
+        group.sort(key=lambda info: str(info.path))
+    groups.sort(key=lambda g: (-g[0].size, str(g[0].path)))
+    return groups
+
+
+def _regroup(items: Iterable[tuple[Hashable, FileInfo]]) -> list[list[FileInfo]]:
+    """Group infos by key and keep only groups with more than one member."""
+    groups: dict[Hashable, list[FileInfo]] = defaultdict(list)
+    for key, info in items:
+        groups[key].append(info)
+    return [group for group in groups.values() if len(group) > 1]
+
+
+def _distinct_inodes(group: list[FileInfo]) -> list[FileInfo]:
+    """Keep one path per (device, inode), dropping files that are gone."""
+    seen: dict[tuple[int, int], FileInfo] = {}
+    for info in group:
+        try:
+            st = os.stat(info.path)
+        except OSError:
+            continue
+        seen.setdefault((st.st_dev, st.st_ino), info)
+    return list(seen.values())
+
+
+def _partial_hash(info: FileInfo) -> bytes | None:
+    """Hash the first and last PARTIAL_BYTES of a file.
+
+    Returns None when the file cannot be read.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    try:
+        with open_unaccessed(info.path) as fh:
+            digest.update(fh.read(PARTIAL_BYTES))
+            if info.size > PARTIAL_BYTES:
+                fh.seek(max(PARTIAL_BYTES, info.size - PARTIAL_BYTES))
+                digest.update(fh.read(PARTIAL_BYTES))
+    except OSError:
+        return None
+    return digest.digest()
+
+
+def _full_hash(path: str) -> bytes | None:
+    """Hash a whole file through a read-only memory map.
+
+    Runs in worker processes, so it takes and returns plain values.
+    """
+    digest = hashlib.blake2b(digest_size=32)
+    try:
+        with open_unaccessed(path) as fh, mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            view = memoryview(mm)
+            try:
+                for start in range(0, len(mm), _HASH_CHUNK):
+                    digest.update(view[start : start + _HASH_CHUNK])
+            finally:
+                view.release()
+    except (OSError, ValueError):
+        # ValueError: the file was truncated to zero bytes after the scan.
+        return None
+    return digest.digest()
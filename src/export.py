@@ -0,0 +1,43 @@
+import csv
+import io
+import json
+from typing import Iterable, TextIO
+
+from .analyzer import FileInfo
+
+OUTPUT_FORMATS = ("jsonl", "csv")
+FIELDS = ("path", "size", "access_ts")
+
+# Records are formatted into a string buffer and written in chunks of
+# this many lines, so a long stream costs one write call per chunk.
+_CHUNK = 1024
+
+
+def write_records(files: Iterable[FileInfo], fmt: str, out: TextIO) -> int:
+    """Stream FileInfo records to out as JSON Lines or CSV.
+
+    Each record has the fields `path`, `size` and `access_ts` (epoch
+    seconds). Records are written as they arrive, so a scan can be piped
+    into another process without collecting results first. Returns the
+    number of records written.
+    """
+    if fmt not in OUTPUT_FORMATS:
+        raise ValueError(f"Unknown output format: {fmt!r} (expected one of: {', '.join(OUTPUT_FORMATS)})")
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n") if fmt == "csv" else None
+    if writer is not None:
+        writer.writerow(FIELDS)
+    count = 0
+    for info in files:
+        if writer is not None:
+            writer.writerow((info.path, info.size, info.access_ts))
+        else:
+            buffer.write(f'{{"path": {json.dumps(str(info.path))}, "size": {info.size}, "access_ts": {info.access_ts!r}}}\n')
+        count += 1
+        if count % _CHUNK == 0:
+            out.write(buffer.getvalue())
+            buffer.seek(0)
+            buffer.truncate()
+    out.write(buffer.getvalue())
+    out.flush()
+    return count
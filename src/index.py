@@ -0,0 +1,191 @@
+import os
+import sqlite3
+from contextlib import closing
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from .analyzer import FileInfo
+from .matcher import PathMatcher
+from .walker import list_directory, scan_file_infos
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS dirs (
+    path TEXT PRIMARY KEY,
+    parent TEXT,
+    mtime_ns INTEGER
+);
+CREATE INDEX IF NOT EXISTS dirs_parent ON dirs (parent);
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    dir TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    access_ts REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS files_dir ON files (dir);
+CREATE TABLE IF NOT EXISTS content_types (
+    inode INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    type TEXT NOT NULL,
+    PRIMARY KEY (inode, mtime_ns, size)
+);
+"""
+
+# Commit after this many directory updates so an interrupted scan keeps
+# most of its work without paying for a commit per directory.
+_COMMIT_EVERY = 500
+
+
+def open_index(index_path: Path, rebuild: bool = False) -> sqlite3.Connection:
+    """Open (creating if needed) the metadata index at index_path.
+
+    With rebuild=True all cached rows are dropped first, forcing a full
+    walk on the next scan.
+    """
+    index_path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(index_path))
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    if rebuild:
+        conn.executescript("DROP TABLE IF EXISTS dirs; DROP TABLE IF EXISTS files; DROP TABLE IF EXISTS content_types;")
+    conn.executescript(_SCHEMA)
+    return conn
+
+
+def scan_indexed(
+    root: Path,
+    index_path: Path,
+    recursive: bool = True,
+    rebuild: bool = False,
+    matcher: PathMatcher | None = None,
+) -> Iterator[FileInfo]:
+    """Yield FileInfo records for root, reusing the on-disk index.
+
+    A directory whose mtime matches the indexed value is not listed
+    again: its files (with their cached size and access time) and its
+    subdirectories come from the index, costing one stat per directory
+    instead of one per file. Changed directories are listed with the
+    regular scan engine and their rows replaced.
+
+    Directory mtimes only change when entries are added, removed or
+    renamed, so in-place edits of unchanged directories keep their
+    cached size/atime until the index is rebuilt.
+
+    The index always holds complete listings so it stays valid across
+    runs with different rules; the matcher prunes excluded directories
+    from the walk and filters the yielded files. Paths are yielded
+    under `root` as given, like a plain scan, although the index stores
+    them resolved.
+    """
+    if not root.exists():
+        return
+    if root.is_file():
+        yield from scan_file_infos(root)
+        return
+    base = str(root.resolve())
+    prefix = len(base.rstrip(os.sep) + os.sep)
+    with closing(open_index(index_path, rebuild)) as conn:
+        try:
+            if str(root) == base:
+                yield from _walk(conn, base, recursive, matcher)
+                return
+            for info in _walk(conn, base, recursive, matcher):
+                info.path = root / str(info.path)[prefix:]
+                yield info
+        finally:
+            conn.commit()
+
+
+def _walk(
+    conn: sqlite3.Connection,
+    root: str,
+    recursive: bool,
+    matcher: PathMatcher | None,
+) -> Iterator[FileInfo]:
+    """Depth-first walk that consults the index before listing a directory."""
+    stack: list[tuple[str, str | None]] = [(root, None)]
+    updates = 0
+    while stack:
+        dirpath, parent = stack.pop()
+        try:
+            mtime_ns = os.stat(dirpath).st_mtime_ns
+        except OSError:
+            _forget_tree(conn, dirpath)
+            continue
+        row = conn.execute("SELECT mtime_ns FROM dirs WHERE path = ?", (dirpath,)).fetchone()
+        if row is not None and row[0] == mtime_ns:
+            infos, subdirs = _cached_listing(conn, dirpath)
+        else:
+            listing = list_directory(dirpath)
+            if listing is None:
+                continue
+            infos, subdirs = listing
+            _store_listing(conn, dirpath, parent, mtime_ns, infos, subdirs)
+            updates += 1
+            if updates % _COMMIT_EVERY == 0:
+                conn.commit()
+        if matcher is not None:
+            infos = [i for i in infos if matcher.allows_file(i.path.name, str(i.path))]
+            subdirs = [d for d in subdirs if not matcher.skips_dir(os.path.basename(d), d)]
+        yield from infos
+        if recursive:
+            stack.extend((sub, dirpath) for sub in subdirs)
+
+
+def _cached_listing(conn: sqlite3.Connection, dirpath: str) -> tuple[list[FileInfo], list[str]]:
+    """Return the indexed files and subdirectories of an unchanged directory."""
+    rows = conn.execute("SELECT path, size, access_ts FROM files WHERE dir = ?", (dirpath,))
+    infos = [FileInfo(path=Path(p), size=size, access_ts=ts) for p, size, ts in rows]
+    subdirs = [p for (p,) in conn.execute("SELECT path FROM dirs WHERE parent = ?", (dirpath,))]
+    return infos, subdirs
+
+
+def _store_listing(
+    conn: sqlite3.Connection,
+    dirpath: str,
+    parent: str | None,
+    mtime_ns: int,
+    infos: list[FileInfo],
+    subdirs: list[str],
+) -> None:
+    """Replace the indexed contents of a freshly listed directory."""
+    known = {p for (p,) in conn.execute("SELECT path FROM dirs WHERE parent = ?", (dirpath,))}
+    for gone in known.difference(subdirs):
+        _forget_tree(conn, gone)
+    conn.execute("DELETE FROM files WHERE dir = ?", (dirpath,))
+    conn.executemany(
+        "INSERT OR REPLACE INTO files (path, dir, size, access_ts) VALUES (?, ?, ?, ?)",
+        ((str(info.path), dirpath, info.size, info.access_ts) for info in infos),
+    )
+    # New subdirectories get a NULL mtime so their first visit lists them.
+    conn.executemany(
+        "INSERT OR IGNORE INTO dirs (path, parent, mtime_ns) VALUES (?, ?, NULL)",
+        ((sub, dirpath) for sub in subdirs),
+    )
+    conn.execute(
+        "INSERT OR REPLACE INTO dirs (path, parent, mtime_ns) VALUES (?, ?, ?)",
+        (dirpath, parent, mtime_ns),
+    )
+
+
+def _forget_tree(conn: sqlite3.Connection, dirpath: str) -> None:
+    """Drop a directory and everything indexed below it."""
+    prefix = dirpath.rstrip(os.sep) + os.sep
+    size = len(prefix)
+    conn.execute("DELETE FROM files WHERE dir = ? OR substr(dir, 1, ?) = ?", (dirpath, size, prefix))
+    conn.execute("DELETE FROM dirs WHERE path = ? OR substr(path, 1, ?) = ?", (dirpath, size, prefix))
+
+
+def refresh(files: Iterable[FileInfo]) -> Iterator[FileInfo]:
+    """Re-stat files, updating size and access time; drop vanished files.
+
+    Reading a file does not change its directory's mtime, so cached
+    access times go stale. Matches from an indexed scan are refreshed
+    this way and filtered again before anything acts on them.
+    """
+    for info in files:
+        try:
+            st = os.stat(info.path, follow_symlinks=False)
+        except OSError:
+            continue
+        yield FileInfo(path=info.path, size=st.st_size, access_ts=st.st_atime)
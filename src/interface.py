@@ -1,15 +1,35 @@
 from pathlib import Path
-from dataclasses import dataclass
-from typing import Iterable, List
+from dataclasses import dataclass, field
+from itertools import chain
+from typing import Callable, Iterable, Iterator
 from datetime import datetime
 
+from . import metrics, profiling
 from .analyzer import FileInfo
-from .operations import archive_files, delete_file, move_file
+from .archive import ArchiveSettings
+from .multiroot import root_for
+from .operations import Operation, OperationQueue, delete_file, execute_operation, unique_destination
+from .plan import PlanWriter
+from .report import DirTotals
+
+
+@dataclass
+class RootStats:
+    """Per-root slice of the end-of-run summary."""
+
+    total: int = 0
+    total_bytes: int = 0
+    deleted: int = 0
+    bytes_freed: int = 0
 
 
 @dataclass
 class Stats:
-    """Simple accumulator for end-of-run summary."""
+    """Simple accumulator for end-of-run summary.
+
+    When several roots are scanned, `roots` lists them and `by_root`
+    holds a breakdown keyed by root path.
+    """
 
     total: int = 0
     kept: int = 0
@@ -18,7 +38,17 @@ class Stats:
     deleted: int = 0
     skipped: int = 0
     failed: int = 0
+    planned: int = 0
     bytes_freed: int = 0
+    roots: list[Path] = field(default_factory=list)
+    by_root: dict[str, RootStats] = field(default_factory=dict)
+
+    def root_stats(self, path: Path) -> RootStats | None:
+        """Return the breakdown entry for the root containing path."""
+        root = root_for(path, self.roots) if len(self.roots) > 1 else None
+        if root is None:
+            return None
+        return self.by_root.setdefault(str(root), RootStats())
 
 
 def render_scan_header(root: str, min_size: int | None, min_age_days: int | None, dry_run: bool) -> None:
@@ -33,9 +63,9 @@ def render_file_list(files: Iterable[FileInfo]) -> None:
     This is kept for simple previews and may be bypassed
     by the interactive review loop.
     """
-    print("Path\tSize (bytes)\tLast modified")
+    print("Path\tSize (bytes)\tLast accessed")
     for info in files:
-        ts = datetime.fromtimestamp(info.mtime)
+        ts = datetime.fromtimestamp(info.access_ts)
         print(f"{info.path}\t{info.size}\t{ts.date()}")
 
 
@@ -52,19 +82,66 @@ def render_scan_summary(stats: Stats, dry_run: bool) -> None:
         print(f"├─ Skipped: {stats.skipped}")
     if stats.failed:
         print(f"├─ Failed: {stats.failed}")
+    if stats.planned:
+        print(f"├─ Planned: {stats.planned}")
     label = "would have been freed" if dry_run else "freed"
+    if len(stats.roots) > 1:
+        print("├─ Per root:")
+        for i, root in enumerate(stats.roots, start=1):
+            part = stats.by_root.get(str(root), RootStats())
+            branch = "└─" if i == len(stats.roots) else "├─"
+            print(
+                f"│  {branch} {root}: {part.total} considered ({part.total_bytes} bytes), "
+                f"{part.deleted} deleted ({part.bytes_freed} bytes {label})"
+            )
     print(f"└─ Bytes {label}: {stats.bytes_freed}")
 
 
-def display_file(file: FileInfo, index: int, total: int) -> None:
-    """Show per-file details for interactive review."""
+def render_dir_report(rows: list[tuple[Path, DirTotals]], limit: int = 20) -> None:
+    """Print the largest directory subtrees with their access-time range."""
+    shown = rows[:limit]
+    print(f"Directory report ({len(shown)} of {len(rows)} directories, largest first):")
+    for i, (path, totals) in enumerate(shown, start=1):
+        branch = "└─" if i == len(shown) else "├─"
+        oldest = datetime.fromtimestamp(totals.oldest_access_ts).date()
+        newest = datetime.fromtimestamp(totals.newest_access_ts).date()
+        print(f"{branch} {path}: {totals.bytes} bytes in {totals.files} files (accessed {oldest} .. {newest})")
+    print()
+
+
+def render_metrics(snapshot: dict[str, dict[str, float]]) -> None:
+    """Print per-stage timings and counters collected with --stats."""
+    print("Stage timings:")
+    for i, (stage, m) in enumerate(snapshot.items(), start=1):
+        branch = "└─" if i == len(snapshot) else "├─"
+        errors = f", {m['errors']} errors" if m["errors"] else ""
+        print(
+            f"{branch} {stage}: {m['seconds']:.3f}s, {m['calls']} calls, "
+            f"{m['items']} items, {m['bytes']} bytes{errors}"
+        )
+
+
+def display_file(file: FileInfo, index: int, total: int | None) -> None:
+    """Show per-file details for interactive review.
+
+    `total` is None while files are still streaming in from the scan.
+    """
     ts = datetime.fromtimestamp(file.access_ts)
-    print(f"[{index}/{total}] {file.path.name}")
+    print(f"[{index}/{'?' if total is None else total}] {file.path.name}")
     print(f"├─ Size: {file.size} bytes")
     print(f"├─ Last accessed: {ts.date()}")
     print(f"└─ Type: {file.path.suffix.lstrip('.') or 'unknown'}")
     print()
-    print("Actions: [K]eep | [M]ove | [A]rchive | [D]elete | [S]kip all")
+    print("Actions: [K]eep | [M]ove | [A]rchive | [D]elete | [B]ulk (apply to all remaining) | [S]kip all")
+
+
+def _ask(prompt: str) -> str:
+    """Read one answer from the user.
+
+    Waiting time is metered as 'prompt' and left out of --profile output.
+    """
+    with metrics.timed("prompt"), profiling.paused():
+        return input(prompt)
 
 
 def _normalize_action(raw: str) -> str | None:
@@ -72,22 +149,23 @@ def _normalize_action(raw: str) -> str | None:
     if not raw:
         return None
     letter = raw.strip().lower()[:1]
-    if letter in {"k", "m", "a", "d", "s"}:
+    if letter in {"k", "m", "a", "d", "b", "s"}:
         return letter
     return None
 
 
-def prompt_action() -> str:
+def prompt_action(choices: str = "kmadbs") -> str:
     """Prompt user for an action and return a normalized code.
 
-    Returns one of: 'k', 'm', 'a', 'd', 's'.
+    Returns one of the letters in `choices` (by default 'k', 'm', 'a',
+    'd', 'b', 's'); anything else is asked again.
     """
     while True:
-        answer = input("Select action: ").strip()
+        answer = _ask("Select action: ").strip()
         action = _normalize_action(answer)
-        if action is not None:
+        if action is not None and action in choices:
             return action
-        print("Please choose one of: K, M, A, D, S.")
+        print(f"Please choose one of: {', '.join(choices.upper())}.")
 
 
 def confirm_action(prompt: str) -> bool:
@@ -95,7 +173,7 @@ def confirm_action(prompt: str) -> bool:
 
     Returns True only for explicit 'yes' or 'y'.
     """
-    answer = input(f"{prompt} [yes/y to confirm]: ").strip()
+    answer = _ask(f"{prompt} [yes/y to confirm]: ").strip()
     return answer in {"yes", "y"}
 
 
@@ -104,57 +182,260 @@ def _prompt_destination(default: Path | None = None) -> Path:
     base_prompt = "Enter destination path"
     if default is not None:
         base_prompt += f" [{default}]"
-    response = input(f"{base_prompt}: ").strip()
+    response = _ask(f"{base_prompt}: ").strip()
     if not response and default is not None:
         return default
     return Path(response)
 
 
-def run_interactive_review(files: List[FileInfo], dry_run: bool) -> Stats:
+def run_interactive_review(
+    files: Iterable[FileInfo],
+    dry_run: bool,
+    queue: OperationQueue | None = None,
+    archive: ArchiveSettings | None = None,
+    roots: list[Path] | None = None,
+    plan: PlanWriter | None = None,
+) -> Stats:
     """Run per-file interactive review loop.
 
     All actions respect dry-run mode; delete additionally requires
-    explicit confirmation from the user.
+    explicit confirmation from the user. `files` may be a lazy stream;
+    review starts with the first match and `Stats.total` counts files
+    as they arrive. With a queue, approved actions are collected and
+    executed together once the review ends. With a plan, approved
+    actions are recorded for `cleansys apply` instead of executed.
+    Passing several `roots` adds a per-root breakdown to the stats.
     """
-    stats = Stats(total=len(files))
-    if stats.total == 0:
-        print("No files to review.")
-        return stats
-
-    for idx, info in enumerate(files, start=1):
-        display_file(info, idx, stats.total)
+    stats = Stats(roots=list(roots or []))
+    submit = _submitter(stats, dry_run, queue, archive, plan)
+    known_total = len(files) if hasattr(files, "__len__") else None
+    stream: Iterator[FileInfo] = iter(files)
+    for idx, info in enumerate(stream, start=1):
+        _count_file(stats, info)
+        display_file(info, idx, known_total)
         action = prompt_action()
         if action == "k":
             stats.kept += 1
             continue
         if action == "s":
             print("Skipping remaining files.")
-            remaining = stats.total - idx + 1
-            stats.skipped += remaining
+            stats.skipped += 1
+            for rest in stream:
+                _count_file(stats, rest)
+                stats.skipped += 1
             break
-        if action == "m":
-            dst = _prompt_destination()
-            if move_file(info.path, dst, dry_run=dry_run):
-                stats.moved += 1
-            else:
-                stats.failed += 1
+        if action == "b":
+            _apply_to_remaining(info, stream, stats, submit)
+            break
+        op = _operation_for(action, info)
+        if op is None:
+            print("Delete cancelled.")
+            stats.skipped += 1
             continue
-        if action == "a":
-            archive_path = _prompt_destination()
-            if archive_files([info.path], archive_path, dry_run=dry_run):
-                stats.archived += 1
-            else:
-                stats.failed += 1
+        submit(op)
+    if queue is not None and len(queue):
+        print(f"Executing {len(queue)} queued operation(s)...")
+        for op, ok in queue.run():
+            _record_result(stats, op, ok, dry_run)
+    if stats.total == 0:
+        print("No files to review.")
+    return stats
+
+
+def run_policy(
+    files: Iterable[FileInfo],
+    decide: Callable[[FileInfo], Operation | None],
+    dry_run: bool,
+    queue: OperationQueue | None = None,
+    archive: ArchiveSettings | None = None,
+    roots: list[Path] | None = None,
+    plan: PlanWriter | None = None,
+) -> Stats:
+    """Apply decisions to every file without prompting.
+
+    `decide` returns the operation for a file, or None to keep it. Used
+    for unattended runs driven by a policy file; dry-run is respected,
+    and with a plan the decisions are only recorded.
+    """
+    stats = Stats(roots=list(roots or []))
+    submit = _submitter(stats, dry_run, queue, archive, plan)
+    for info in files:
+        _count_file(stats, info)
+        op = decide(info)
+        if op is None:
+            stats.kept += 1
+        else:
+            submit(op)
+    if queue is not None and len(queue):
+        for op, ok in queue.run():
+            _record_result(stats, op, ok, dry_run)
+    return stats
+
+
+def _operation_for(action: str, info: FileInfo) -> Operation | None:
+    """Build the operation for a single-file action, or None if cancelled."""
+    if action == "m":
+        return Operation("move", info.path, info.size, _prompt_destination(), access_ts=info.access_ts)
+    if action == "a":
+        return Operation("archive", info.path, info.size, _prompt_destination(), access_ts=info.access_ts)
+    if confirm_action(f"About to delete {info.path}"):
+        return Operation("delete", info.path, info.size, access_ts=info.access_ts)
+    return None
+
+
+def _apply_to_remaining(
+    first: FileInfo,
+    stream: Iterator[FileInfo],
+    stats: Stats,
+    submit: Callable[[Operation], None],
+) -> None:
+    """Apply one action to the current file and every remaining match.
+
+    Moves go into a destination directory; archives all go into one
+    archive. Deleting everything requires a single explicit confirmation.
+    """
+    print("Apply to this and all remaining files: [K]eep | [M]ove | [A]rchive | [D]elete | [S]kip all")
+    action = prompt_action("kmads")
+    target = _prompt_destination() if action in {"m", "a"} else None
+    if action == "d" and not confirm_action("About to delete this and ALL remaining matching files"):
+        print("Delete cancelled.")
+        action = "s"
+    used_names: set[str] = set()
+    for info in chain([first], stream):
+        if info is not first:
+            _count_file(stats, info)
+        if action == "k":
+            stats.kept += 1
+        elif action == "m":
+            dst = unique_destination(target, info.path.name, used_names)
+            submit(Operation("move", info.path, info.size, dst, access_ts=info.access_ts))
+        elif action == "a":
+            submit(Operation("archive", info.path, info.size, target, access_ts=info.access_ts))
+        elif action == "d":
+            submit(Operation("delete", info.path, info.size, access_ts=info.access_ts))
+        else:
+            stats.skipped += 1
+
+
+def _submitter(
+    stats: Stats,
+    dry_run: bool,
+    queue: OperationQueue | None,
+    archive: ArchiveSettings | None,
+    plan: PlanWriter | None = None,
+) -> Callable[[Operation], None]:
+    """Return a function that plans, queues, or immediately runs an operation."""
+    if plan is not None:
+
+        def record(op: Operation) -> None:
+            plan.add(op)
+            stats.planned += 1
+
+        return record
+    if queue is not None:
+        return queue.add
+
+    def submit(op: Operation) -> None:
+        _record_result(stats, op, execute_operation(op, dry_run, archive), dry_run)
+
+    return submit
+
+
+def summarize_results(results: Iterable[tuple[Operation, bool | None]], dry_run: bool) -> Stats:
+    """Tally (operation, outcome) pairs from `apply_plan` into Stats.
+
+    An outcome of None means the file changed since planning and was skipped.
+    """
+    stats = Stats()
+    for op, ok in results:
+        stats.total += 1
+        if ok is None:
+            stats.skipped += 1
+        else:
+            _record_result(stats, op, ok, dry_run)
+    return stats
+
+
+def _count_file(stats: Stats, info: FileInfo) -> None:
+    """Count one reviewed file in the totals and its root breakdown."""
+    stats.total += 1
+    part = stats.root_stats(info.path)
+    if part is not None:
+        part.total += 1
+        part.total_bytes += info.size
+
+
+def _record_result(stats: Stats, op: Operation, ok: bool, dry_run: bool) -> None:
+    """Add the outcome of one operation to the run statistics."""
+    if not ok:
+        stats.failed += 1
+    elif op.action == "move":
+        stats.moved += 1
+    elif op.action == "archive":
+        stats.archived += 1
+    elif op.action == "delete":
+        stats.deleted += 1
+        freed = 0 if dry_run else op.size
+        stats.bytes_freed += freed
+        part = stats.root_stats(op.path)
+        if part is not None:
+            part.deleted += 1
+            part.bytes_freed += freed
+
+
+def display_duplicate_group(group: list[FileInfo], index: int, total: int) -> None:
+    """Show one group of identical files for duplicate review."""
+    print(f"[{index}/{total}] {len(group)} identical files, {group[0].size} bytes each")
+    for number, info in enumerate(group, start=1):
+        ts = datetime.fromtimestamp(info.access_ts)
+        print(f"├─ {number}) {info.path} (last accessed {ts.date()})")
+    print()
+    print(f"Actions: [1-{len(group)}] keep that copy, delete the rest | [K]eep all | [S]kip all")
+
+
+def prompt_keep_choice(count: int) -> int | str:
+    """Prompt for which copy to keep.
+
+    Returns a 0-based index of the copy to keep, or 'k' / 's'.
+    """
+    while True:
+        answer = _ask("Select action: ").strip()
+        if answer.isdigit() and 1 <= int(answer) <= count:
+            return int(answer) - 1
+        action = _normalize_action(answer)
+        if action in {"k", "s"}:
+            return action
+        print(f"Please choose a number from 1 to {count}, K, or S.")
+
+
+def run_duplicate_review(groups: list[list[FileInfo]], dry_run: bool) -> Stats:
+    """Review duplicate groups, keeping one copy and deleting the rest.
+
+    Deleting always requires explicit confirmation and respects dry-run.
+    """
+    stats = Stats(total=sum(len(g) for g in groups))
+    for idx, group in enumerate(groups, start=1):
+        display_duplicate_group(group, idx, len(groups))
+        choice = prompt_keep_choice(len(group))
+        if choice == "s":
+            print("Skipping remaining groups.")
+            stats.skipped += sum(len(g) for g in groups[idx - 1 :])
+            break
+        if choice == "k":
+            stats.kept += len(group)
+            continue
+        keep = group[choice]
+        extras = [info for info in group if info is not keep]
+        stats.kept += 1
+        if not confirm_action(f"About to delete {len(extras)} duplicate(s) of {keep.path}"):
+            print("Delete cancelled.")
+            stats.skipped += len(extras)
             continue
-        if action == "d":
-            if confirm_action(f"About to delete {info.path}"):
-                if delete_file(info.path, dry_run=dry_run):
-                    stats.deleted += 1
-                    if not dry_run:
-                        stats.bytes_freed += info.size
-                else:
-                    stats.failed += 1
+        for info in extras:
+            if delete_file(info.path, dry_run=dry_run):
+                stats.deleted += 1
+                if not dry_run:
+                    stats.bytes_freed += info.size
             else:
-                print("Delete cancelled.")
-                stats.skipped += 1
+                stats.failed += 1
     return stats
@@ -0,0 +1,76 @@
+import fnmatch
+import re
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class PathMatcher:
+    """Include/exclude rules evaluated by the walker before any stat call.
+
+    Patterns without a path separator match entry names; patterns with
+    one match the full path. All exclude patterns are folded into one
+    regex, likewise all include patterns, so each entry costs at most a
+    couple of regex matches.
+    """
+
+    exclude_name: re.Pattern | None = None
+    exclude_path: re.Pattern | None = None
+    include_name: re.Pattern | None = None
+    include_path: re.Pattern | None = None
+    suffixes: frozenset | None = None
+
+    def skips_dir(self, name: str, path: str) -> bool:
+        """Return True if a directory (and its whole subtree) is excluded."""
+        return _hit(self.exclude_name, name) or _hit(self.exclude_path, path)
+
+    def allows_file(self, name: str, path: str) -> bool:
+        """Return True if a file passes the exclude, include and suffix rules."""
+        if _hit(self.exclude_name, name) or _hit(self.exclude_path, path):
+            return False
+        if self.include_name or self.include_path:
+            if not (_hit(self.include_name, name) or _hit(self.include_path, path)):
+                return False
+        if self.suffixes is not None:
+            i = name.rfind(".")
+            suffix = name[i:].lower() if 0 < i < len(name) - 1 else ""
+            return suffix in self.suffixes
+        return True
+
+
+def compile_matcher(
+    include: list[str] | None = None,
+    exclude: list[str] | None = None,
+    file_types: list[str] | None = None,
+) -> PathMatcher | None:
+    """Compile glob rules into a PathMatcher, or None if there are none.
+
+    `file_types` uses the same normalization as `filter_files`, so the
+    walker only prunes files that the filter would reject anyway.
+    """
+    if not (include or exclude or file_types):
+        return None
+    exclude_name, exclude_path = _compile_globs(exclude or [])
+    include_name, include_path = _compile_globs(include or [])
+    suffixes = None
+    if file_types:
+        suffixes = frozenset(t.lower() if t.startswith(".") else f".{t.lower()}" for t in file_types)
+    return PathMatcher(exclude_name, exclude_path, include_name, include_path, suffixes)
+
+
+def _compile_globs(patterns: list[str]) -> tuple[re.Pattern | None, re.Pattern | None]:
+    """Split globs into name and path patterns and join each into one regex."""
+    names = [p for p in patterns if "/" not in p and "\\" not in p]
+    paths = [p for p in patterns if p not in names]
+    return _join(names), _join(paths)
+
+
+def _join(patterns: list[str]) -> re.Pattern | None:
+    """Combine globs into a single alternation regex."""
+    if not patterns:
+        return None
+    return re.compile("|".join(f"(?:{fnmatch.translate(p)})" for p in patterns))
+
+
+def _hit(pattern: re.Pattern | None, text: str) -> bool:
+    """Return True if pattern is set and matches text."""
+    return pattern is not None and pattern.match(text) is not None
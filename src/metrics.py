@@ -0,0 +1,183 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable, ContextManager, Iterable, Iterator, TypeVar
+
+T = TypeVar("T")
+METRICS_FORMATS = (".prom", ".json")
+
+
+@dataclass
+class StageStats:
+    """Counters for one pipeline stage.
+
+    `seconds` is wall time summed over calls, so stages that run on
+    several threads can exceed the elapsed time of the run.
+    """
+
+    seconds: float = 0.0
+    calls: int = 0
+    items: int = 0
+    bytes: int = 0
+    errors: int = 0
+
+
+class Metrics:
+    """Thread-safe per-stage timing and counters for one run."""
+
+    def __init__(self) -> None:
+        self.stages: dict[str, StageStats] = {}
+        self._lock = threading.Lock()
+
+    def add(
+        self,
+        stage: str,
+        seconds: float = 0.0,
+        calls: int = 1,
+        items: int = 0,
+        nbytes: int = 0,
+        errors: int = 0,
+    ) -> None:
+        """Add one observation to a stage's counters."""
+        with self._lock:
+            stats = self.stages.get(stage)
+            if stats is None:
+                stats = self.stages[stage] = StageStats()
+            stats.seconds += seconds
+            stats.calls += calls
+            stats.items += items
+            stats.bytes += nbytes
+            stats.errors += errors
+
+    @contextmanager
+    def timer(self, stage: str, items: int = 0, nbytes: int = 0) -> Iterator[None]:
+        """Time a block as one call of stage; an exception counts as an error."""
+        start = time.perf_counter()
+        failed = 0
+        try:
+            yield
+        except BaseException:
+            failed = 1
+            raise
+        finally:
+            self.add(stage, time.perf_counter() - start, items=items, nbytes=nbytes, errors=failed)
+
+    def meter(
+        self,
+        stage: str,
+        transform: Callable[[Iterator[T]], Iterator[T]],
+        source: Iterable[T],
+    ) -> Iterator[T]:
+        """Run a streaming transform, timing only the work it does itself.
+
+        Time spent pulling items from `source` (earlier stages) is
+        subtracted; `items` counts the input and `calls` the output.
+        """
+        upstream = 0.0
+        consumed = 0
+
+        def pull() -> Iterator[T]:
+            nonlocal upstream, consumed
+            it = iter(source)
+            while True:
+                start = time.perf_counter()
+                try:
+                    item = next(it)
+                except StopIteration:
+                    upstream += time.perf_counter() - start
+                    return
+                upstream += time.perf_counter() - start
+                consumed += 1
+                yield item
+
+        out = transform(pull())
+        total = 0.0
+        produced = 0
+        try:
+            while True:
+                start = time.perf_counter()
+                try:
+                    item = next(out)
+                except StopIteration:
+                    total += time.perf_counter() - start
+                    return
+                total += time.perf_counter() - start
+                produced += 1
+                yield item
+        finally:
+            self.add(stage, total - upstream, calls=produced, items=consumed)
+
+    def snapshot(self) -> dict[str, dict[str, float]]:
+        """Return a copy of all counters keyed by stage name."""
+        with self._lock:
+            return {name: asdict(stats) for name, stats in sorted(self.stages.items())}
+
+
+# The active collector, or None. Instrumented code checks this once per
+# call (or per directory), so disabled metrics cost almost nothing.
+_current: Metrics | None = None
+
+
+def enable() -> Metrics:
+    """Start collecting metrics for this process and return the collector."""
+    global _current
+    _current = Metrics()
+    return _current
+
+
+def disable() -> None:
+    """Stop collecting metrics."""
+    global _current
+    _current = None
+
+
+def current() -> Metrics | None:
+    """Return the active collector, or None when metrics are disabled."""
+    return _current
+
+
+def timed(stage: str, items: int = 0, nbytes: int = 0) -> ContextManager[None]:
+    """Time a block under stage, or do nothing when metrics are disabled."""
+    if _current is None:
+        return nullcontext()
+    return _current.timer(stage, items, nbytes)
+
+
+def write_metrics(snapshot: dict[str, dict[str, float]], path: Path) -> None:
+    """Write a snapshot as JSON or a Prometheus textfile, by path suffix.
+
+    The file is replaced atomically so a node exporter never reads a
+    partial textfile.
+    """
+    suffix = path.suffix.lower()
+    if suffix not in METRICS_FORMATS:
+        raise ValueError(f"Unsupported metrics format: {path.suffix or path.name} (use .prom or .json)")
+    if suffix == ".json":
+        text = json.dumps(snapshot, indent=2) + "\n"
+    else:
+        text = _prometheus(snapshot)
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(text, encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def _prometheus(snapshot: dict[str, dict[str, float]]) -> str:
+    """Render a snapshot in the Prometheus text exposition format."""
+    lines = []
+    for field, help_text in (
+        ("seconds", "Wall time spent in each cleansys stage during the last run."),
+        ("calls", "Number of calls of each cleansys stage during the last run."),
+        ("items", "Files processed by each cleansys stage during the last run."),
+        ("bytes", "Bytes processed by each cleansys stage during the last run."),
+        ("errors", "Errors raised or reported by each cleansys stage during the last run."),
+    ):
+        name = f"cleansys_stage_{field}"
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} gauge")
+        for stage, stats in snapshot.items():
+            lines.append(f'{name}{{stage="{stage}"}} {stats[field]}')
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,115 @@
+import os
+import queue
+import threading
+from pathlib import Path
+from typing import Callable, Iterable, Iterator
+
+from .analyzer import FileInfo
+
+# Records are handed from device threads to the consumer in chunks of
+# this size; the queue holds at most _QUEUE_CHUNKS of them.
+_CHUNK = 512
+_QUEUE_CHUNKS = 64
+_DONE = object()
+
+
+def dedupe_roots(roots: Iterable[Path]) -> list[Path]:
+    """Resolve roots and drop duplicates and roots nested inside another.
+
+    The remaining roots keep the order they were given in.
+    """
+    resolved = list(dict.fromkeys(r.resolve() for r in roots))
+    return [root for root in resolved if not any(other in root.parents for other in resolved)]
+
+
+def group_by_device(roots: Iterable[Path]) -> dict[int, list[Path]]:
+    """Group roots by the `st_dev` of the filesystem they live on."""
+    groups: dict[int, list[Path]] = {}
+    for root in roots:
+        groups.setdefault(os.stat(root).st_dev, []).append(root)
+    return groups
+
+
+def root_for(path: Path, roots: list[Path]) -> Path | None:
+    """Return the root that contains path, if any."""
+    for root in roots:
+        if path == root or root in path.parents:
+            return root
+    return None
+
+
+def scan_roots(roots: list[Path], scan_one: Callable[[Path], Iterator[FileInfo]]) -> Iterator[FileInfo]:
+    """Scan several roots, one thread per device, and merge the results.
+
+    Roots on the same device are scanned one after another by that
+    device's thread (each scan bringing its own worker budget), so a
+    slow disk only delays its own results. Records are yielded in
+    arrival order; a bounded queue applies back-pressure to the scans.
+    An exception raised while scanning a device is re-raised here, after
+    the records found before it.
+    """
+    groups = group_by_device(roots)
+    if len(groups) == 1:
+        for root in roots:
+            yield from scan_one(root)
+        return
+    results: queue.Queue = queue.Queue(maxsize=_QUEUE_CHUNKS)
+    stop = threading.Event()
+    threads = [
+        threading.Thread(target=_scan_device, args=(group, scan_one, results, stop), daemon=True)
+        for group in groups.values()
+    ]
+    for thread in threads:
+        thread.start()
+    try:
+        running = len(threads)
+        while running:
+            chunk = results.get()
+            if chunk is _DONE:
+                running -= 1
+                continue
+            if isinstance(chunk, BaseException):
+                raise chunk
+            yield from chunk
+    finally:
+        stop.set()
+
+
+def _scan_device(
+    roots: list[Path],
+    scan_one: Callable[[Path], Iterator[FileInfo]],
+    results: queue.Queue,
+    stop: threading.Event,
+) -> None:
+    """Scan one device's roots and push chunks of records to results.
+
+    A failing scan pushes what it found so far, then the exception.
+    """
+    chunk: list[FileInfo] = []
+    try:
+        for root in roots:
+            for info in scan_one(root):
+                chunk.append(info)
+                if len(chunk) >= _CHUNK:
+                    if not _put(results, chunk, stop):
+                        return
+                    chunk = []
+        if chunk:
+            _put(results, chunk, stop)
+    except Exception as exc:  # noqa: BLE001 - re-raised by scan_roots
+        if chunk and not _put(results, chunk, stop):
+            return
+        _put(results, exc, stop)
+    finally:
+        _put(results, _DONE, stop)
+
+
+def _put(results: queue.Queue, item: object, stop: threading.Event) -> bool:
+    """Put item on the queue unless the consumer has stopped listening."""
+    while not stop.is_set():
+        try:
+            results.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            continue
+    return False
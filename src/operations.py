@@ -1,20 +1,20 @@
 from pathlib import Path
-from datetime import datetime
-import shutil
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+import time
 import zipfile
+from typing import Callable
 
+from . import metrics, transfer
+from .archive import ArchiveSettings, write_archive
+from .oplog import echo, flush_log, get_log
 
-def _log_operation(message: str) -> None:
-    """Append a single-line message to the cleansys log file."""
-    timestamp = datetime.now().isoformat(timespec="seconds")
-    line = f"{timestamp} | {message}\n"
-    log_path = Path("cleansys.log")
-    try:
-        with log_path.open("a", encoding="utf-8") as log_file:
-            log_file.write(line)
-    except OSError:
-        # Logging failures should not crash the main operation.
-        pass
+
+def _report(message: str) -> None:
+    """Print a single-line message and record it in the operation log."""
+    echo(message)
+    get_log().write(message)
 
 
 def delete_file(path: Path, dry_run: bool) -> bool:
@@ -26,95 +26,201 @@ def delete_file(path: Path, dry_run: bool) -> bool:
     label = "DELETE"
     if dry_run:
         msg = f"[DRY RUN] {label} {path}"
-        print(msg)
-        _log_operation(msg)
+        _report(msg)
         return True
     if not path.exists():
         msg = f"[ERROR] {label} not found: {path}"
-        print(msg)
-        _log_operation(msg)
+        _report(msg)
         return False
     try:
         msg = f"{label} {path}"
-        print(msg)
-        _log_operation(msg)
+        _report(msg)
         path.unlink()
         return True
     except PermissionError:
         msg = f"[ERROR] {label} permission denied: {path}"
-        print(msg)
-        _log_operation(msg)
+        _report(msg)
     except OSError as exc:
         msg = f"[ERROR] {label} failed for {path}: {exc}"
-        print(msg)
-        _log_operation(msg)
+        _report(msg)
     return False
 
 
 def move_file(src: Path, dst: Path, dry_run: bool) -> bool:
-    """Move a file from src to dst, honoring dry-run mode."""
+    """Move a file from src to dst, honoring dry-run mode.
+
+    Same-device moves are a rename; cross-device moves stream the data
+    in the kernel and print progress for multi-GB files (see
+    `transfer.move`).
+    """
     label = "MOVE"
     if dry_run:
         msg = f"[DRY RUN] {label} {src} -> {dst}"
-        print(msg)
-        _log_operation(msg)
+        _report(msg)
         return True
     if not src.exists():
         msg = f"[ERROR] {label} source not found: {src}"
-        print(msg)
-        _log_operation(msg)
+        _report(msg)
         return False
     try:
         msg = f"{label} {src} -> {dst}"
-        print(msg)
-        _log_operation(msg)
+        _report(msg)
         dst.parent.mkdir(parents=True, exist_ok=True)
-        shutil.move(str(src), str(dst))
+        transfer.move(src, dst, progress=transfer.print_progress(f"{label} {src.name}"))
         return True
     except PermissionError:
         msg = f"[ERROR] {label} permission denied: {src} -> {dst}"
-        print(msg)
-        _log_operation(msg)
+        _report(msg)
     except OSError as exc:
         msg = f"[ERROR] {label} failed for {src} -> {dst}: {exc}"
-        print(msg)
-        _log_operation(msg)
+        _report(msg)
     return False
 
 
-def archive_files(files: list[Path], archive_path: Path, dry_run: bool) -> bool:
+def archive_files(
+    files: list[Path],
+    archive_path: Path,
+    dry_run: bool,
+    settings: ArchiveSettings | None = None,
+) -> bool:
     """Add files to a zip archive, honoring dry-run mode.
 
-    When dry_run is True, the archive is not created; a preview line
-    is printed instead.
+    Members are appended to an existing archive and streamed from disk;
+    `settings` controls compression level, store-only suffixes and
+    parallel compression. When dry_run is True, the archive is not
+    created; a preview line is printed instead.
     """
     label = "ARCHIVE"
     if dry_run:
         msg = f"[DRY RUN] {label} {len(files)} file(s) into {archive_path}"
-        print(msg)
-        _log_operation(msg)
+        _report(msg)
         return True
     try:
         archive_path.parent.mkdir(parents=True, exist_ok=True)
         msg = f"{label} {len(files)} file(s) into {archive_path}"
-        print(msg)
-        _log_operation(msg)
-        with zipfile.ZipFile(archive_path, "w", compression=zipfile.ZIP_DEFLATED) as zf:
-            for fpath in files:
-                if not fpath.exists():
-                    warn_msg = f"[WARN] {label} skipping missing file: {fpath}"
-                    print(warn_msg)
-                    _log_operation(warn_msg)
-                    continue
-                zf.write(fpath, arcname=fpath.name)
+        _report(msg)
+        missing = write_archive(files, archive_path, settings or ArchiveSettings())
+        for fpath in missing:
+            warn_msg = f"[WARN] {label} skipping missing file: {fpath}"
+            _report(warn_msg)
         return True
     except PermissionError:
         msg = f"[ERROR] {label} permission denied: {archive_path}"
-        print(msg)
-        _log_operation(msg)
-    except OSError as exc:
+        _report(msg)
+    except (OSError, zipfile.BadZipFile) as exc:
         msg = f"[ERROR] {label} failed for {archive_path}: {exc}"
-        print(msg)
-        _log_operation(msg)
+        _report(msg)
     return False
 
+
+def unique_destination(directory: Path, name: str, used: set[str]) -> Path:
+    """Return directory/name, renamed as 'stem_N.ext' if already taken.
+
+    `used` collects names handed out earlier in the same bulk action.
+    """
+    candidate = name
+    stem, suffix = Path(name).stem, Path(name).suffix
+    counter = 1
+    while candidate in used or (directory / candidate).exists():
+        candidate = f"{stem}_{counter}{suffix}"
+        counter += 1
+    used.add(candidate)
+    return directory / candidate
+
+
+@dataclass
+class Operation:
+    """A single approved file action.
+
+    `action` is one of 'move', 'archive' or 'delete'; `dst` is the move
+    target or archive path. `size` is used for freed-bytes accounting;
+    `size` and `access_ts` also let a saved plan check that the file is
+    unchanged before acting on it.
+    """
+
+    action: str
+    path: Path
+    size: int = 0
+    dst: Path | None = None
+    access_ts: float | None = None
+
+
+def execute_operation(op: Operation, dry_run: bool, archive: ArchiveSettings | None = None) -> bool:
+    """Run one operation immediately and return whether it succeeded."""
+    return _metered(f"op.{op.action}", 1, op.size, _execute, op, dry_run, archive)
+
+
+def _execute(op: Operation, dry_run: bool, archive: ArchiveSettings | None) -> bool:
+    """Dispatch an operation to the matching file function."""
+    if op.action == "delete":
+        return delete_file(op.path, dry_run=dry_run)
+    if op.action == "move" and op.dst is not None:
+        return move_file(op.path, op.dst, dry_run=dry_run)
+    if op.action == "archive" and op.dst is not None:
+        return archive_files([op.path], op.dst, dry_run=dry_run, settings=archive)
+    return False
+
+
+class OperationQueue:
+    """Collect approved operations and execute them in bulk.
+
+    Deletes and moves run on a thread pool. Archive operations are
+    grouped by archive path so each archive is written once with all of
+    its members; different archives are written concurrently.
+    """
+
+    def __init__(self, dry_run: bool, workers: int = 4, archive: ArchiveSettings | None = None) -> None:
+        self.dry_run = dry_run
+        self.workers = max(1, workers)
+        self.archive = archive
+        self.pending: list[Operation] = []
+
+    def __len__(self) -> int:
+        return len(self.pending)
+
+    def add(self, op: Operation) -> None:
+        """Queue an operation for the next `run()`."""
+        self.pending.append(op)
+
+    def run(self) -> list[tuple[Operation, bool]]:
+        """Execute all queued operations and return (operation, ok) pairs."""
+        ops, self.pending = self.pending, []
+        archives: dict[Path, list[Operation]] = defaultdict(list)
+        singles: list[Operation] = []
+        for op in ops:
+            if op.action == "archive" and op.dst is not None:
+                archives[op.dst].append(op)
+            else:
+                singles.append(op)
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="cleansys-op") as pool:
+            archive_jobs = [(group, pool.submit(self._archive_group, dst, group)) for dst, group in archives.items()]
+            results = list(zip(singles, pool.map(lambda op: execute_operation(op, self.dry_run, self.archive), singles)))
+            for group, job in archive_jobs:
+                ok = job.result()
+                results.extend((op, ok) for op in group)
+        flush_log(sync=True)
+        return results
+
+    def _archive_group(self, archive_path: Path, group: list[Operation]) -> bool:
+        """Write every member of one archive in a single call."""
+        return _metered(
+            "op.archive",
+            len(group),
+            sum(op.size for op in group),
+            archive_files,
+            [op.path for op in group],
+            archive_path,
+            self.dry_run,
+            self.archive,
+        )
+
+
+def _metered(stage: str, items: int, nbytes: int, func: Callable[..., bool], *args) -> bool:
+    """Call func, recording its time and failure under stage when metrics are on."""
+    meter = metrics.current()
+    if meter is None:
+        return func(*args)
+    start = time.perf_counter()
+    ok = func(*args)
+    meter.add(stage, time.perf_counter() - start, items=items, nbytes=nbytes, errors=0 if ok else 1)
+    return ok
@@ -0,0 +1,150 @@
+import atexit
+import os
+import signal
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+DEFAULT_LOG_PATH = Path("cleansys.log")
+
+
+class OperationLog:
+    """Buffered writer for the cleansys operation log.
+
+    Lines are kept in memory and appended to the log file in one write
+    once `max_lines` are pending or `max_delay` seconds have passed since
+    the last flush; a timer enforces the delay even when no further line
+    is written, e.g. while the user sits at a review prompt.
+    `flush(sync=True)` additionally fsyncs the file and is
+    used at checkpoints and on exit. A relative path is resolved against
+    the working directory at the time each line is written.
+
+    The lock is reentrant so a signal handler that flushes while the main
+    thread is already flushing does not deadlock.
+    """
+
+    def __init__(self, path: Path = DEFAULT_LOG_PATH, max_lines: int = 256, max_delay: float = 2.0) -> None:
+        self.path = path
+        self.max_lines = max_lines
+        self.max_delay = max_delay
+        self._lines: list[str] = []
+        self._target: Path | None = None
+        self._last_flush = time.monotonic()
+        self._timer: threading.Timer | None = None
+        self._lock = threading.RLock()
+
+    def write(self, message: str, checkpoint: bool = False) -> None:
+        """Buffer a timestamped line, flushing when a threshold is reached."""
+        timestamp = datetime.now().isoformat(timespec="seconds")
+        target = self.path if self.path.is_absolute() else Path(os.getcwd(), self.path)
+        with self._lock:
+            if self._target is not None and target != self._target:
+                self._flush_locked(sync=False)
+            self._target = target
+            self._lines.append(f"{timestamp} | {message}\n")
+            due = len(self._lines) >= self.max_lines or time.monotonic() - self._last_flush >= self.max_delay
+            if checkpoint or due:
+                self._flush_locked(sync=checkpoint)
+            elif self._timer is None:
+                delay = max(0.0, self.max_delay - (time.monotonic() - self._last_flush))
+                self._timer = threading.Timer(delay, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def flush(self, sync: bool = False) -> None:
+        """Write pending lines; with sync=True also fsync the log file."""
+        with self._lock:
+            self._flush_locked(sync)
+
+    def _flush_locked(self, sync: bool) -> None:
+        """Append pending lines to the log file. Caller holds the lock."""
+        self._last_flush = time.monotonic()
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._lines or self._target is None:
+            return
+        lines, self._lines = self._lines, []
+        try:
+            with self._target.open("a", encoding="utf-8") as log_file:
+                log_file.writelines(lines)
+                if sync:
+                    log_file.flush()
+                    os.fsync(log_file.fileno())
+        except OSError:
+            # Logging failures should not crash the main operation.
+            pass
+
+
+_log: OperationLog | None = None
+_log_guard = threading.Lock()
+_print_guard = threading.Lock()
+_exit_flush_installed = False
+
+
+def echo(message: str) -> None:
+    """Print a line; operations run on several threads, so prints are serialized."""
+    with _print_guard:
+        print(message)
+
+
+def get_log() -> OperationLog:
+    """Return the process-wide operation log, creating the default one."""
+    global _log
+    with _log_guard:
+        if _log is None:
+            _log = OperationLog()
+        return _log
+
+
+def configure_log(path: Path) -> OperationLog:
+    """Send subsequent log lines to path, flushing the previous log first."""
+    global _log
+    with _log_guard:
+        if _log is not None:
+            _log.flush(sync=True)
+        _log = OperationLog(path)
+        return _log
+
+
+def flush_log(sync: bool = False) -> None:
+    """Flush the operation log if one is in use."""
+    if _log is not None:
+        _log.flush(sync=sync)
+
+
+def install_exit_flush() -> None:
+    """Make sure buffered log lines reach disk on exit or termination.
+
+    Registers an atexit hook and wraps SIGTERM/SIGHUP/SIGINT handlers so
+    the log is flushed and fsynced before the previous handler runs.
+    Must be called from the main thread; repeated calls are no-ops.
+    """
+    global _exit_flush_installed
+    if _exit_flush_installed:
+        return
+    _exit_flush_installed = True
+    atexit.register(flush_log, True)
+    for name in ("SIGTERM", "SIGHUP", "SIGINT"):
+        signum = getattr(signal, name, None)
+        if signum is None:
+            continue
+        previous = signal.getsignal(signum)
+        signal.signal(signum, _flush_then(previous))
+
+
+def _flush_then(previous):
+    """Build a signal handler that flushes the log, then defers to previous."""
+
+    def handler(signum, frame) -> None:
+        flush_log(sync=True)
+        if callable(previous):
+            previous(signum, frame)
+            return
+        if previous == signal.SIG_IGN:
+            return
+        signal.signal(signum, signal.SIG_DFL)
+        os.kill(os.getpid(), signum)
+
+    return handler
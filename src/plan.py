@@ -0,0 +1,160 @@
+import json
+import os
+import time
+from itertools import islice
+from pathlib import Path
+from typing import Iterator
+
+from .archive import ArchiveSettings
+from .operations import Operation, OperationQueue
+from .oplog import get_log
+
+PLAN_VERSION = 1
+
+
+class PlanWriter:
+    """Record approved operations to a plan file instead of running them.
+
+    The plan is JSON Lines: a header line, then one operation per line
+    with the size and access time the file had when it was reviewed.
+    Paths are stored absolute so the plan can be applied from anywhere.
+    Lines are flushed every `max_lines` operations or `max_delay`
+    seconds, so an interrupted review keeps its decisions.
+    """
+
+    def __init__(self, path: Path, max_lines: int = 256, max_delay: float = 2.0) -> None:
+        self.path = path
+        self.max_lines = max_lines
+        self.max_delay = max_delay
+        self.count = 0
+        self._pending = 0
+        self._last_flush = time.monotonic()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = path.open("w", encoding="utf-8")
+        self._file.write(json.dumps({"cleansys_plan": PLAN_VERSION}) + "\n")
+
+    def add(self, op: Operation) -> None:
+        """Append one operation to the plan."""
+        record = {"action": op.action, "path": str(op.path.absolute()), "size": op.size}
+        if op.access_ts is not None:
+            record["access_ts"] = op.access_ts
+        if op.dst is not None:
+            record["dst"] = str(op.dst.absolute())
+        self._file.write(json.dumps(record) + "\n")
+        self.count += 1
+        self._pending += 1
+        if self._pending >= self.max_lines or time.monotonic() - self._last_flush >= self.max_delay:
+            self.flush()
+
+    def flush(self) -> None:
+        """Push buffered lines to the operating system."""
+        self._file.flush()
+        self._pending = 0
+        self._last_flush = time.monotonic()
+
+    def close(self) -> None:
+        """Flush, fsync and close the plan file."""
+        self.flush()
+        os.fsync(self._file.fileno())
+        self._file.close()
+
+
+def read_plan(path: Path) -> Iterator[Operation]:
+    """Yield the operations recorded in a plan file, in order.
+
+    Raises ValueError if the file is not a cleansys plan.
+    """
+    with path.open(encoding="utf-8") as fh:
+        try:
+            header = json.loads(fh.readline())
+        except json.JSONDecodeError:
+            header = None
+        if not isinstance(header, dict) or header.get("cleansys_plan") != PLAN_VERSION:
+            raise ValueError(f"{path} is not a cleansys plan file")
+        for lineno, line in enumerate(fh, start=2):
+            try:
+                record = json.loads(line)
+                yield Operation(
+                    action=record["action"],
+                    path=Path(record["path"]),
+                    size=record["size"],
+                    dst=Path(record["dst"]) if "dst" in record else None,
+                    access_ts=record.get("access_ts"),
+                )
+            except (json.JSONDecodeError, KeyError, TypeError) as exc:
+                raise ValueError(f"{path}:{lineno}: invalid plan entry") from exc
+
+
+def apply_plan(
+    path: Path,
+    dry_run: bool,
+    workers: int = 4,
+    archive: ArchiveSettings | None = None,
+    batch_size: int = 1000,
+) -> Iterator[tuple[Operation, bool | None]]:
+    """Execute a plan in batches and yield (operation, outcome) pairs.
+
+    Each batch runs on an `OperationQueue`. Before an operation is
+    queued the file is stat'ed again; if it is gone or its size or
+    access time no longer match the plan, the operation is skipped and
+    reported with outcome None. After each batch the number of finished
+    entries is saved next to the plan (`<plan>.done`), so running the
+    same plan again resumes after the last completed batch. Dry runs do
+    not touch the checkpoint.
+    """
+    checkpoint = path.with_name(path.name + ".done")
+    plan_size = path.stat().st_size
+    done = _read_checkpoint(checkpoint, plan_size)
+    if done:
+        print(f"Resuming {path} after {done} completed operation(s).")
+    ops = islice(read_plan(path), done, None)
+    while True:
+        batch = list(islice(ops, batch_size))
+        if not batch:
+            break
+        queue = OperationQueue(dry_run=dry_run, workers=workers, archive=archive)
+        for op in batch:
+            reason = _changed_since_plan(op)
+            if reason is None:
+                queue.add(op)
+                continue
+            msg = f"[WARN] {op.action.upper()} skipped, {reason}: {op.path}"
+            print(msg)
+            get_log().write(msg)
+            yield op, None
+        yield from queue.run()
+        done += len(batch)
+        if not dry_run:
+            _write_checkpoint(checkpoint, done, plan_size)
+
+
+def _changed_since_plan(op: Operation) -> str | None:
+    """Return why a planned file no longer qualifies, or None if unchanged."""
+    try:
+        st = os.stat(op.path, follow_symlinks=False)
+    except OSError:
+        return "file no longer exists"
+    if st.st_size != op.size:
+        return "size changed"
+    if op.access_ts is not None and st.st_atime != op.access_ts:
+        return "accessed since planning"
+    return None
+
+
+def _read_checkpoint(checkpoint: Path, plan_size: int) -> int:
+    """Return the number of finished entries recorded for this plan."""
+    try:
+        state = json.loads(checkpoint.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return 0
+    if state.get("plan_size") != plan_size:
+        print(f"[WARN] Ignoring checkpoint {checkpoint}: the plan file has changed")
+        return 0
+    return int(state.get("done", 0))
+
+
+def _write_checkpoint(checkpoint: Path, done: int, plan_size: int) -> None:
+    """Atomically record progress through the plan."""
+    tmp = checkpoint.with_name(checkpoint.name + ".tmp")
+    tmp.write_text(json.dumps({"done": done, "plan_size": plan_size}), encoding="utf-8")
+    os.replace(tmp, checkpoint)
@@ -0,0 +1,162 @@
+import fnmatch
+import os
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from time import time
+from typing import Any
+
+from .analyzer import FileInfo
+from .operations import Operation, unique_destination
+from .size_parser import parse_size
+
+ACTIONS = {"keep", "move", "archive", "delete"}
+_RULE_KEYS = {"name", "action", "min_size", "unused_days", "file_types", "paths", "destination"}
+
+
+class PolicyError(ValueError):
+    """A policy file that cannot be read or has an invalid rule."""
+
+
+@dataclass
+class Rule:
+    """One compiled policy rule: criteria plus the action to take.
+
+    All criteria present must match. `paths` globs are matched against
+    the resolved absolute file path, however the scan root was typed;
+    `destination` is a directory for 'move' and a
+    zip file for 'archive'.
+    """
+
+    name: str
+    action: str
+    min_size: int | None = None
+    cutoff_ts: float | None = None
+    suffixes: frozenset | None = None
+    path_re: re.Pattern | None = None
+    destination: Path | None = None
+    # Resolved form of the last parent directory seen; files arrive
+    # grouped by directory, so this needs one realpath per directory.
+    _parent: Path | None = field(default=None, repr=False, compare=False)
+    _resolved_parent: str = field(default="", repr=False, compare=False)
+
+    def matches(self, info: FileInfo) -> bool:
+        """Return True if info satisfies every criterion of this rule."""
+        if self.min_size is not None and info.size < self.min_size:
+            return False
+        if self.cutoff_ts is not None and info.access_ts > self.cutoff_ts:
+            return False
+        if self.suffixes is not None and info.path.suffix.lower() not in self.suffixes:
+            return False
+        return self.path_re is None or self.path_re.match(self._full_path(info.path)) is not None
+
+    def _full_path(self, path: Path) -> str:
+        """Return path with its directory resolved to an absolute path."""
+        if path.parent != self._parent:
+            self._parent = path.parent
+            self._resolved_parent = os.path.realpath(path.parent)
+        return os.path.join(self._resolved_parent, path.name)
+
+
+@dataclass
+class Policy:
+    """An ordered rule set; the first matching rule decides a file's fate."""
+
+    rules: list[Rule]
+    _used: dict[Path, set[str]] = field(default_factory=dict, repr=False)
+
+    def decide(self, info: FileInfo) -> Operation | None:
+        """Return the operation for info, or None to keep it."""
+        for rule in self.rules:
+            if not rule.matches(info):
+                continue
+            if rule.action == "keep":
+                return None
+            if rule.action == "move":
+                used = self._used.setdefault(rule.destination, set())
+                dst = unique_destination(rule.destination, info.path.name, used)
+                return Operation("move", info.path, info.size, dst, access_ts=info.access_ts)
+            return Operation(rule.action, info.path, info.size, rule.destination, access_ts=info.access_ts)
+        return None
+
+
+def load_policy(path: Path, now_ts: float | None = None) -> Policy:
+    """Load and compile a TOML or YAML rules file.
+
+    The file holds a list of rules under the `rule` key, e.g. in TOML:
+
+        [[rule]]
+        name = "stale logs"
+        action = "delete"
+        unused_days = 90
+        file_types = [".log"]
+        paths = ["/var/log/*"]
+
+    Raises PolicyError (a ValueError) with a readable message on invalid
+    content.
+    """
+    data = _read_rules_file(path)
+    raw_rules = data.get("rule") if isinstance(data, dict) else None
+    if not isinstance(raw_rules, list) or not raw_rules:
+        raise PolicyError(f"{path}: expected a non-empty list of rules under 'rule'")
+    now_ts = time() if now_ts is None else now_ts
+    return Policy([_compile_rule(raw, i, now_ts) for i, raw in enumerate(raw_rules, start=1)])
+
+
+def _read_rules_file(path: Path) -> Any:
+    """Parse a rules file based on its suffix."""
+    try:
+        text = path.read_text(encoding="utf-8")
+    except OSError as exc:
+        raise PolicyError(f"cannot read policy file {path}: {exc}") from exc
+    if path.suffix.lower() in {".yaml", ".yml"}:
+        try:
+            import yaml
+        except ImportError as exc:
+            raise PolicyError("YAML policy files require PyYAML (pip install pyyaml)") from exc
+        try:
+            return yaml.safe_load(text)
+        except yaml.YAMLError as exc:
+            raise PolicyError(f"{path}: invalid YAML: {exc}") from exc
+    try:
+        import tomllib
+    except ImportError:  # Python < 3.11
+        import tomli as tomllib
+    try:
+        return tomllib.loads(text)
+    except tomllib.TOMLDecodeError as exc:
+        raise PolicyError(f"{path}: invalid TOML: {exc}") from exc
+
+
+def _compile_rule(raw: Any, index: int, now_ts: float) -> Rule:
+    """Validate one raw rule mapping and precompute its criteria."""
+    if not isinstance(raw, dict):
+        raise PolicyError(f"rule {index}: expected a table of settings")
+    name = str(raw.get("name", f"rule {index}"))
+    unknown = set(raw) - _RULE_KEYS
+    if unknown:
+        raise PolicyError(f"{name}: unknown setting(s): {', '.join(sorted(unknown))}")
+    action = raw.get("action")
+    if action not in ACTIONS:
+        raise PolicyError(f"{name}: action must be one of {', '.join(sorted(ACTIONS))}")
+    destination = raw.get("destination")
+    if action in {"move", "archive"} and not destination:
+        raise PolicyError(f"{name}: '{action}' requires a destination")
+    rule = Rule(name=name, action=action, destination=Path(destination) if destination else None)
+    if raw.get("min_size") is not None:
+        rule.min_size = parse_size(str(raw["min_size"]))
+    unused_days = raw.get("unused_days")
+    if unused_days is not None:
+        if isinstance(unused_days, bool) or not isinstance(unused_days, int) or unused_days < 0:
+            raise PolicyError(f"{name}: 'unused_days' must be a non-negative integer")
+        rule.cutoff_ts = now_ts - unused_days * 86400
+    for key in ("file_types", "paths"):
+        if raw.get(key) is not None and not (
+            isinstance(raw[key], list) and all(isinstance(item, str) for item in raw[key])
+        ):
+            raise PolicyError(f"{name}: '{key}' must be a list of strings")
+    if raw.get("file_types"):
+        rule.suffixes = frozenset(t.lower() if t.startswith(".") else f".{t.lower()}" for t in raw["file_types"])
+    if raw.get("paths"):
+        rule.path_re = re.compile("|".join(f"(?:{fnmatch.translate(p)})" for p in raw["paths"]))
+    return rule
@@ -0,0 +1,125 @@
+import cProfile
+import os
+import sys
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+
+# Suffixes written as collapsed stacks (flamegraph.pl / speedscope
+# input) by the sampling profiler; anything else gets cProfile pstats.
+COLLAPSED_SUFFIXES = (".folded", ".collapsed")
+
+
+class _CProfileSession:
+    """Deterministic cProfile profiler for the calling thread."""
+
+    def __init__(self) -> None:
+        self._profile = cProfile.Profile()
+
+    def start(self) -> None:
+        self._profile.enable()
+
+    def stop(self) -> None:
+        self._profile.disable()
+
+    def pause(self) -> None:
+        self._profile.disable()
+
+    def resume(self) -> None:
+        self._profile.enable()
+
+    def write(self, path: Path) -> None:
+        self._profile.dump_stats(str(path))
+
+
+class _SamplingSession:
+    """Wall-clock sampler that records the stacks of all threads.
+
+    Every `interval` seconds a background thread captures each thread's
+    current stack; identical stacks are counted, giving collapsed-stack
+    output suitable for flame graphs.
+    """
+
+    def __init__(self, interval: float = 0.005) -> None:
+        self.interval = interval
+        self.counts: Counter = Counter()
+        self._paused = False
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="cleansys-profiler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def pause(self) -> None:
+        self._paused = True
+
+    def resume(self) -> None:
+        self._paused = False
+
+    def write(self, path: Path) -> None:
+        with path.open("w", encoding="utf-8") as fh:
+            for stack, count in self.counts.most_common():
+                fh.write(f"{stack} {count}\n")
+
+    def _run(self) -> None:
+        own = threading.get_ident()
+        names = {t.ident: t.name for t in threading.enumerate()}
+        while not self._stop.wait(self.interval):
+            if self._paused:
+                continue
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                if ident not in names:
+                    names = {t.ident: t.name for t in threading.enumerate()}
+                frames = []
+                while frame is not None:
+                    code = frame.f_code
+                    frames.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                    frame = frame.f_back
+                frames.append(names.get(ident, "thread"))
+                self.counts[";".join(reversed(frames))] += 1
+
+
+_active: _CProfileSession | _SamplingSession | None = None
+
+
+@contextmanager
+def profile(path: Path) -> Iterator[None]:
+    """Profile the enclosed block and write the result to path.
+
+    `.folded`/`.collapsed` paths use the sampling profiler, which covers
+    every thread; other paths get a cProfile pstats dump of the calling
+    thread (load it with `python -m pstats PATH` or snakeviz).
+    """
+    global _active
+    session = _SamplingSession() if path.suffix.lower() in COLLAPSED_SUFFIXES else _CProfileSession()
+    _active = session
+    session.start()
+    try:
+        yield
+    finally:
+        session.stop()
+        _active = None
+        session.write(path)
+        print(f"Profile written to {path}")
+
+
+@contextmanager
+def paused() -> Iterator[None]:
+    """Exclude the enclosed block (e.g. waiting for input) from the profile."""
+    session = _active
+    if session is None:
+        yield
+        return
+    session.pause()
+    try:
+        yield
+    finally:
+        session.resume()
@@ -0,0 +1,104 @@
+import csv
+import json
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from .analyzer import FileInfo
+from .multiroot import root_for
+
+REPORT_FORMATS = (".json", ".csv")
+
+
+@dataclass
+class DirTotals:
+    """Rolled-up size, count and access-time range of one directory subtree."""
+
+    files: int = 0
+    bytes: int = 0
+    oldest_access_ts: float | None = None
+    newest_access_ts: float | None = None
+
+    def add(self, info: FileInfo) -> None:
+        """Fold one file into the totals."""
+        self.files += 1
+        self.bytes += info.size
+        if self.oldest_access_ts is None or info.access_ts < self.oldest_access_ts:
+            self.oldest_access_ts = info.access_ts
+        if self.newest_access_ts is None or info.access_ts > self.newest_access_ts:
+            self.newest_access_ts = info.access_ts
+
+
+class DirReport:
+    """du-style totals per directory, accumulated while files stream past.
+
+    Every file is added to its root and to each ancestor directory down
+    to `depth` levels below the root, so a directory's totals cover its
+    whole subtree. Deeper directories are folded into their ancestor at
+    `depth`; depth 0 reports the roots only.
+
+    Scanners may yield paths relative to a root, absolute or resolved
+    (`--index` resolves, `--checkpoint` makes them absolute); all forms
+    are reported under the root as given.
+    """
+
+    def __init__(self, roots: list[Path], depth: int = 1) -> None:
+        self.roots = roots
+        self.depth = depth
+        self._forms = [
+            (form, root) for root in roots for form in dict.fromkeys((root, root.absolute(), root.resolve()))
+        ]
+        self.totals: dict[Path, DirTotals] = {}
+        # Walkers yield a directory's files together, so remembering the
+        # targets of the last parent avoids most path arithmetic.
+        self._last_parent: Path | None = None
+        self._last_targets: list[DirTotals] = []
+
+    def add(self, info: FileInfo) -> None:
+        """Add one file to the totals of the directories containing it."""
+        parent = info.path.parent
+        if parent != self._last_parent:
+            self._last_parent = parent
+            self._last_targets = [self.totals.setdefault(d, DirTotals()) for d in self._ancestors(info.path)]
+        for totals in self._last_targets:
+            totals.add(info)
+
+    def tally(self, files: Iterable[FileInfo]) -> Iterator[FileInfo]:
+        """Pass files through unchanged, adding each one to the report."""
+        for info in files:
+            self.add(info)
+            yield info
+
+    def rows(self) -> list[tuple[Path, DirTotals]]:
+        """Return (directory, totals) pairs, largest subtree first."""
+        return sorted(self.totals.items(), key=lambda item: (-item[1].bytes, str(item[0])))
+
+    def _ancestors(self, path: Path) -> list[Path]:
+        """Return the reported directories that contain path."""
+        form = root_for(path, [form for form, _ in self._forms])
+        if form is None:
+            return [path.parent]
+        root = next(root for f, root in self._forms if f == form)
+        if path == form:
+            return [root]
+        parts = path.parent.relative_to(form).parts[: self.depth]
+        dirs = [root]
+        for part in parts:
+            dirs.append(dirs[-1] / part)
+        return dirs
+
+
+def write_report(rows: list[tuple[Path, DirTotals]], out: Path) -> None:
+    """Write report rows as JSON or CSV, chosen by the suffix of out."""
+    suffix = out.suffix.lower()
+    if suffix not in REPORT_FORMATS:
+        raise ValueError(f"Unsupported report format: {out.suffix or out.name} (use .json or .csv)")
+    records = [{"path": str(path), **asdict(totals)} for path, totals in rows]
+    with out.open("w", encoding="utf-8", newline="") as fh:
+        if suffix == ".json":
+            json.dump(records, fh, indent=2)
+            fh.write("\n")
+        else:
+            writer = csv.DictWriter(fh, fieldnames=["path", *DirTotals.__dataclass_fields__])
+            writer.writeheader()
+            writer.writerows(records)
@@ -1,6 +1,10 @@
+import os
+from contextlib import contextmanager
 from pathlib import Path
 from datetime import datetime
-from typing import Iterable, Iterator
+from typing import BinaryIO, Iterable, Iterator
+
+_NOATIME = getattr(os, "O_NOATIME", 0)
 
 
 def scan_directory(root: Path, recursive: bool = True) -> Iterator[Path]:
@@ -65,3 +69,45 @@ def filter_by_min_age_days(files: Iterable[Path], min_age_days: int, now: dateti
     return result
 
 
+
+
+def open_noatime(path: Path | str) -> tuple[int, bool]:
+    """Open path read-only, if possible without updating its access time.
+
+    Returns (fd, preserved). preserved is False when O_NOATIME is not
+    available or not permitted (it requires owning the file); callers
+    then use `restore_atime` after reading. Raises OSError.
+    """
+    flags = os.O_RDONLY | getattr(os, "O_BINARY", 0)
+    if _NOATIME:
+        try:
+            return os.open(path, flags | _NOATIME), True
+        except PermissionError:
+            pass
+    return os.open(path, flags), False
+
+
+def restore_atime(path: Path | str, fd: int, st: os.stat_result) -> None:
+    """Put back the access time recorded in st if a read updated it."""
+    try:
+        if os.fstat(fd).st_atime_ns != st.st_atime_ns:
+            os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns))
+    except OSError:
+        pass
+
+
+@contextmanager
+def open_unaccessed(path: Path | str) -> Iterator[BinaryIO]:
+    """Open path for binary reading, leaving its access time unchanged.
+
+    Reading candidates must not make them look recently used, since
+    `--unused-days` is based on access time.
+    """
+    fd, preserved = open_noatime(path)
+    st = None if preserved else os.fstat(fd)
+    with os.fdopen(fd, "rb") as fh:
+        try:
+            yield fh
+        finally:
+            if st is not None:
+                restore_atime(path, fd, st)
@@ -0,0 +1,111 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Any, Iterable, Iterator
+
+from .analyzer import FileInfo, iter_filter_files
+from .columnar import FileBatch
+from .matcher import PathMatcher
+from .walker import list_directory, scan_file_infos
+
+# Directories are split one level further while there are fewer than
+# this many shards per process, so one huge subtree does not leave the
+# other processes idle; at most _MAX_SPLIT_DEPTH levels are split.
+_SHARDS_PER_PROCESS = 4
+_MAX_SPLIT_DEPTH = 3
+
+
+def scan_sharded(
+    roots: list[Path],
+    processes: int,
+    recursive: bool = True,
+    matcher: PathMatcher | None = None,
+    criteria: dict[str, Any] | None = None,
+) -> Iterator[FileBatch]:
+    """Scan roots on a process pool and yield FileBatch results.
+
+    The tree is split into shards by top-level subdirectory (deeper
+    when there are too few to keep every process busy). Each worker
+    walks its shard, applies `criteria` (keyword arguments of
+    `iter_filter_files`) and sends back one compact FileBatch, so
+    results cross the process boundary as a few arrays rather than one
+    pickled object per file. Files above the shard level are listed and
+    filtered in this process. Batches are yielded as shards complete.
+
+    Workers are started with forkserver (or spawn where that is
+    unavailable): a `--profile` sampler thread may be running, and
+    forking a multi-threaded process is unsafe. If the pool breaks, for
+    example because a worker cannot import `__main__`, the remaining
+    shards are scanned in this process.
+    """
+    if criteria is not None and criteria.get("now_ts") is None:
+        from time import time
+
+        # Every shard must use the same age cutoff.
+        criteria = {**criteria, "now_ts": time()}
+    local = FileBatch()
+    shards: list[str] = []
+    for root in roots:
+        if root.is_file():
+            local.extend(_filtered(scan_file_infos(root), criteria))
+        elif root.is_dir():
+            shards.append(str(root))
+    if not recursive:
+        for dirpath in shards:
+            local.extend(_filtered(scan_file_infos(Path(dirpath), recursive=False, matcher=matcher), criteria))
+        yield local
+        return
+    for _ in range(_MAX_SPLIT_DEPTH):
+        if len(shards) >= processes * _SHARDS_PER_PROCESS:
+            break
+        shards = _split(shards, local, matcher, criteria)
+    yield local
+    if not shards:
+        return
+    methods = multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+    pending = set(shards)
+    try:
+        with ProcessPoolExecutor(max_workers=processes, mp_context=context) as pool:
+            futures = {pool.submit(_scan_shard, dirpath, matcher, criteria): dirpath for dirpath in shards}
+            try:
+                for future in as_completed(futures):
+                    batch = future.result()
+                    pending.discard(futures[future])
+                    yield batch
+            finally:
+                for future in futures:
+                    future.cancel()
+    except BrokenProcessPool:
+        for dirpath in shards:
+            if dirpath in pending:
+                yield _scan_shard(dirpath, matcher, criteria)
+
+
+def _split(
+    shards: list[str],
+    local: FileBatch,
+    matcher: PathMatcher | None,
+    criteria: dict[str, Any] | None,
+) -> list[str]:
+    """List shard directories here and return their subdirectories as new shards."""
+    deeper: list[str] = []
+    for dirpath in shards:
+        listing = list_directory(dirpath, matcher)
+        if listing is None:
+            continue
+        infos, subdirs = listing
+        local.extend(_filtered(infos, criteria))
+        deeper.extend(subdirs)
+    return deeper
+
+
+def _scan_shard(dirpath: str, matcher: PathMatcher | None, criteria: dict[str, Any] | None) -> FileBatch:
+    """Worker: walk and filter one shard into a FileBatch."""
+    return FileBatch().extend(_filtered(scan_file_infos(Path(dirpath), matcher=matcher), criteria))
+
+
+def _filtered(infos: Iterable[FileInfo], criteria: dict[str, Any] | None) -> Iterable[FileInfo]:
+    """Apply criteria to a stream of FileInfo records, if given."""
+    return infos if criteria is None else iter_filter_files(infos, **criteria)
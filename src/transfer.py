@@ -0,0 +1,128 @@
+import errno
+import os
+import shutil
+import stat
+import time
+from pathlib import Path
+from typing import Callable
+
+from . import metrics
+from .oplog import echo
+
+# Bytes handed to the kernel per copy call across devices.
+CHUNK_BYTES = 64 * 1024 * 1024
+# Files at least this large get progress lines while they are copied.
+PROGRESS_BYTES = 1024 * 1024 * 1024
+# Errors meaning a zero-copy call is unavailable for this pair of files.
+_UNSUPPORTED = {errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP, errno.ENOTSUP}
+
+Progress = Callable[[int, int], None]
+
+
+def move(src: Path, dst: Path, progress: Progress | None = None, chunk: int = CHUNK_BYTES) -> None:
+    """Move src to dst, renaming when both are on the same device.
+
+    Across devices a regular file is copied with `copy_file_range`, or
+    `sendfile`, or plain reads and writes, whichever the kernel
+    supports, in `chunk`-sized steps; `progress(copied, total)` is
+    called after each step. The copy goes to a temporary name next to
+    dst, gets the source's mode and timestamps, is fsync'ed and checked
+    against the source size before it replaces dst and the source is
+    removed. Other file types fall back to `shutil.move`. Raises
+    OSError on failure, leaving the source in place. If dst is an
+    existing directory the file is moved into it, as with `shutil.move`.
+    """
+    if dst.is_dir():
+        dst = dst / src.name
+    src_st = os.stat(src, follow_symlinks=False)
+    if src_st.st_dev == os.stat(dst.parent).st_dev:
+        os.rename(src, dst)
+        return
+    if not stat.S_ISREG(src_st.st_mode):
+        shutil.move(str(src), str(dst))
+        return
+    tmp = dst.with_name(f".{dst.name}.cleansys-partial")
+    try:
+        with metrics.timed("op.move.copy", items=1, nbytes=src_st.st_size):
+            _copy(src, tmp, src_st.st_size, progress, chunk)
+        shutil.copystat(src, tmp)
+        # Reading the source may have updated its access time.
+        os.utime(tmp, ns=(src_st.st_atime_ns, src_st.st_mtime_ns))
+        copied = os.stat(tmp).st_size
+        now = os.stat(src)
+        if copied != src_st.st_size or (now.st_size, now.st_mtime_ns) != (src_st.st_size, src_st.st_mtime_ns):
+            raise OSError(f"size mismatch after copy ({copied} of {src_st.st_size} bytes) or source modified")
+        os.replace(tmp, dst)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+    os.unlink(src)
+
+
+def print_progress(label: str, min_bytes: int = PROGRESS_BYTES, every: float = 5.0) -> Progress:
+    """Return a progress callback printing a line at most every `every` seconds.
+
+    Files smaller than min_bytes are copied silently.
+    """
+    start = last = time.monotonic()
+
+    def report(copied: int, total: int) -> None:
+        nonlocal last
+        now = time.monotonic()
+        if total < min_bytes or (now - last < every and copied < total):
+            return
+        last = now
+        mib = 1024 * 1024
+        rate = copied / mib / max(now - start, 1e-6)
+        echo(f"  {label}: {copied // mib} of {total // mib} MiB ({copied * 100 // total}%), {rate:.0f} MiB/s")
+
+    return report
+
+
+def _copy(src: Path, dst: Path, total: int, progress: Progress | None, chunk: int) -> None:
+    """Copy src into a new file dst and fsync it."""
+    steps = [
+        step
+        for step, name in ((_copy_file_range, "copy_file_range"), (_sendfile, "sendfile"), (_read_write, "write"))
+        if hasattr(os, name)
+    ]
+    with open(src, "rb") as fin, open(dst, "wb") as fout:
+        infd, outfd = fin.fileno(), fout.fileno()
+        copied = 0
+        while True:
+            try:
+                n = steps[0](infd, outfd, chunk, copied)
+            except OSError as exc:
+                # Fall back to the next method, but only before anything was written.
+                if exc.errno not in _UNSUPPORTED or copied or len(steps) == 1:
+                    raise
+                steps.pop(0)
+                continue
+            if n == 0:
+                break
+            copied += n
+            if progress is not None:
+                progress(copied, total)
+        os.fsync(outfd)
+
+
+def _copy_file_range(infd: int, outfd: int, count: int, offset: int) -> int:
+    """Copy up to count bytes at offset inside the kernel (or reflink them)."""
+    return os.copy_file_range(infd, outfd, count, offset)
+
+
+def _sendfile(infd: int, outfd: int, count: int, offset: int) -> int:
+    """Copy up to count bytes at offset inside the kernel."""
+    return os.sendfile(outfd, infd, offset, count)
+
+
+def _read_write(infd: int, outfd: int, count: int, offset: int) -> int:
+    """Copy up to count bytes at offset through a user-space buffer."""
+    data = os.pread(infd, count, offset) if hasattr(os, "pread") else os.read(infd, count)
+    view = memoryview(data)
+    while view:
+        view = view[os.write(outfd, view) :]
+    return len(data)
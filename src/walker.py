@@ -0,0 +1,180 @@
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Iterator
+
+from . import metrics
+from .analyzer import FileInfo
+from .matcher import PathMatcher
+
+
+def scan_file_infos(
+    root: Path,
+    recursive: bool = True,
+    workers: int = 1,
+    matcher: PathMatcher | None = None,
+) -> Iterator[FileInfo]:
+    """Yield FileInfo records for files under root.
+
+    Uses `os.scandir` cached type information to skip hidden entries and
+    symlinks, and a single `stat(follow_symlinks=False)` per file to fill
+    size and access time. Same skipping rules as `scan_directory`.
+
+    With workers > 1, directories are listed concurrently by a thread
+    pool; records are then yielded in completion order. A matcher's
+    include/exclude rules are applied to entry names before any stat,
+    and excluded directories are not descended into.
+    """
+    if not root.exists():
+        return
+    if root.is_file():
+        st = root.stat()
+        yield FileInfo(path=root, size=st.st_size, access_ts=st.st_atime)
+        return
+    if workers > 1 and recursive:
+        yield from _parallel_walk(str(root), workers, matcher)
+        return
+
+    stack: list[str] = [str(root)]
+    while stack:
+        listing = list_directory(stack.pop(), matcher)
+        if listing is None:
+            continue
+        infos, subdirs = listing
+        yield from infos
+        if recursive:
+            stack.extend(subdirs)
+
+
+def _parallel_walk(root: str, workers: int, matcher: PathMatcher | None) -> Iterator[FileInfo]:
+    """Walk a tree by listing directories concurrently on a thread pool.
+
+    Every discovered subdirectory is submitted back to the pool, so the
+    number of outstanding listings grows with the tree's breadth up to
+    the worker count. A directory with more than `_STAT_CHUNK` files has
+    the rest of its stat calls split into chunks that are submitted as
+    separate tasks, so one huge flat directory (e.g. on NFS) is stat'ed
+    in parallel too. Results are drained by the calling thread.
+    """
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="cleansys-walk") as pool:
+        pending: set[Future] = {pool.submit(_list_split, root, matcher)}
+        try:
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    listing = future.result()
+                    if listing is None:
+                        continue
+                    infos, subdirs, chunks = listing
+                    pending.update(pool.submit(_list_split, d, matcher) for d in subdirs)
+                    pending.update(pool.submit(_stat_chunk, chunk) for chunk in chunks)
+                    yield from infos
+        finally:
+            # Stop queued listings when the consumer abandons the scan early.
+            for future in pending:
+                future.cancel()
+
+
+# Files stat'ed by one pool task in the parallel walk.
+_STAT_CHUNK = 256
+
+
+def _list_split(
+    dirpath: str,
+    matcher: PathMatcher | None,
+) -> tuple[list[FileInfo], list[str], list[list[os.DirEntry]]] | None:
+    """List a directory and stat its first `_STAT_CHUNK` files.
+
+    The remaining files are returned in chunks for other workers.
+    """
+    listing = _list_entries(dirpath, matcher)
+    if listing is None:
+        return None
+    entries, subdirs = listing
+    chunks = [entries[i : i + _STAT_CHUNK] for i in range(_STAT_CHUNK, len(entries), _STAT_CHUNK)]
+    return _stat_entries(entries[:_STAT_CHUNK]), subdirs, chunks
+
+
+def _stat_chunk(entries: list[os.DirEntry]) -> tuple[list[FileInfo], list[str], list[list[os.DirEntry]]]:
+    """Stat one chunk of a large directory for `_parallel_walk`."""
+    return _stat_entries(entries), [], []
+
+
+def list_directory(
+    dirpath: str,
+    matcher: PathMatcher | None = None,
+) -> tuple[list[FileInfo], list[str]] | None:
+    """List one directory, returning its files and subdirectory paths.
+
+    Entries rejected by the matcher are dropped without being stat'ed.
+
+    Returns None (after printing a warning) when the directory cannot be
+    read because of missing permissions.
+    """
+    listing = _list_entries(dirpath, matcher)
+    if listing is None:
+        return None
+    entries, subdirs = listing
+    return _stat_entries(entries), subdirs
+
+
+def _list_entries(
+    dirpath: str,
+    matcher: PathMatcher | None,
+) -> tuple[list[os.DirEntry], list[str]] | None:
+    """Return a directory's file entries (not yet stat'ed) and subdirectories."""
+    entries: list[os.DirEntry] = []
+    subdirs: list[str] = []
+    meter = metrics.current()
+    start = time.perf_counter() if meter is not None else 0.0
+    try:
+        with os.scandir(dirpath) as it:
+            for entry in it:
+                if entry.name.startswith("."):
+                    continue
+                if entry.is_symlink():
+                    continue
+                if entry.is_file(follow_symlinks=False):
+                    if matcher is not None and not matcher.allows_file(entry.name, entry.path):
+                        continue
+                    entries.append(entry)
+                elif entry.is_dir(follow_symlinks=False):
+                    if matcher is not None and matcher.skips_dir(entry.name, entry.path):
+                        continue
+                    subdirs.append(entry.path)
+    except PermissionError:
+        print(f"[WARN] Skipping directory (permission denied): {dirpath}")
+        if meter is not None:
+            meter.add("scan.list", time.perf_counter() - start, errors=1)
+        return None
+    if meter is not None:
+        meter.add("scan.list", time.perf_counter() - start, items=len(entries) + len(subdirs))
+    return entries, subdirs
+
+
+def _stat_entries(entries: list[os.DirEntry]) -> list[FileInfo]:
+    """Stat file entries, dropping any that vanished since listing."""
+    meter = metrics.current()
+    start = time.perf_counter() if meter is not None else 0.0
+    infos = [info for info in map(_entry_info, entries) if info is not None]
+    if meter is not None and entries:
+        meter.add(
+            "scan.stat",
+            time.perf_counter() - start,
+            calls=len(entries),
+            items=len(infos),
+            nbytes=sum(info.size for info in infos),
+            errors=len(entries) - len(infos),
+        )
+    return infos
+
+
+def _entry_info(entry: os.DirEntry) -> FileInfo | None:
+    """Build a FileInfo from a directory entry with a single stat call."""
+    try:
+        st = entry.stat(follow_symlinks=False)
+    except OSError:
+        # The file vanished or became unreadable between listing and stat.
+        return None
+    return FileInfo(path=Path(entry.path), size=st.st_size, access_ts=st.st_atime)
@@ -0,0 +1,77 @@
+import asyncio
+import threading
+from pathlib import Path
+
+from src import aio
+from src.aio import IOLimit, adelete, amove, arun_operations, ascan
+from src.operations import Operation
+
+
+def collect(root: Path, **kwargs) -> set[str]:
+    async def run() -> set[str]:
+        return {info.path.name async for info in ascan(root, **kwargs)}
+
+    return asyncio.run(run())
+
+
+def test_ascan_yields_nested_files_and_skips_hidden(tmp_path) -> None:
+    (tmp_path / "top.txt").write_text("data")
+    (tmp_path / ".hidden.txt").write_text("data")
+    for d in range(4):
+        sub = tmp_path / f"dir{d}" / "inner"
+        sub.mkdir(parents=True)
+        (sub / f"file{d}.txt").write_text("data")
+
+    assert collect(tmp_path, concurrency=3) == {"top.txt", "file0.txt", "file1.txt", "file2.txt", "file3.txt"}
+    assert collect(tmp_path, recursive=False) == {"top.txt"}
+
+
+def test_ascan_missing_root_yields_nothing(tmp_path) -> None:
+    assert collect(tmp_path / "missing") == set()
+
+
+def test_adelete_and_amove_share_a_limit(tmp_path, monkeypatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    doomed = tmp_path / "doomed.txt"
+    mover = tmp_path / "mover.txt"
+    doomed.write_text("x")
+    mover.write_text("y")
+
+    async def run() -> list[bool]:
+        with IOLimit(1) as limit:
+            return list(
+                await asyncio.gather(
+                    adelete(doomed, dry_run=False, limit=limit),
+                    amove(mover, tmp_path / "moved" / "mover.txt", dry_run=False, limit=limit),
+                )
+            )
+
+    assert asyncio.run(run()) == [True, True]
+    assert not doomed.exists()
+    assert (tmp_path / "moved" / "mover.txt").read_text() == "y"
+
+
+def test_arun_operations_returns_results_in_order(tmp_path, monkeypatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    paths = [tmp_path / f"f{i}.txt" for i in range(6)]
+    for path in paths[:5]:
+        path.write_text("x")
+    ops = [Operation("delete", path, size=1) for path in paths]
+
+    results = asyncio.run(arun_operations(ops, dry_run=False, concurrency=2))
+
+    assert results == [True] * 5 + [False]
+    assert not any(path.exists() for path in paths)
+
+
+def test_io_limit_runs_more_calls_than_the_default_executor(tmp_path, monkeypatch) -> None:
+    # Every call waits for all the others, so this only finishes if 40
+    # run at once (the default executor would allow at most 32).
+    barrier = threading.Barrier(40, timeout=5)
+    monkeypatch.setattr(aio, "delete_file", lambda path, dry_run: barrier.wait() >= 0)
+
+    async def run() -> list[bool]:
+        with IOLimit(40) as limit:
+            return list(await asyncio.gather(*(adelete(tmp_path / str(i), False, limit) for i in range(40))))
+
+    assert asyncio.run(run()) == [True] * 40
@@ -1,7 +1,7 @@
 from time import time
 from pathlib import Path
 
-from src.analyzer import FileInfo, filter_files
+from src.analyzer import FileInfo, filter_files, iter_filter_files, top_files
 
 
 def make_file_info(size: int, age_days: int) -> FileInfo:
@@ -101,4 +101,31 @@ def test_filter_files_age_boundary_is_inclusive() -> None:
         now_ts=now_ts,
     )
 
-    assert filtered == [boundary_file]
\ No newline at end of file
+    assert filtered == [boundary_file]
+
+def test_iter_filter_files_yields_matches_lazily() -> None:
+    now_ts = time()
+    seen: list[str] = []
+
+    def stream():
+        for name, size in [("small.txt", 10), ("big.txt", 5000), ("bigger.txt", 9000)]:
+            seen.append(name)
+            yield FileInfo(path=Path(name), size=size, access_ts=now_ts)
+
+    matches = iter_filter_files(stream(), min_size=1000, now_ts=now_ts)
+
+    first = next(matches)
+    assert first.path.name == "big.txt"
+    assert seen == ["small.txt", "big.txt"]
+    assert [f.path.name for f in matches] == ["bigger.txt"]
+
+
+def test_top_files_keeps_largest_and_oldest_in_order() -> None:
+    files = [make_file_info(size=s, age_days=a) for s, a in [(5, 1), (50, 3), (20, 9), (1, 30), (40, 2)]]
+
+    largest = top_files(iter(files), 3, sort="size")
+    oldest = top_files(iter(files), 2, sort="atime")
+
+    assert [f.size for f in largest] == [50, 40, 20]
+    assert [f.size for f in oldest] == [1, 20]
+    assert top_files(iter(files), 10) == sorted(files, key=lambda f: f.size, reverse=True)
@@ -0,0 +1,35 @@
+from benchmarks.runner import compare, run_suite
+from benchmarks.tree import TreeShape, generate_tree
+
+
+def test_generate_tree_matches_shape(tmp_path) -> None:
+    shape = TreeShape(depth=2, fanout=3, files_per_dir=4, size_dist="fixed", mean_size=10, old_fraction=1.0)
+
+    files, total = generate_tree(tmp_path / "tree", shape)
+
+    on_disk = [p for p in (tmp_path / "tree").rglob("*") if p.is_file()]
+    assert files == len(on_disk) == shape.files == 13 * 4
+    assert total == files * 10
+    assert all(p.stat().st_size == 10 for p in on_disk)
+
+
+def test_run_suite_measures_requested_stages() -> None:
+    shape = TreeShape(depth=1, fanout=2, files_per_dir=5)
+
+    results = run_suite(shape, ["walk", "end-to-end"], isolate=False)
+
+    assert list(results["stages"]) == ["walk", "end-to-end"]
+    walk = results["stages"]["walk"]
+    assert walk["files"] == shape.files
+    assert walk["syscalls"] > 0
+    assert walk["peak_rss_mb"] > 0
+
+
+def test_compare_reports_slowdowns_beyond_tolerance() -> None:
+    baseline = {"stages": {"walk": {"files_per_sec": 1000.0}, "filter": {"files_per_sec": 1000.0}}}
+    results = {"stages": {"walk": {"files_per_sec": 850.0}, "filter": {"files_per_sec": 950.0}}}
+
+    regressions = compare(results, baseline, tolerance=0.10)
+
+    assert len(regressions) == 1
+    assert regressions[0].startswith("walk:")
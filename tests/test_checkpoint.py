@@ -0,0 +1,57 @@
+import json
+
+import pytest
+
+from src import checkpoint as checkpoint_mod
+from src.checkpoint import scan_checkpointed
+
+
+def _tree(tmp_path):
+    root = tmp_path / "root"
+    for d in range(6):
+        sub = root / f"d{d}"
+        sub.mkdir(parents=True)
+        for f in range(3):
+            (sub / f"f{f}.log").write_text("x" * (f + 1))
+    return root
+
+
+def test_scan_checkpointed_matches_plain_walk(tmp_path) -> None:
+    root = _tree(tmp_path)
+    state_path = tmp_path / "scan.ckpt"
+
+    infos = list(scan_checkpointed([root], state_path))
+
+    assert len(infos) == 18
+    state = json.loads(state_path.read_text())
+    assert state["complete"] is True
+    assert state["stack"] == []
+
+
+def test_resume_continues_after_interruption(tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr(checkpoint_mod, "_SAVE_EVERY_DIRS", 1)
+    root = _tree(tmp_path)
+    state_path = tmp_path / "scan.ckpt"
+
+    scan = scan_checkpointed([root], state_path)
+    seen = [next(scan) for _ in range(7)]
+    scan.close()  # simulate the process being killed mid-walk
+    listed = []
+    real_list = checkpoint_mod.list_directory
+    monkeypatch.setattr(checkpoint_mod, "list_directory", lambda d, m=None: listed.append(d) or real_list(d, m))
+
+    resumed = list(scan_checkpointed([root], state_path, resume=True))
+
+    assert sorted(i.path for i in resumed) == sorted(p for p in root.rglob("*.log"))
+    assert {i.path for i in seen} <= {i.path for i in resumed}
+    assert str(root) not in listed
+    assert len(listed) < 7
+
+
+def test_resume_rejects_different_roots(tmp_path) -> None:
+    root = _tree(tmp_path)
+    state_path = tmp_path / "scan.ckpt"
+    list(scan_checkpointed([root], state_path))
+
+    with pytest.raises(ValueError, match="different roots"):
+        list(scan_checkpointed([root / "d0"], state_path, resume=True))
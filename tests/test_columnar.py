@@ -0,0 +1,109 @@
+import pickle
+from pathlib import Path
+from time import time
+
+import pytest
+
+from src.analyzer import FileInfo, filter_files, to_file_batch
+from src.columnar import FileBatch, filter_batch, path_suffix
+
+
+def make_batch(now_ts: float) -> FileBatch:
+    batch = FileBatch()
+    batch.append("/data/logs", "app.log", 5000, now_ts - 200 * 86400)
+    batch.append("/data/logs", "debug.LOG", 10, now_ts - 200 * 86400)
+    batch.append("/data/tmp", "cache.tmp", 9000, now_ts - 5 * 86400)
+    batch.append("/data", "README", 7000, now_ts - 400 * 86400)
+    return batch
+
+
+def test_path_suffix_matches_pathlib() -> None:
+    for name in ["a.txt", "a.tar.gz", ".bashrc", "noext", "trailing.", "a.B"]:
+        assert path_suffix(name) == Path(name).suffix
+
+
+def test_file_batch_materializes_file_info() -> None:
+    batch = make_batch(now_ts=1_000_000_000.0)
+
+    assert len(batch) == 4
+    assert batch.dirs == ["/data/logs", "/data/tmp", "/data"]
+    assert batch.info(1) == FileInfo(path=Path("/data/logs/debug.LOG"), size=10, access_ts=1_000_000_000.0 - 200 * 86400)
+    assert [info.path.name for info in batch] == ["app.log", "debug.LOG", "cache.tmp", "README"]
+
+
+def test_filter_files_on_batch_matches_list_filter() -> None:
+    now_ts = time()
+    batch = make_batch(now_ts)
+    criteria = {"min_size": 1000, "min_age_days": 30, "now_ts": now_ts}
+
+    filtered = filter_files(batch, **criteria)
+
+    assert isinstance(filtered, FileBatch)
+    assert list(filtered) == filter_files(list(batch), **criteria)
+    assert [info.path.name for info in filtered] == ["app.log", "README"]
+
+
+def test_filter_files_on_batch_by_file_type() -> None:
+    now_ts = time()
+    filtered = filter_files(make_batch(now_ts), now_ts=now_ts, file_types=["log", ".TMP", ".missing"])
+
+    assert [info.path.name for info in filtered] == ["app.log", "debug.LOG", "cache.tmp"]
+
+
+def test_to_file_batch_reads_metadata(tmp_path) -> None:
+    path = tmp_path / "one.txt"
+    path.write_text("12345")
+
+    batch = to_file_batch([path])
+
+    assert batch.path(0) == path
+    assert batch.sizes[0] == 5
+
+
+def test_file_batch_stays_under_100_bytes_per_file() -> None:
+    batch = FileBatch()
+    for d in range(100):
+        for f in range(100):
+            batch.append(f"/srv/archive/project{d}/logs", f"service-{f}.log", f * 100, 1_700_000_000.0)
+
+    assert batch.nbytes() / len(batch) < 100
+
+
+def test_filter_batch_vectorized_matches_loop() -> None:
+    pytest.importorskip("numpy")
+    now_ts = time()
+    batch = FileBatch()
+    for i in range(500):
+        batch.append(f"/d{i % 7}", f"f{i}.{['log', 'tmp', 'txt'][i % 3]}", i * 37 % 4000, now_ts - (i % 90) * 86400)
+    criteria = {"min_size": 1500, "min_age_days": 30, "now_ts": now_ts, "file_types": [".log", "tmp"]}
+
+    vectorized = filter_batch(batch, **criteria, vectorized=True)
+    looped = filter_batch(batch, **criteria, vectorized=False)
+
+    assert len(vectorized) > 0
+    assert list(vectorized) == list(looped)
+    # Both batches can still grow after the NumPy gather.
+    batch.append("/d0", "late.log", 1, now_ts)
+    vectorized.append("/d0", "late.log", 1, now_ts)
+    assert vectorized.name(len(vectorized) - 1) == "late.log"
+
+
+def test_filter_batch_without_numpy_falls_back(monkeypatch) -> None:
+    monkeypatch.setattr("src.columnar.np", None)
+    now_ts = time()
+
+    filtered = filter_batch(make_batch(now_ts), min_size=1000, now_ts=now_ts)
+
+    assert [info.path.name for info in filtered] == ["app.log", "cache.tmp", "README"]
+
+
+def test_file_batch_pickles_and_merges() -> None:
+    first = FileBatch().extend([FileInfo(Path("/a/x.log"), 1, 1.0), FileInfo(Path("/b/y.txt"), 2, 2.0)])
+    second = FileBatch().extend([FileInfo(Path("/b/z.LOG"), 3, 3.0)])
+
+    restored = pickle.loads(pickle.dumps(second))
+    merged = first.merge(restored)
+
+    assert [info.path for info in merged] == [Path("/a/x.log"), Path("/b/y.txt"), Path("/b/z.LOG")]
+    assert merged.dirs == ["/a", "/b"]
+    assert len(filter_batch(merged, file_types=[".log"])) == 2
@@ -0,0 +1,99 @@
+import os
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+
+from src.analyzer import FileInfo
+from src import duplicates
+from src.duplicates import PARTIAL_BYTES, find_duplicates
+
+
+def make_info(path: Path, data: bytes) -> FileInfo:
+    """Write data to path and return its FileInfo."""
+    path.write_bytes(data)
+    return FileInfo(path=path, size=len(data), access_ts=0.0)
+
+
+def group_names(groups: list[list[FileInfo]]) -> list[list[str]]:
+    return [[info.path.name for info in group] for group in groups]
+
+
+def test_find_duplicates_groups_small_identical_files(tmp_path) -> None:
+    infos = [
+        make_info(tmp_path / "a.txt", b"same"),
+        make_info(tmp_path / "b.txt", b"same"),
+        make_info(tmp_path / "c.txt", b"diff"),
+        make_info(tmp_path / "d.txt", b"unique size"),
+    ]
+
+    assert group_names(find_duplicates(infos, processes=1)) == [["a.txt", "b.txt"]]
+
+
+def test_find_duplicates_full_hash_separates_middle_differences(tmp_path) -> None:
+    head = b"h" * PARTIAL_BYTES
+    tail = b"t" * PARTIAL_BYTES
+    infos = [
+        make_info(tmp_path / "one.bin", head + b"A" * 100 + tail),
+        make_info(tmp_path / "two.bin", head + b"A" * 100 + tail),
+        make_info(tmp_path / "three.bin", head + b"B" * 100 + tail),
+    ]
+
+    assert group_names(find_duplicates(infos, processes=1)) == [["one.bin", "two.bin"]]
+
+
+def test_find_duplicates_process_pool_matches_inline(tmp_path) -> None:
+    data = b"x" * (3 * PARTIAL_BYTES)
+    infos = [make_info(tmp_path / f"copy{i}.bin", data) for i in range(3)]
+
+    assert group_names(find_duplicates(infos, processes=2)) == [["copy0.bin", "copy1.bin", "copy2.bin"]]
+
+
+def test_find_duplicates_hashes_inline_when_pool_breaks(tmp_path, monkeypatch) -> None:
+    class BrokenPool:
+        def __init__(self, *args, **kwargs) -> None:
+            pass
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc) -> None:
+            pass
+
+        def map(self, *args, **kwargs):
+            raise BrokenProcessPool("worker failed to start")
+
+    monkeypatch.setattr(duplicates, "ProcessPoolExecutor", BrokenPool)
+    data = b"x" * (3 * PARTIAL_BYTES)
+    infos = [make_info(tmp_path / f"copy{i}.bin", data) for i in range(2)]
+
+    assert group_names(find_duplicates(infos, processes=2)) == [["copy0.bin", "copy1.bin"]]
+
+
+def test_find_duplicates_ignores_empty_and_missing_files(tmp_path) -> None:
+    infos = [
+        make_info(tmp_path / "empty1.txt", b""),
+        make_info(tmp_path / "empty2.txt", b""),
+        make_info(tmp_path / "real.txt", b"data"),
+        FileInfo(path=tmp_path / "gone.txt", size=4, access_ts=0.0),
+    ]
+
+    assert find_duplicates(infos, processes=1) == []
+
+
+def test_find_duplicates_treats_hard_links_as_one_file(tmp_path) -> None:
+    original = make_info(tmp_path / "a.txt", b"same")
+    (tmp_path / "b.txt").hardlink_to(original.path)
+    link = FileInfo(path=tmp_path / "b.txt", size=4, access_ts=0.0)
+    copy = make_info(tmp_path / "c.txt", b"same")
+
+    assert find_duplicates([original, link], processes=1) == []
+    assert group_names(find_duplicates([original, link, copy], processes=1)) == [["a.txt", "c.txt"]]
+
+
+def test_find_duplicates_keeps_access_times(tmp_path) -> None:
+    big = b"x" * (3 * PARTIAL_BYTES)
+    infos = [make_info(tmp_path / "a.bin", big), make_info(tmp_path / "b.bin", big)]
+    for info in infos:
+        os.utime(info.path, (1_577_836_800, 1_577_836_800))
+
+    assert len(find_duplicates(infos, processes=1)) == 1
+    assert [info.path.stat().st_atime for info in infos] == [1_577_836_800] * 2
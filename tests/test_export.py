@@ -0,0 +1,38 @@
+import csv
+import io
+import json
+from pathlib import Path
+
+import pytest
+
+from src.analyzer import FileInfo
+from src.export import write_records
+
+
+def _infos(count: int) -> list[FileInfo]:
+    return [FileInfo(path=Path(f"/data/f{i}, \"odd\".log"), size=i, access_ts=i + 0.5) for i in range(count)]
+
+
+def test_write_records_jsonl_round_trips() -> None:
+    out = io.StringIO()
+
+    count = write_records(iter(_infos(2500)), "jsonl", out)
+
+    records = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert count == len(records) == 2500
+    assert records[7] == {"path": '/data/f7, "odd".log', "size": 7, "access_ts": 7.5}
+
+
+def test_write_records_csv_has_header_and_quotes() -> None:
+    out = io.StringIO()
+
+    count = write_records(iter(_infos(3)), "csv", out)
+
+    rows = list(csv.DictReader(io.StringIO(out.getvalue())))
+    assert count == 3
+    assert rows[2] == {"path": '/data/f2, "odd".log', "size": "2", "access_ts": "2.5"}
+
+
+def test_write_records_rejects_unknown_format() -> None:
+    with pytest.raises(ValueError):
+        write_records([], "xml", io.StringIO())
@@ -0,0 +1,122 @@
+import os
+from pathlib import Path
+
+from src.analyzer import FileInfo
+from src.index import refresh, scan_indexed
+from src.walker import list_directory
+
+
+def create_file(path: Path, content: str = "data") -> None:
+    """Create a small text file."""
+    path.write_text(content)
+
+
+def names(infos) -> set[str]:
+    return {info.path.name for info in infos}
+
+
+def test_scan_indexed_first_run_matches_full_scan(tmp_path) -> None:
+    root = tmp_path / "root"
+    (root / "sub").mkdir(parents=True)
+    create_file(root / "top.txt")
+    create_file(root / "sub" / "nested.txt")
+    create_file(root / ".hidden.txt")
+
+    infos = list(scan_indexed(root, tmp_path / "index.db"))
+
+    assert names(infos) == {"top.txt", "nested.txt"}
+    assert (tmp_path / "index.db").exists()
+
+
+def test_scan_indexed_reuses_unchanged_directories(tmp_path, monkeypatch) -> None:
+    root = tmp_path / "root"
+    (root / "sub").mkdir(parents=True)
+    create_file(root / "top.txt")
+    create_file(root / "sub" / "nested.txt")
+    index_path = tmp_path / "index.db"
+    list(scan_indexed(root, index_path))
+
+    listed: list[str] = []
+
+    def tracking_list_directory(dirpath):
+        listed.append(dirpath)
+        return list_directory(dirpath)
+
+    monkeypatch.setattr("src.index.list_directory", tracking_list_directory)
+    infos = list(scan_indexed(root, index_path))
+
+    assert listed == []
+    assert names(infos) == {"top.txt", "nested.txt"}
+
+
+def test_scan_indexed_rescans_changed_directory(tmp_path) -> None:
+    root = tmp_path / "root"
+    sub = root / "sub"
+    sub.mkdir(parents=True)
+    create_file(sub / "old.txt")
+    index_path = tmp_path / "index.db"
+    list(scan_indexed(root, index_path))
+
+    (sub / "old.txt").unlink()
+    create_file(sub / "new.txt")
+    stat = sub.stat()
+    os.utime(sub, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    assert names(scan_indexed(root, index_path)) == {"new.txt"}
+
+
+def test_scan_indexed_forgets_removed_subtree(tmp_path) -> None:
+    root = tmp_path / "root"
+    gone = root / "gone" / "deeper"
+    gone.mkdir(parents=True)
+    create_file(gone / "file.txt")
+    index_path = tmp_path / "index.db"
+    list(scan_indexed(root, index_path))
+
+    (gone / "file.txt").unlink()
+    gone.rmdir()
+    gone.parent.rmdir()
+    stat = root.stat()
+    os.utime(root, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    assert list(scan_indexed(root, index_path)) == []
+
+
+def test_scan_indexed_rebuild_ignores_cache(tmp_path, monkeypatch) -> None:
+    root = tmp_path / "root"
+    root.mkdir()
+    create_file(root / "top.txt")
+    index_path = tmp_path / "index.db"
+    list(scan_indexed(root, index_path))
+
+    listed: list[str] = []
+
+    def tracking_list_directory(dirpath):
+        listed.append(dirpath)
+        return list_directory(dirpath)
+
+    monkeypatch.setattr("src.index.list_directory", tracking_list_directory)
+    infos = list(scan_indexed(root, index_path, rebuild=True))
+
+    assert listed == [str(root.resolve())]
+    assert names(infos) == {"top.txt"}
+
+
+def test_scan_indexed_yields_paths_as_root_was_given(tmp_path, monkeypatch) -> None:
+    root = tmp_path / "root"
+    (root / "sub").mkdir(parents=True)
+    create_file(root / "sub" / "nested.txt")
+    monkeypatch.chdir(root)
+
+    for _ in range(2):  # fresh listing, then cached listing
+        infos = list(scan_indexed(Path("."), tmp_path / "index.db"))
+        assert [str(info.path) for info in infos] == [os.path.join("sub", "nested.txt")]
+
+
+def test_refresh_updates_stale_access_times_and_drops_missing(tmp_path) -> None:
+    kept = tmp_path / "kept.txt"
+    create_file(kept)
+    os.utime(kept, (2_000_000, 2_000_000))
+    stale = [FileInfo(path=kept, size=0, access_ts=1.0), FileInfo(path=tmp_path / "gone", size=1, access_ts=1.0)]
+
+    assert [(i.path, i.size, i.access_ts) for i in refresh(stale)] == [(kept, 4, 2_000_000)]
@@ -1,7 +1,16 @@
 from pathlib import Path
 
 from src.analyzer import FileInfo
-from src.interface import Stats, _normalize_action, display_file, render_scan_summary
+from src.operations import OperationQueue
+from src.interface import (
+    Stats,
+    _normalize_action,
+    display_file,
+    render_file_list,
+    render_scan_summary,
+    run_duplicate_review,
+    run_interactive_review,
+)
 
 
 def test_normalize_action_valid_inputs() -> None:
@@ -42,3 +51,94 @@ def test_render_scan_summary_includes_counts_and_bytes(capsys) -> None:
     assert "Bytes freed: 1024" in captured
 
 
+
+
+def test_display_file_unknown_total(capsys) -> None:
+    info = FileInfo(path=Path("example.txt"), size=123, access_ts=0.0)
+    display_file(info, index=3, total=None)
+    assert "[3/?] example.txt" in capsys.readouterr().out
+
+
+def test_run_interactive_review_counts_streamed_files(monkeypatch) -> None:
+    infos = (FileInfo(path=Path(f"f{i}.txt"), size=1, access_ts=0.0) for i in range(5))
+    answers = iter(["k", "k", "s"])
+    monkeypatch.setattr("builtins.input", lambda _prompt: next(answers))
+
+    stats = run_interactive_review(infos, dry_run=True)
+
+    assert stats.total == 5
+    assert stats.kept == 2
+    assert stats.skipped == 3
+
+
+def test_run_duplicate_review_keeps_chosen_copy(tmp_path, monkeypatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    group = []
+    for name in ["a.txt", "b.txt", "c.txt"]:
+        (tmp_path / name).write_text("dup")
+        group.append(FileInfo(path=tmp_path / name, size=3, access_ts=0.0))
+    answers = iter(["2", "y"])
+    monkeypatch.setattr("builtins.input", lambda _prompt: next(answers))
+
+    stats = run_duplicate_review([group], dry_run=False)
+
+    assert sorted(p.name for p in tmp_path.glob("*.txt")) == ["b.txt"]
+    assert stats.total == 3
+    assert stats.kept == 1
+    assert stats.deleted == 2
+    assert stats.bytes_freed == 6
+
+
+def test_run_interactive_review_bulk_delete_with_queue(tmp_path, monkeypatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    infos = []
+    for i in range(4):
+        path = tmp_path / f"f{i}.log"
+        path.write_text("12345")
+        infos.append(FileInfo(path=path, size=5, access_ts=0.0))
+    answers = iter(["k", "b", "d", "yes"])
+    monkeypatch.setattr("builtins.input", lambda _prompt: next(answers))
+
+    stats = run_interactive_review(iter(infos), dry_run=False, queue=OperationQueue(dry_run=False, workers=2))
+
+    assert infos[0].path.exists()
+    assert not any(info.path.exists() for info in infos[1:])
+    assert stats.total == 4
+    assert stats.kept == 1
+    assert stats.deleted == 3
+    assert stats.bytes_freed == 15
+
+
+def test_run_interactive_review_bulk_prompt_rejects_bulk_choice(tmp_path, monkeypatch, capsys) -> None:
+    monkeypatch.chdir(tmp_path)
+    infos = [FileInfo(path=tmp_path / f"f{i}.log", size=5, access_ts=0.0) for i in range(3)]
+    answers = iter(["b", "b", "k"])
+    monkeypatch.setattr("builtins.input", lambda _prompt: next(answers))
+
+    stats = run_interactive_review(iter(infos), dry_run=True)
+
+    assert "Please choose one of: K, M, A, D, S." in capsys.readouterr().out
+    assert stats.total == 3
+    assert stats.kept == 3
+    assert stats.skipped == 0
+
+
+def test_render_scan_summary_shows_per_root_breakdown(capsys) -> None:
+    stats = Stats(total=3, deleted=1, bytes_freed=10, roots=[Path("/a"), Path("/b")])
+    stats.root_stats(Path("/a/x.txt")).total = 2
+    part = stats.root_stats(Path("/b/y.txt"))
+    part.total, part.deleted, part.bytes_freed = 1, 1, 10
+
+    render_scan_summary(stats, dry_run=False)
+
+    captured = capsys.readouterr().out
+    assert "Per root:" in captured
+    assert f"{Path('/a')}: 2 considered" in captured
+    assert f"{Path('/b')}: 1 considered (0 bytes), 1 deleted (10 bytes freed)" in captured
+
+
+def test_render_file_list_uses_access_time(capsys) -> None:
+    render_file_list([FileInfo(path=Path("a.txt"), size=3, access_ts=0.0)])
+    out = capsys.readouterr().out
+    assert "Last accessed" in out
+    assert "a.txt\t3\t" in out
@@ -1,3 +1,5 @@
+import json
+
 from typer.testing import CliRunner
 
 from main import app
@@ -32,3 +34,99 @@ def test_main_entry_point_invokes_app_help(capsys) -> None:
     assert result.exit_code == 0
     assert "Usage: " in result.stdout
 
+
+
+def test_scan_prints_and_exports_directory_report(tmp_path) -> None:
+    (tmp_path / "big").mkdir()
+    (tmp_path / "big" / "a.bin").write_bytes(b"x" * 100)
+    (tmp_path / "b.bin").write_bytes(b"x" * 10)
+    out = tmp_path / "report.json"
+
+    result = runner.invoke(app, [str(tmp_path / "big"), "--min-size", "9999MB", "--report-out", str(out)])
+
+    assert result.exit_code == 0
+    assert "Directory report" in result.stdout
+    assert "100 bytes in 1 files" in result.stdout
+    assert json.loads(out.read_text())[0]["bytes"] == 100
+
+
+def test_scan_output_jsonl_streams_records_without_review(tmp_path) -> None:
+    (tmp_path / "a.log").write_text("hello")
+
+    result = runner.invoke(app, [str(tmp_path), "--output", "jsonl"], input="")
+
+    assert result.exit_code == 0
+    lines = result.stdout.splitlines()
+    assert len(lines) == 1
+    assert json.loads(lines[0])["path"] == str(tmp_path / "a.log")
+
+
+def test_scan_plan_then_apply(tmp_path, monkeypatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    data = tmp_path / "data"
+    data.mkdir()
+    (data / "old.log").write_text("12345")
+    plan = tmp_path / "cleanup.plan"
+
+    result = runner.invoke(app, ["scan", str(data), "--plan", str(plan)], input="d\nyes\n")
+
+    assert result.exit_code == 0
+    assert "Planned: 1" in result.stdout
+    assert (data / "old.log").exists()
+
+    result = runner.invoke(app, ["apply", str(plan)])
+
+    assert result.exit_code == 0
+    assert "Deleted: 1" in result.stdout
+    assert not (data / "old.log").exists()
+
+
+def test_scan_resume_replays_checkpointed_results(tmp_path) -> None:
+    data = tmp_path / "data"
+    data.mkdir()
+    (data / "a.log").write_text("12345")
+    state = tmp_path / "scan.ckpt"
+
+    first = runner.invoke(app, [str(data), "--checkpoint", str(state), "--output", "jsonl"])
+    (data / "b.log").write_text("new")  # a completed scan is replayed, not re-walked
+    resumed = runner.invoke(app, [str(data), "--checkpoint", str(state), "--resume", "--output", "jsonl"])
+
+    assert first.exit_code == resumed.exit_code == 0
+    assert resumed.stdout == first.stdout
+    assert runner.invoke(app, [str(data), "--resume"]).exit_code == 1
+
+
+def test_scan_sniff_matches_extensionless_files_by_content(tmp_path) -> None:
+    (tmp_path / "report").write_bytes(b"%PDF-1.4\n" + bytes(50))
+    (tmp_path / "notes").write_text("plain")
+
+    result = runner.invoke(app, [str(tmp_path), "--file-type", "pdf", "--sniff", "--output", "jsonl"])
+
+    assert result.exit_code == 0
+    assert [json.loads(line)["path"].endswith("report") for line in result.stdout.splitlines()] == [True]
+
+
+def test_scan_report_rolls_up_with_index_and_checkpoint(tmp_path, monkeypatch) -> None:
+    tree = tmp_path / "tree"
+    (tree / "a" / "b").mkdir(parents=True)
+    (tree / "a" / "top.bin").write_bytes(b"x" * 1500)
+    (tree / "a" / "b" / "deep.bin").write_bytes(b"x" * 6000)
+    monkeypatch.chdir(tree)
+
+    for extra in (["--index", str(tmp_path / "i.db")], ["--checkpoint", str(tmp_path / "scan.ckpt")]):
+        out = tmp_path / "report.json"
+        result = runner.invoke(app, [".", "--min-size", "9999MB", "--report-depth", "1", "--report-out", str(out), *extra])
+
+        assert result.exit_code == 0
+        rows = {row["path"]: row["bytes"] for row in json.loads(out.read_text())}
+        assert rows == {".": 7500, "a": 7500}
+
+
+def test_scan_rejects_policy_with_duplicates(tmp_path) -> None:
+    rules = tmp_path / "rules.toml"
+    rules.write_text('[[rule]]\naction = "delete"\n')
+
+    result = runner.invoke(app, [str(tmp_path), "--policy", str(rules), "--duplicates"])
+
+    assert result.exit_code == 1
+    assert "--policy cannot be combined with --duplicates" in result.stdout
@@ -0,0 +1,38 @@
+from src.matcher import compile_matcher
+
+
+def test_compile_matcher_without_rules_returns_none() -> None:
+    assert compile_matcher([], [], []) is None
+
+
+def test_matcher_excludes_directories_by_name() -> None:
+    matcher = compile_matcher(exclude=["node_modules", "*.git"])
+
+    assert matcher.skips_dir("node_modules", "/src/app/node_modules")
+    assert matcher.skips_dir("repo.git", "/srv/repo.git")
+    assert not matcher.skips_dir("src", "/src")
+
+
+def test_matcher_include_and_exclude_files() -> None:
+    matcher = compile_matcher(include=["*.log", "core.*"], exclude=["debug*"])
+
+    assert matcher.allows_file("app.log", "/var/log/app.log")
+    assert matcher.allows_file("core.1234", "/tmp/core.1234")
+    assert not matcher.allows_file("debug.log", "/var/log/debug.log")
+    assert not matcher.allows_file("notes.txt", "/home/notes.txt")
+
+
+def test_matcher_path_patterns_match_full_path() -> None:
+    matcher = compile_matcher(exclude=["*/build/*"])
+
+    assert matcher.skips_dir("cache", "/proj/build/cache")
+    assert not matcher.skips_dir("build", "/proj/build")
+
+
+def test_matcher_file_types_use_filter_normalization() -> None:
+    matcher = compile_matcher(file_types=["log", ".TMP"])
+
+    assert matcher.allows_file("APP.LOG", "/x/APP.LOG")
+    assert matcher.allows_file("cache.tmp", "/x/cache.tmp")
+    assert not matcher.allows_file("notes.txt", "/x/notes.txt")
+    assert not matcher.allows_file("log", "/x/log")
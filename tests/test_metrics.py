@@ -0,0 +1,74 @@
+import json
+import time
+from pathlib import Path
+
+import pytest
+
+from src import metrics
+from src.analyzer import iter_filter_files
+from src.metrics import Metrics, write_metrics
+from src.operations import Operation, execute_operation
+from src.walker import scan_file_infos
+
+
+@pytest.fixture
+def meter():
+    collector = metrics.enable()
+    yield collector
+    metrics.disable()
+
+
+def test_meter_excludes_upstream_time() -> None:
+    collector = Metrics()
+
+    def slow_source():
+        for i in range(3):
+            time.sleep(0.02)
+            yield i
+
+    out = list(collector.meter("double", lambda items: (i * 2 for i in items), slow_source()))
+
+    stats = collector.snapshot()["double"]
+    assert out == [0, 2, 4]
+    assert (stats["items"], stats["calls"]) == (3, 3)
+    assert stats["seconds"] < 0.02
+
+
+def test_disabled_metrics_record_nothing() -> None:
+    assert metrics.current() is None
+    with metrics.timed("anything"):
+        pass
+    assert metrics.current() is None
+
+
+def test_scan_filter_and_operations_are_instrumented(tmp_path, monkeypatch, meter) -> None:
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "a.log").write_text("12345")
+    (tmp_path / "b.txt").write_text("1")
+
+    matches = list(iter_filter_files(scan_file_infos(tmp_path), file_types=[".log"]))
+    execute_operation(Operation("delete", matches[0].path, 5), dry_run=False)
+    execute_operation(Operation("delete", tmp_path / "missing.log", 1), dry_run=False)
+
+    snap = meter.snapshot()
+    assert snap["scan.stat"]["items"] == 2
+    assert snap["scan.stat"]["bytes"] == 6
+    assert snap["filter"]["items"] == 2
+    assert snap["filter"]["calls"] == 1
+    assert snap["op.delete"]["calls"] == 2
+    assert snap["op.delete"]["errors"] == 1
+
+
+def test_write_metrics_prometheus_and_json(tmp_path) -> None:
+    collector = Metrics()
+    collector.add("scan.stat", 0.5, calls=10, items=10, nbytes=2048)
+
+    write_metrics(collector.snapshot(), tmp_path / "cleansys.prom")
+    write_metrics(collector.snapshot(), tmp_path / "cleansys.json")
+
+    prom = (tmp_path / "cleansys.prom").read_text()
+    assert "# TYPE cleansys_stage_seconds gauge" in prom
+    assert 'cleansys_stage_bytes{stage="scan.stat"} 2048' in prom
+    assert json.loads((tmp_path / "cleansys.json").read_text())["scan.stat"]["calls"] == 10
+    with pytest.raises(ValueError):
+        write_metrics({}, Path(tmp_path / "m.txt"))
@@ -0,0 +1,79 @@
+from pathlib import Path
+
+import pytest
+
+from src import multiroot
+from src.multiroot import dedupe_roots, group_by_device, root_for, scan_roots
+from src.walker import scan_file_infos
+
+
+def make_tree(root: Path, count: int) -> None:
+    root.mkdir(parents=True, exist_ok=True)
+    for i in range(count):
+        (root / f"{root.name}_{i}.txt").write_text("data")
+
+
+def test_dedupe_roots_drops_duplicates_and_nested(tmp_path) -> None:
+    a = tmp_path / "a"
+    nested = a / "nested"
+    b = tmp_path / "b"
+    nested.mkdir(parents=True)
+    b.mkdir()
+
+    assert dedupe_roots([nested, a, b, a / ".." / "a"]) == [a.resolve(), b.resolve()]
+    assert dedupe_roots([b, nested, a]) == [b.resolve(), a.resolve()]
+
+
+def test_group_by_device_and_root_for(tmp_path) -> None:
+    a = tmp_path / "a"
+    b = tmp_path / "b"
+    a.mkdir()
+    b.mkdir()
+
+    assert list(group_by_device([a, b]).values()) == [[a, b]]
+    assert root_for(a / "x" / "y.txt", [a, b]) == a
+    assert root_for(tmp_path / "c.txt", [a, b]) is None
+
+
+def test_scan_roots_merges_per_device_scans(tmp_path, monkeypatch) -> None:
+    roots = [tmp_path / "a", tmp_path / "b", tmp_path / "c"]
+    for root, count in zip(roots, [700, 3, 0]):
+        make_tree(root, count)
+    # Pretend each root sits on its own device so every root gets a thread.
+    monkeypatch.setattr(multiroot, "group_by_device", lambda rs: {i: [r] for i, r in enumerate(rs)})
+
+    infos = list(scan_roots(roots, lambda r: scan_file_infos(r, workers=2)))
+
+    assert len(infos) == 703
+    assert {info.path.parent.name for info in infos} == {"a", "b"}
+
+
+def test_scan_roots_stops_cleanly_when_abandoned(tmp_path, monkeypatch) -> None:
+    roots = [tmp_path / "a", tmp_path / "b"]
+    for root in roots:
+        make_tree(root, 600)
+    monkeypatch.setattr(multiroot, "group_by_device", lambda rs: {i: [r] for i, r in enumerate(rs)})
+
+    stream = scan_roots(roots, scan_file_infos)
+    first = next(stream)
+    stream.close()
+
+    assert first.path.suffix == ".txt"
+
+
+def test_scan_roots_reraises_device_errors_after_partial_results(tmp_path, monkeypatch) -> None:
+    roots = [tmp_path / "a", tmp_path / "b"]
+    for root in roots:
+        make_tree(root, 5)
+    monkeypatch.setattr(multiroot, "group_by_device", lambda rs: {i: [r] for i, r in enumerate(rs)})
+
+    def failing_scan(root: Path):
+        yield from scan_file_infos(root)
+        if root.name == "b":
+            raise OSError("device went away")
+
+    seen: list = []
+    with pytest.raises(OSError, match="device went away"):
+        seen.extend(scan_roots(roots, failing_scan))
+
+    assert sum(info.path.parent.name == "b" for info in seen) == 5
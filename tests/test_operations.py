@@ -1,6 +1,8 @@
 import zipfile
 
-from src.operations import archive_files, delete_file, move_file
+from src.archive import ArchiveSettings
+from src.operations import Operation, OperationQueue, archive_files, delete_file, move_file
+from src.oplog import flush_log
 
 
 def test_move_file_dry_run(tmp_path, monkeypatch) -> None:
@@ -14,6 +16,7 @@ def test_move_file_dry_run(tmp_path, monkeypatch) -> None:
     assert ok is True
     assert src.exists()
     assert not dst.exists()
+    flush_log()
     log_path = tmp_path / "cleansys.log"
     assert log_path.exists()
     assert "DRY RUN" in log_path.read_text()
@@ -31,6 +34,7 @@ def test_move_file_real(tmp_path, monkeypatch) -> None:
     assert not src.exists()
     assert dst.exists()
     assert dst.read_text() == "content"
+    flush_log()
     log_path = tmp_path / "cleansys.log"
     assert log_path.exists()
     text = log_path.read_text()
@@ -46,6 +50,7 @@ def test_move_file_missing_source_logs_error(tmp_path, monkeypatch) -> None:
     ok = move_file(src, dst, dry_run=False)
 
     assert ok is False
+    flush_log()
     log_path = tmp_path / "cleansys.log"
     assert log_path.exists()
     text = log_path.read_text()
@@ -61,6 +66,7 @@ def test_delete_file_dry_run(tmp_path, monkeypatch) -> None:
 
     assert ok is True
     assert path.exists()
+    flush_log()
     log_path = tmp_path / "cleansys.log"
     assert log_path.exists()
     assert "DRY RUN" in log_path.read_text()
@@ -75,6 +81,7 @@ def test_delete_file_real(tmp_path, monkeypatch) -> None:
 
     assert ok is True
     assert not path.exists()
+    flush_log()
     log_path = tmp_path / "cleansys.log"
     assert log_path.exists()
     text = log_path.read_text()
@@ -89,6 +96,7 @@ def test_delete_file_missing_logs_error(tmp_path, monkeypatch) -> None:
     ok = delete_file(path, dry_run=False)
 
     assert ok is False
+    flush_log()
     log_path = tmp_path / "cleansys.log"
     assert log_path.exists()
     text = log_path.read_text()
@@ -107,6 +115,7 @@ def test_archive_files_dry_run(tmp_path, monkeypatch) -> None:
 
     assert ok is True
     assert not archive_path.exists()
+    flush_log()
     log_path = tmp_path / "cleansys.log"
     assert log_path.exists()
     text = log_path.read_text()
@@ -130,6 +139,7 @@ def test_archive_files_real(tmp_path, monkeypatch) -> None:
         names = set(zf.namelist())
         assert "one.txt" in names
         assert "two.txt" in names
+    flush_log()
     log_path = tmp_path / "cleansys.log"
     assert log_path.exists()
     text = log_path.read_text()
@@ -151,8 +161,201 @@ def test_archive_files_skips_missing_members(tmp_path, monkeypatch) -> None:
         names = set(zf.namelist())
         assert "one.txt" in names
         assert "missing.txt" not in names
+    flush_log()
     log_path = tmp_path / "cleansys.log"
     assert log_path.exists()
     text = log_path.read_text()
     assert "skipping missing file" in text
 
+
+
+def test_operation_queue_runs_deletes_moves_and_archives(tmp_path, monkeypatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    doomed = [tmp_path / f"old{i}.log" for i in range(5)]
+    for path in doomed:
+        path.write_text("old")
+    mover = tmp_path / "move-me.txt"
+    mover.write_text("move")
+    members = [tmp_path / "a.txt", tmp_path / "b.txt"]
+    for path in members:
+        path.write_text(path.name)
+    archive_path = tmp_path / "out" / "bundle.zip"
+
+    queue = OperationQueue(dry_run=False, workers=3)
+    for path in doomed:
+        queue.add(Operation("delete", path, size=3))
+    queue.add(Operation("move", mover, dst=tmp_path / "moved" / "move-me.txt"))
+    for path in members:
+        queue.add(Operation("archive", path, dst=archive_path))
+    results = queue.run()
+
+    assert len(results) == 8
+    assert all(ok for _op, ok in results)
+    assert len(queue) == 0
+    assert not any(path.exists() for path in doomed)
+    assert (tmp_path / "moved" / "move-me.txt").read_text() == "move"
+    with zipfile.ZipFile(archive_path, "r") as zf:
+        assert set(zf.namelist()) == {"a.txt", "b.txt"}
+
+
+def test_operation_queue_dry_run_keeps_files(tmp_path, monkeypatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    path = tmp_path / "keep.txt"
+    path.write_text("data")
+
+    queue = OperationQueue(dry_run=True)
+    queue.add(Operation("delete", path, size=4))
+    results = queue.run()
+
+    assert [ok for _op, ok in results] == [True]
+    assert path.exists()
+
+
+def test_archive_files_appends_to_existing_archive(tmp_path, monkeypatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    first = tmp_path / "one.txt"
+    second = tmp_path / "sub" / "one.txt"
+    second.parent.mkdir()
+    first.write_text("first")
+    second.write_text("second")
+    archive_path = tmp_path / "archive.zip"
+
+    assert archive_files([first], archive_path, dry_run=False)
+    assert archive_files([second], archive_path, dry_run=False)
+
+    with zipfile.ZipFile(archive_path, "r") as zf:
+        assert zf.read("one.txt") == b"first"
+        assert zf.read("one_1.txt") == b"second"
+
+
+def test_archive_files_stores_compressed_suffixes(tmp_path, monkeypatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    text = tmp_path / "notes.txt"
+    packed = tmp_path / "logs.gz"
+    text.write_text("a" * 1000)
+    packed.write_bytes(b"\x1f\x8b" + b"b" * 1000)
+    archive_path = tmp_path / "archive.zip"
+
+    assert archive_files([text, packed], archive_path, dry_run=False)
+
+    with zipfile.ZipFile(archive_path, "r") as zf:
+        assert zf.getinfo("notes.txt").compress_type == zipfile.ZIP_DEFLATED
+        assert zf.getinfo("logs.gz").compress_type == zipfile.ZIP_STORED
+
+
+def test_archive_files_parallel_compression_roundtrips(tmp_path, monkeypatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    files = []
+    for i in range(5):
+        path = tmp_path / f"log{i}.txt"
+        path.write_text(f"line {i}\n" * 2000)
+        files.append(path)
+    archive_path = tmp_path / "archive.zip"
+
+    settings = ArchiveSettings(compresslevel=1, processes=2)
+    assert archive_files(files, archive_path, dry_run=False, settings=settings)
+
+    with zipfile.ZipFile(archive_path, "r") as zf:
+        assert zf.testzip() is None
+        for path in files:
+            info = zf.getinfo(path.name)
+            assert info.compress_type == zipfile.ZIP_DEFLATED
+            assert zf.read(path.name) == path.read_bytes()
+
+
+def test_archive_files_parallel_falls_back_without_zipfile_internals(tmp_path, monkeypatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    path = tmp_path / "log.txt"
+    path.write_text("line\n" * 2000)
+    archive_path = tmp_path / "archive.zip"
+    monkeypatch.setattr("src.archive._supports_raw_members", lambda zf: False)
+    monkeypatch.setattr("src.archive.ProcessPoolExecutor", None)
+
+    assert archive_files([path], archive_path, dry_run=False, settings=ArchiveSettings(processes=2))
+
+    with zipfile.ZipFile(archive_path, "r") as zf:
+        assert zf.read("log.txt") == path.read_bytes()
+
+
+def test_operation_queue_parallel_archive_from_worker_threads(tmp_path, monkeypatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    files = []
+    for i in range(4):
+        path = tmp_path / f"log{i}.txt"
+        path.write_text(f"line {i}\n" * 2000)
+        files.append(path)
+    queue = OperationQueue(dry_run=False, workers=2, archive=ArchiveSettings(compresslevel=1, processes=2))
+    for i, path in enumerate(files):
+        queue.add(Operation("archive", path, dst=tmp_path / f"archive{i % 2}.zip"))
+
+    assert all(ok for _, ok in queue.run())
+
+    for i in range(2):
+        with zipfile.ZipFile(tmp_path / f"archive{i}.zip") as zf:
+            assert zf.testzip() is None
+            assert sorted(zf.namelist()) == [f"log{i}.txt", f"log{i + 2}.txt"]
+
+
+def test_operation_queue_prints_each_message_on_its_own_line(tmp_path, monkeypatch, capsys) -> None:
+    monkeypatch.chdir(tmp_path)
+    queue = OperationQueue(dry_run=True, workers=16)
+    for i in range(500):
+        queue.add(Operation("delete", tmp_path / f"g{i}.tmp"))
+
+    queue.run()
+
+    lines = capsys.readouterr().out.splitlines()
+    assert len(lines) == 500
+    assert all(line.startswith("[DRY RUN] DELETE ") and line.count("[DRY RUN]") == 1 for line in lines)
+
+
+def test_archive_files_falls_back_when_compression_pool_breaks(tmp_path, monkeypatch) -> None:
+    from concurrent.futures import Future
+    from concurrent.futures.process import BrokenProcessPool
+
+    class BrokenPool:
+        def __init__(self, *args, **kwargs) -> None:
+            pass
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc) -> None:
+            pass
+
+        def submit(self, *args) -> Future:
+            job: Future = Future()
+            job.set_exception(BrokenProcessPool("worker failed to start"))
+            return job
+
+    monkeypatch.chdir(tmp_path)
+    files = []
+    for i in range(3):
+        path = tmp_path / f"log{i}.txt"
+        path.write_text(f"line {i}\n" * 2000)
+        files.append(path)
+    archive_path = tmp_path / "archive.zip"
+    monkeypatch.setattr("src.archive.ProcessPoolExecutor", BrokenPool)
+
+    assert archive_files(files, archive_path, dry_run=False, settings=ArchiveSettings(processes=2))
+
+    with zipfile.ZipFile(archive_path, "r") as zf:
+        assert zf.testzip() is None
+        assert [zf.read(p.name) for p in files] == [p.read_bytes() for p in files]
+
+
+def test_archive_files_removes_new_archive_on_failure(tmp_path, monkeypatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    path = tmp_path / "log.txt"
+    path.write_text("line\n" * 2000)
+    archive_path = tmp_path / "archive.zip"
+
+    def fail(*args, **kwargs) -> None:
+        raise OSError("disk full")
+
+    monkeypatch.setattr(zipfile.ZipFile, "write", fail)
+
+    assert not archive_files([path], archive_path, dry_run=False)
+
+    assert not archive_path.exists()
+    assert path.exists()
@@ -0,0 +1,65 @@
+import time
+
+from src.oplog import OperationLog
+
+
+def test_operation_log_buffers_until_flush(tmp_path) -> None:
+    log_path = tmp_path / "ops.log"
+    log = OperationLog(log_path, max_lines=100, max_delay=3600)
+
+    log.write("DELETE a.txt")
+    log.write("DELETE b.txt")
+    assert not log_path.exists()
+
+    log.flush(sync=True)
+    lines = log_path.read_text().splitlines()
+    assert len(lines) == 2
+    assert lines[0].endswith(" | DELETE a.txt")
+
+
+def test_operation_log_flushes_when_buffer_is_full(tmp_path) -> None:
+    log_path = tmp_path / "ops.log"
+    log = OperationLog(log_path, max_lines=3, max_delay=3600)
+
+    for i in range(4):
+        log.write(f"MOVE {i}")
+
+    assert len(log_path.read_text().splitlines()) == 3
+
+
+def test_operation_log_flushes_after_max_delay_without_further_writes(tmp_path) -> None:
+    log_path = tmp_path / "ops.log"
+    log = OperationLog(log_path, max_lines=100, max_delay=0.05)
+
+    log.write("DELETE a.txt")
+    deadline = time.monotonic() + 5
+    while not log_path.exists() and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    assert log_path.read_text().endswith(" | DELETE a.txt\n")
+
+
+def test_operation_log_checkpoint_writes_immediately(tmp_path) -> None:
+    log_path = tmp_path / "ops.log"
+    log = OperationLog(log_path, max_lines=100, max_delay=3600)
+
+    log.write("ARCHIVE 3 file(s)", checkpoint=True)
+
+    assert "ARCHIVE" in log_path.read_text()
+
+
+def test_operation_log_relative_path_follows_working_directory(tmp_path, monkeypatch) -> None:
+    first = tmp_path / "first"
+    second = tmp_path / "second"
+    first.mkdir()
+    second.mkdir()
+    log = OperationLog(max_lines=100, max_delay=3600)
+
+    monkeypatch.chdir(first)
+    log.write("DELETE one")
+    monkeypatch.chdir(second)
+    log.write("DELETE two")
+    log.flush()
+
+    assert "DELETE one" in (first / "cleansys.log").read_text()
+    assert "DELETE two" in (second / "cleansys.log").read_text()
@@ -0,0 +1,74 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from src.operations import Operation
+from src.plan import PlanWriter, apply_plan, read_plan
+
+
+def _make(tmp_path: Path, name: str, data: bytes = b"12345") -> Operation:
+    path = tmp_path / name
+    path.write_bytes(data)
+    st = path.stat()
+    return Operation("delete", path, st.st_size, access_ts=st.st_atime)
+
+
+def _write_plan(plan: Path, ops: list[Operation]) -> None:
+    writer = PlanWriter(plan)
+    for op in ops:
+        writer.add(op)
+    writer.close()
+
+
+def test_plan_round_trips_operations(tmp_path) -> None:
+    ops = [_make(tmp_path, "a.log"), Operation("move", tmp_path / "b.log", 3, tmp_path / "out" / "b.log", 1.5)]
+    plan = tmp_path / "run.plan"
+
+    _write_plan(plan, ops)
+
+    assert list(read_plan(plan)) == ops
+
+
+def test_read_plan_rejects_other_files(tmp_path) -> None:
+    bogus = tmp_path / "notes.txt"
+    bogus.write_text("hello\n")
+    with pytest.raises(ValueError, match="not a cleansys plan"):
+        list(read_plan(bogus))
+
+
+def test_apply_plan_skips_files_changed_since_planning(tmp_path, monkeypatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    same, grown, gone = (_make(tmp_path, n) for n in ("same.log", "grown.log", "gone.log"))
+    plan = tmp_path / "run.plan"
+    _write_plan(plan, [same, grown, gone])
+    grown.path.write_bytes(b"123456789")
+    gone.path.unlink()
+
+    results = {op.path.name: ok for op, ok in apply_plan(plan, dry_run=False, workers=2)}
+
+    assert results == {"same.log": True, "grown.log": None, "gone.log": None}
+    assert not same.path.exists()
+    assert grown.path.exists()
+
+
+def test_apply_plan_resumes_after_last_checkpoint(tmp_path, monkeypatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    ops = [_make(tmp_path, f"f{i}.log") for i in range(5)]
+    plan = tmp_path / "run.plan"
+    _write_plan(plan, ops)
+
+    results = apply_plan(plan, dry_run=False, batch_size=2)
+    first = [next(results), next(results), next(results)]
+    results.close()
+
+    checkpoint = json.loads((tmp_path / "run.plan.done").read_text())
+    assert checkpoint["done"] == 2
+    assert all(ok for _, ok in first)
+
+    rest = list(apply_plan(plan, dry_run=False, batch_size=2))
+    assert [op.path.name for op, _ in rest] == ["f2.log", "f3.log", "f4.log"]
+    # The interrupted batch had already run, so its files are gone.
+    assert [ok for _, ok in rest] == [None, None, True]
+    assert not any(op.path.exists() for op in ops)
+    assert list(apply_plan(plan, dry_run=False)) == []
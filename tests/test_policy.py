@@ -0,0 +1,104 @@
+from pathlib import Path
+
+import pytest
+
+from src.analyzer import FileInfo
+from src.interface import run_policy
+from src.operations import OperationQueue
+from src.policy import load_policy
+
+NOW = 1_000_000_000.0
+POLICY = """
+[[rule]]
+name = "keep reports"
+action = "keep"
+paths = ["*/reports/*"]
+
+[[rule]]
+name = "old logs"
+action = "delete"
+unused_days = 30
+file_types = ["log"]
+
+[[rule]]
+name = "big media"
+action = "move"
+min_size = "1KB"
+file_types = [".mp4"]
+destination = "/srv/media"
+"""
+
+
+def _write(tmp_path: Path, text: str, name: str = "policy.toml") -> Path:
+    path = tmp_path / name
+    path.write_text(text)
+    return path
+
+
+def test_load_policy_first_matching_rule_wins(tmp_path) -> None:
+    policy = load_policy(_write(tmp_path, POLICY), now_ts=NOW)
+    old = NOW - 31 * 86400
+
+    assert policy.decide(FileInfo(Path("/data/reports/a.log"), 10, old)) is None
+    op = policy.decide(FileInfo(Path("/data/a.log"), 10, old))
+    assert (op.action, op.path) == ("delete", Path("/data/a.log"))
+    assert policy.decide(FileInfo(Path("/data/new.log"), 10, NOW)) is None
+    assert policy.decide(FileInfo(Path("/data/small.mp4"), 10, old)) is None
+
+
+def test_policy_move_destinations_are_unique(tmp_path) -> None:
+    policy = load_policy(_write(tmp_path, POLICY), now_ts=NOW)
+
+    first = policy.decide(FileInfo(Path("/a/clip.mp4"), 4096, NOW))
+    second = policy.decide(FileInfo(Path("/b/clip.mp4"), 4096, NOW))
+
+    assert first.dst == Path("/srv/media/clip.mp4")
+    assert second.dst != first.dst
+    assert second.dst.parent == Path("/srv/media")
+
+
+@pytest.mark.parametrize(
+    "text, message",
+    [
+        ("", "non-empty list"),
+        ('[[rule]]\naction = "shred"\n', "action must be one of"),
+        ('[[rule]]\naction = "move"\n', "requires a destination"),
+        ('[[rule]]\naction = "delete"\nolder = 3\n', "unknown setting"),
+        ("[[rule]\n", "invalid TOML"),
+        ('[[rule]]\naction = "delete"\nfile_types = ".log"\n', "must be a list of strings"),
+        ('[[rule]]\naction = "delete"\npaths = "/tmp/*"\n', "must be a list of strings"),
+        ('[[rule]]\naction = "delete"\nunused_days = "soon"\n', "must be a non-negative integer"),
+        ('[[rule]]\naction = "delete"\nunused_days = [30]\n', "must be a non-negative integer"),
+        ('[[rule]]\naction = "delete"\nunused_days = -1\n', "must be a non-negative integer"),
+        ('rule = [1]\n', "expected a table of settings"),
+    ],
+)
+def test_load_policy_rejects_invalid_files(tmp_path, text, message) -> None:
+    with pytest.raises(ValueError, match=message):
+        load_policy(_write(tmp_path, text))
+
+
+def test_run_policy_applies_decisions_without_prompts(tmp_path, monkeypatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    policy = load_policy(_write(tmp_path, '[[rule]]\naction = "delete"\nfile_types = ["tmp"]\n'))
+    infos = []
+    for name in ("a.tmp", "b.tmp", "c.txt"):
+        path = tmp_path / name
+        path.write_text("123")
+        infos.append(FileInfo(path=path, size=3, access_ts=0.0))
+    monkeypatch.setattr("builtins.input", lambda _prompt: pytest.fail("prompted"))
+
+    stats = run_policy(iter(infos), policy.decide, dry_run=False, queue=OperationQueue(dry_run=False, workers=2))
+
+    assert [info.path.exists() for info in infos] == [False, False, True]
+    assert (stats.total, stats.kept, stats.deleted, stats.bytes_freed) == (3, 1, 2, 6)
+
+
+def test_policy_paths_match_however_the_root_was_typed(tmp_path, monkeypatch) -> None:
+    (tmp_path / "a").mkdir()
+    (tmp_path / "a" / "x.tmp").write_text("x")
+    policy = load_policy(_write(tmp_path, f'[[rule]]\naction = "delete"\npaths = ["{tmp_path}/a/*"]\n'))
+    monkeypatch.chdir(tmp_path)
+
+    for path in (tmp_path / "a" / "x.tmp", Path("a/x.tmp"), Path("./a/../a/x.tmp")):
+        assert policy.decide(FileInfo(path=path, size=1, access_ts=0.0)) is not None
@@ -0,0 +1,42 @@
+import pstats
+import time
+
+from src.profiling import paused, profile
+
+
+def busy(seconds: float) -> None:
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+def waiting_for_user(seconds: float) -> None:
+    time.sleep(seconds)
+
+
+def test_cprofile_output_excludes_paused_blocks(tmp_path) -> None:
+    out = tmp_path / "scan.pstats"
+
+    with profile(out):
+        busy(0.01)
+        with paused():
+            waiting_for_user(0.01)
+
+    names = {func[2] for func in pstats.Stats(str(out)).stats}
+    assert "busy" in names
+    assert "waiting_for_user" not in names
+
+
+def test_sampling_profile_writes_collapsed_stacks(tmp_path) -> None:
+    out = tmp_path / "scan.folded"
+
+    with profile(out):
+        busy(0.2)
+        with paused():
+            waiting_for_user(0.2)
+
+    lines = out.read_text().splitlines()
+    assert lines
+    assert all(line.rsplit(" ", 1)[1].isdigit() for line in lines)
+    assert any("busy (test_profiling.py" in line for line in lines)
+    assert not any("waiting_for_user" in line for line in lines)
@@ -0,0 +1,56 @@
+import csv
+import json
+from pathlib import Path
+
+import pytest
+
+from src.analyzer import FileInfo
+from src.report import DirReport, write_report
+
+
+def _infos() -> list[FileInfo]:
+    return [
+        FileInfo(Path("/r/a/x.log"), 10, 100.0),
+        FileInfo(Path("/r/a/deep/er/y.log"), 20, 50.0),
+        FileInfo(Path("/r/b/z.log"), 5, 300.0),
+        FileInfo(Path("/r/top.txt"), 1, 200.0),
+    ]
+
+
+def test_dir_report_rolls_up_to_depth() -> None:
+    report = DirReport([Path("/r")], depth=1)
+
+    passed = list(report.tally(iter(_infos())))
+
+    assert len(passed) == 4
+    totals = dict(report.rows())
+    assert set(totals) == {Path("/r"), Path("/r/a"), Path("/r/b")}
+    assert (totals[Path("/r")].files, totals[Path("/r")].bytes) == (4, 36)
+    assert (totals[Path("/r/a")].files, totals[Path("/r/a")].bytes) == (2, 30)
+    assert (totals[Path("/r/a")].oldest_access_ts, totals[Path("/r/a")].newest_access_ts) == (50.0, 100.0)
+    assert [path for path, _ in report.rows()] == [Path("/r"), Path("/r/a"), Path("/r/b")]
+
+
+def test_dir_report_depth_zero_reports_roots_only() -> None:
+    report = DirReport([Path("/r")], depth=0)
+    for info in _infos():
+        report.add(info)
+    assert [path for path, _ in report.rows()] == [Path("/r")]
+
+
+def test_write_report_json_and_csv(tmp_path) -> None:
+    report = DirReport([Path("/r")], depth=2)
+    for info in _infos():
+        report.add(info)
+
+    write_report(report.rows(), tmp_path / "r.json")
+    write_report(report.rows(), tmp_path / "r.csv")
+
+    records = json.loads((tmp_path / "r.json").read_text())
+    assert records[0] == {"path": "/r", "files": 4, "bytes": 36, "oldest_access_ts": 50.0, "newest_access_ts": 300.0}
+    assert any(r["path"] == "/r/a/deep" for r in records)
+    with (tmp_path / "r.csv").open() as fh:
+        rows = list(csv.DictReader(fh))
+    assert [r["path"] for r in rows] == [r["path"] for r in records]
+    with pytest.raises(ValueError):
+        write_report(report.rows(), tmp_path / "r.txt")
@@ -0,0 +1,73 @@
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+
+from src import sharded
+from src.sharded import scan_sharded
+from src.walker import scan_file_infos
+
+
+def _tree(root: Path) -> None:
+    (root / "top.log").parent.mkdir(parents=True)
+    (root / "top.log").write_text("top")
+    for a in range(3):
+        for b in range(2):
+            sub = root / f"a{a}" / f"b{b}"
+            sub.mkdir(parents=True)
+            (sub / "big.log").write_bytes(b"x" * 2048)
+            (sub / "small.txt").write_text("x")
+        (root / f"a{a}" / "mid.log").write_text("mid")
+
+
+def _paths(batches) -> set[Path]:
+    return {info.path for batch in batches for info in batch}
+
+
+def test_scan_sharded_finds_same_files_as_walker(tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr(sharded, "_SHARDS_PER_PROCESS", 2)
+    root = tmp_path / "root"
+    _tree(root)
+
+    found = _paths(scan_sharded([root], processes=2))
+
+    assert found == {info.path for info in scan_file_infos(root)}
+    assert len(found) == 16
+
+
+def test_scan_sharded_filters_in_workers(tmp_path) -> None:
+    root = tmp_path / "root"
+    _tree(root)
+
+    found = _paths(scan_sharded([root], processes=2, criteria={"min_size": 1024, "file_types": [".log"]}))
+
+    assert found == {root / f"a{a}" / f"b{b}" / "big.log" for a in range(3) for b in range(2)}
+
+
+def test_scan_sharded_non_recursive_stays_in_root(tmp_path) -> None:
+    root = tmp_path / "root"
+    _tree(root)
+
+    assert _paths(scan_sharded([root], processes=2, recursive=False)) == {root / "top.log"}
+
+
+def test_scan_sharded_scans_locally_when_pool_breaks(tmp_path, monkeypatch) -> None:
+    class BrokenPool:
+        def __init__(self, *args, **kwargs) -> None:
+            pass
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc) -> None:
+            pass
+
+        def submit(self, *args) -> Future:
+            job: Future = Future()
+            job.set_exception(BrokenProcessPool("worker failed to start"))
+            return job
+
+    monkeypatch.setattr(sharded, "ProcessPoolExecutor", BrokenPool)
+    root = tmp_path / "root"
+    _tree(root)
+
+    assert _paths(scan_sharded([root], processes=2)) == {info.path for info in scan_file_infos(root)}
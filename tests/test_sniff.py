@@ -0,0 +1,62 @@
+import os
+
+from src import sniff
+from src.analyzer import FileInfo
+from src.sniff import TypeCache, detect_type, sniff_filter
+
+
+def info_for(path) -> FileInfo:
+    st = path.stat()
+    return FileInfo(path=path, size=st.st_size, access_ts=st.st_atime)
+
+
+def test_detect_type_recognizes_common_signatures() -> None:
+    assert detect_type(b"%PDF-1.7\n") == ".pdf"
+    assert detect_type(b"\x00\x00\x00\x18ftypisom") == ".mp4"
+    assert detect_type(b"RIFF\x00\x00\x00\x00WAVEfmt ") == ".wav"
+    assert detect_type(b"\x7fELF\x02\x01\x01" + bytes(9) + b"\x04\x00") == ".core"
+    assert detect_type(bytes(257) + b"ustar\x0000") == ".tar"
+    assert detect_type(b"plain text") is None
+
+
+def test_sniff_filter_matches_by_content_and_keeps_atime(tmp_path) -> None:
+    renamed = tmp_path / "movie.txt"
+    renamed.write_bytes(b"\x00\x00\x00\x18ftypisom" + bytes(100))
+    bare = tmp_path / "core"
+    bare.write_bytes(b"\x7fELF\x02\x01\x01" + bytes(9) + b"\x04\x00")
+    named = tmp_path / "clip.mp4"
+    named.write_bytes(b"not really a video")
+    other = tmp_path / "notes"
+    other.write_text("hello")
+    for path in (renamed, bare, other):
+        os.utime(path, (1_000_000, 1_000_000))
+
+    infos = [info_for(p) for p in (renamed, bare, named, other)]
+    found = [i.path.name for i in sniff_filter(infos, ["mp4", ".core"])]
+
+    assert found == ["movie.txt", "core", "clip.mp4"]
+    assert renamed.stat().st_atime == 1_000_000
+    assert other.stat().st_atime == 1_000_000
+
+
+def test_type_cache_skips_reading_unchanged_files(tmp_path, monkeypatch) -> None:
+    path = tmp_path / "archive"
+    path.write_bytes(b"\x1f\x8b\x08" + bytes(20))
+    index = tmp_path / "index.db"
+    cache = TypeCache(index)
+    assert [i.path for i in sniff_filter([info_for(path)], ["gz"], cache)] == [path]
+    cache.close()
+
+    reads: list[int] = []
+    real_read = os.read
+    monkeypatch.setattr(sniff.os, "read", lambda fd, n: reads.append(fd) or real_read(fd, n))
+    cache = TypeCache(index)
+    assert [i.path for i in sniff_filter([info_for(path)], [".tgz"], cache)] == [path]
+    cache.close()
+    assert reads == []
+
+    path.write_bytes(b"plain text now")
+    cache = TypeCache(index)
+    assert list(sniff_filter([info_for(path)], ["gz"], cache)) == []
+    cache.close()
+    assert len(reads) == 1
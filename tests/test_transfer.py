@@ -0,0 +1,115 @@
+import errno
+import os
+from pathlib import Path
+
+import pytest
+
+from src import transfer
+
+
+def other_device(monkeypatch, directory: Path) -> None:
+    """Make directory look like it is on a different device than its siblings."""
+    real_stat = os.stat
+
+    def fake_stat(path, *args, **kwargs):
+        st = real_stat(path, *args, **kwargs)
+        if Path(path) == directory:
+            fields = list(st)
+            fields[2] = st.st_dev + 1
+            return os.stat_result(fields)
+        return st
+
+    monkeypatch.setattr(transfer.os, "stat", fake_stat)
+
+
+def test_move_same_device_renames(tmp_path, monkeypatch) -> None:
+    src = tmp_path / "a.bin"
+    src.write_bytes(b"data")
+    monkeypatch.setattr(transfer, "_copy", lambda *args: pytest.fail("copied instead of renamed"))
+
+    transfer.move(src, tmp_path / "b.bin")
+
+    assert not src.exists()
+    assert (tmp_path / "b.bin").read_bytes() == b"data"
+
+
+def test_move_across_devices_copies_in_chunks_and_keeps_metadata(tmp_path, monkeypatch) -> None:
+    src = tmp_path / "video.mkv"
+    src.write_bytes(os.urandom(10_000))
+    src.chmod(0o640)
+    os.utime(src, (1_000_000, 2_000_000))
+    cold = tmp_path / "cold"
+    cold.mkdir()
+    other_device(monkeypatch, cold)
+    seen: list[tuple[int, int]] = []
+    data = src.read_bytes()
+
+    transfer.move(src, cold / "video.mkv", progress=lambda copied, total: seen.append((copied, total)), chunk=4096)
+
+    dst = cold / "video.mkv"
+    assert not src.exists()
+    assert dst.read_bytes() == data
+    assert dst.stat().st_mtime == 2_000_000
+    assert dst.stat().st_mode & 0o777 == 0o640
+    assert seen == [(4096, 10_000), (8192, 10_000), (10_000, 10_000)]
+    assert os.listdir(cold) == ["video.mkv"]
+
+
+def test_move_falls_back_when_zero_copy_is_unsupported(tmp_path, monkeypatch) -> None:
+    src = tmp_path / "a.bin"
+    src.write_bytes(b"x" * 5000)
+    cold = tmp_path / "cold"
+    cold.mkdir()
+    other_device(monkeypatch, cold)
+
+    def unsupported(*args):
+        raise OSError(errno.EXDEV, "cross-device")
+
+    monkeypatch.setattr(transfer, "_copy_file_range", unsupported)
+    monkeypatch.setattr(transfer, "_sendfile", unsupported)
+
+    transfer.move(src, cold / "a.bin")
+
+    assert (cold / "a.bin").read_bytes() == b"x" * 5000
+
+
+def test_move_keeps_source_when_copy_is_incomplete(tmp_path, monkeypatch) -> None:
+    src = tmp_path / "a.bin"
+    src.write_bytes(b"x" * 5000)
+    cold = tmp_path / "cold"
+    cold.mkdir()
+    other_device(monkeypatch, cold)
+    monkeypatch.setattr(transfer, "_copy", lambda src, dst, *args: Path(dst).write_bytes(b"x" * 10))
+
+    with pytest.raises(OSError, match="size mismatch"):
+        transfer.move(src, cold / "a.bin")
+
+    assert src.read_bytes() == b"x" * 5000
+    assert os.listdir(cold) == []
+
+
+def test_print_progress_reports_only_large_files(capsys) -> None:
+    report = transfer.print_progress("MOVE big.iso", min_bytes=100, every=0.0)
+
+    report(10, 50)
+    report(100, 200)
+
+    lines = capsys.readouterr().out.splitlines()
+    assert len(lines) == 1
+    assert lines[0].startswith("  MOVE big.iso: 0 of 0 MiB (50%), ")
+
+
+def test_move_into_existing_directory(tmp_path, monkeypatch) -> None:
+    src = tmp_path / "a.bin"
+    src.write_bytes(b"data")
+    (tmp_path / "same").mkdir()
+    cold = tmp_path / "cold"
+    cold.mkdir()
+
+    transfer.move(src, tmp_path / "same")
+    assert (tmp_path / "same" / "a.bin").read_bytes() == b"data"
+
+    other_device(monkeypatch, cold)
+    transfer.move(tmp_path / "same" / "a.bin", cold)
+    assert (cold / "a.bin").read_bytes() == b"data"
+    assert not (tmp_path / "same" / "a.bin").exists()
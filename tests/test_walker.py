@@ -0,0 +1,183 @@
+import os
+import threading
+import time
+from pathlib import Path
+
+from src import walker
+from src.matcher import compile_matcher
+from src.walker import scan_file_infos
+
+
+def create_file(path: Path, content: str = "data") -> None:
+    """Create a small text file."""
+    path.write_text(content)
+
+
+def test_scan_file_infos_recursive_includes_nested_files(tmp_path) -> None:
+    create_file(tmp_path / "top.txt")
+    subdir = tmp_path / "sub"
+    subdir.mkdir()
+    create_file(subdir / "nested.txt", "nested data")
+
+    infos = {info.path.name: info for info in scan_file_infos(tmp_path, recursive=True)}
+
+    assert set(infos) == {"top.txt", "nested.txt"}
+    assert infos["nested.txt"].size == len("nested data")
+    assert infos["nested.txt"].path == subdir / "nested.txt"
+
+
+def test_scan_file_infos_non_recursive_skips_subdirectories(tmp_path) -> None:
+    create_file(tmp_path / "top.txt")
+    subdir = tmp_path / "sub"
+    subdir.mkdir()
+    create_file(subdir / "nested.txt")
+
+    names = {info.path.name for info in scan_file_infos(tmp_path, recursive=False)}
+
+    assert names == {"top.txt"}
+
+
+def test_scan_file_infos_uses_access_time(tmp_path) -> None:
+    path = tmp_path / "old.txt"
+    create_file(path)
+    os.utime(path, (1_000_000, 2_000_000))
+
+    [info] = list(scan_file_infos(tmp_path))
+
+    assert info.access_ts == 1_000_000
+
+
+def test_scan_file_infos_skips_hidden_and_symlinks(tmp_path) -> None:
+    create_file(tmp_path / "visible.txt")
+    create_file(tmp_path / ".hidden.txt")
+    hidden_dir = tmp_path / ".cache"
+    hidden_dir.mkdir()
+    create_file(hidden_dir / "inside.txt")
+    target = tmp_path / "target.txt"
+    create_file(target)
+
+    can_symlink = True
+    try:
+        (tmp_path / "link.txt").symlink_to(target)
+    except (OSError, NotImplementedError):
+        can_symlink = False
+
+    names = {info.path.name for info in scan_file_infos(tmp_path)}
+
+    assert names == {"visible.txt", "target.txt"}
+    if can_symlink:
+        assert "link.txt" not in names
+
+
+def test_scan_file_infos_single_file_root(tmp_path) -> None:
+    path = tmp_path / "only.txt"
+    create_file(path)
+
+    infos = list(scan_file_infos(path))
+
+    assert [info.path for info in infos] == [path]
+
+
+def test_scan_file_infos_permission_denied_directory_is_skipped(tmp_path, monkeypatch, capsys) -> None:
+    ok_dir = tmp_path / "ok"
+    ok_dir.mkdir()
+    blocked = tmp_path / "blocked"
+    blocked.mkdir()
+    create_file(ok_dir / "visible.txt")
+
+    original_scandir = os.scandir
+
+    def fake_scandir(path):
+        if Path(path) == blocked:
+            raise PermissionError
+        return original_scandir(path)
+
+    monkeypatch.setattr(os, "scandir", fake_scandir)
+
+    names = {info.path.name for info in scan_file_infos(tmp_path)}
+
+    captured = capsys.readouterr().out
+    assert "permission denied" in captured.lower()
+    assert "visible.txt" in names
+
+
+def test_scan_file_infos_parallel_matches_sequential(tmp_path) -> None:
+    for d in range(5):
+        sub = tmp_path / f"dir{d}" / "inner"
+        sub.mkdir(parents=True)
+        create_file(sub / f"file{d}.txt")
+        create_file(sub.parent / f"top{d}.txt")
+        create_file(sub / f".hidden{d}.txt")
+
+    sequential = {info.path for info in scan_file_infos(tmp_path, workers=1)}
+    parallel = {info.path for info in scan_file_infos(tmp_path, workers=4)}
+
+    assert len(sequential) == 10
+    assert parallel == sequential
+
+
+def test_scan_file_infos_parallel_permission_denied_is_skipped(tmp_path, monkeypatch, capsys) -> None:
+    ok_dir = tmp_path / "ok"
+    ok_dir.mkdir()
+    blocked = tmp_path / "blocked"
+    blocked.mkdir()
+    create_file(ok_dir / "visible.txt")
+    create_file(blocked / "secret.txt")
+
+    original_scandir = os.scandir
+
+    def fake_scandir(path):
+        if Path(path) == blocked:
+            raise PermissionError
+        return original_scandir(path)
+
+    monkeypatch.setattr(os, "scandir", fake_scandir)
+
+    names = {info.path.name for info in scan_file_infos(tmp_path, workers=3)}
+
+    assert "permission denied" in capsys.readouterr().out.lower()
+    assert names == {"visible.txt"}
+
+
+def test_scan_file_infos_matcher_prunes_before_stat(tmp_path, monkeypatch) -> None:
+    create_file(tmp_path / "keep.log")
+    create_file(tmp_path / "skip.txt")
+    modules = tmp_path / "node_modules" / "pkg"
+    modules.mkdir(parents=True)
+    create_file(modules / "inside.log")
+    matcher = compile_matcher(exclude=["node_modules"], file_types=[".log"])
+
+    statted: list[str] = []
+    original_entry_info = walker._entry_info
+
+    def tracking_entry_info(entry):
+        statted.append(entry.name)
+        return original_entry_info(entry)
+
+    monkeypatch.setattr(walker, "_entry_info", tracking_entry_info)
+
+    for workers in (1, 2):
+        statted.clear()
+        names = {info.path.name for info in scan_file_infos(tmp_path, workers=workers, matcher=matcher)}
+        assert names == {"keep.log"}
+        assert statted == ["keep.log"]
+
+
+def test_scan_file_infos_parallel_splits_stat_calls_of_large_directory(tmp_path, monkeypatch) -> None:
+    for i in range(40):
+        create_file(tmp_path / f"f{i}.txt")
+    monkeypatch.setattr(walker, "_STAT_CHUNK", 5)
+    threads: set[str] = set()
+    real_entry_info = walker._entry_info
+
+    def slow_entry_info(entry):
+        threads.add(threading.current_thread().name)
+        time.sleep(0.005)
+        return real_entry_info(entry)
+
+    monkeypatch.setattr(walker, "_entry_info", slow_entry_info)
+
+    infos = list(scan_file_infos(tmp_path, workers=4))
+
+    assert sorted(info.path.name for info in infos) == sorted(f"f{i}.txt" for i in range(40))
+    assert len(threads) > 1